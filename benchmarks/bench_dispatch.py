@@ -0,0 +1,54 @@
+"""
+Measures the per-call overhead of the process wrapper in `openeo_processes.utils.process`.
+
+Three variants are timed for a couple of representative calls:
+    - "direct": calling the implementing static method without any wrapper,
+    - "uncached": calling the process with an emptied dispatch cache, i.e. evaluating the data types on every call,
+    - "cached": calling the process with a warm dispatch cache.
+
+Run with `python benchmarks/bench_dispatch.py`.
+
+"""
+import timeit
+
+import numpy as np
+
+import openeo_processes as oeop
+from openeo_processes.math import Add, Mean
+
+
+def run_case(name, wrapper, direct, args, kwargs, number):
+    cache = wrapper._dispatch_cache
+
+    def uncached():
+        cache.clear()
+        wrapper(*args, **kwargs)
+
+    def cached():
+        wrapper(*args, **kwargs)
+
+    def direct_call():
+        direct(*args, **kwargs)
+
+    wrapper(*args, **kwargs)  # warm up cache
+    timings = {}
+    for label, fun in (("direct", direct_call), ("uncached", uncached), ("cached", cached)):
+        timings[label] = min(timeit.repeat(fun, number=number, repeat=5)) / number * 1e6
+
+    print("{:<28} direct {:7.2f} us | uncached {:7.2f} us (+{:6.2f}) | cached {:7.2f} us (+{:6.2f})".format(
+        name, timings["direct"], timings["uncached"], timings["uncached"] - timings["direct"], timings["cached"],
+        timings["cached"] - timings["direct"]))
+
+
+def main():
+    pixel = np.float64(3.5)
+    small = np.arange(4, dtype=float)
+    cube = np.random.rand(4, 8, 8)
+    run_case("add(float, float)", oeop.add, Add.exec_num, (1.5, 2.5), {}, 100000)
+    run_case("add(np.float64, int)", oeop.add, Add.exec_np, (pixel, 2), {}, 100000)
+    run_case("add(ndarray[4], ndarray[4])", oeop.add, Add.exec_np, (small, small), {}, 100000)
+    run_case("mean(cube, dimension=0)", oeop.mean, Mean.exec_np, (cube,), {"dimension": 0}, 20000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Compares the execution of a band math process graph with and without fusion of elementwise processes.
+
+The graph computes an NDVI, scales it to 0-255, clips it and masks invalid pixels, i.e. it consists of seven
+elementwise processes. Without fusion, every process allocates a full-size array. With fusion, the graph is evaluated
+as a single kernel tile by tile (NumPy backend) or with numexpr, if installed.
+
+Run with `python benchmarks/bench_fusion.py [size]`, where `size` is the edge length of the bands (default 4096).
+
+"""
+import sys
+import timeit
+
+import numpy as np
+
+import openeo_processes as oeop
+from openeo_processes.fusion import numexpr
+
+
+GRAPH = {
+    "ndvi": {"process_id": "normalized_difference", "arguments": {"x": {"from_parameter": "nir"},
+                                                                  "y": {"from_parameter": "red"}}},
+    "scale": {"process_id": "linear_scale_range", "arguments": {"x": {"from_node": "ndvi"}, "input_min": -1,
+                                                                "input_max": 1, "output_max": 255}},
+    "clip": {"process_id": "clip", "arguments": {"x": {"from_node": "scale"}, "min_x": 0, "max_x": 255}},
+    "gt": {"process_id": "gt", "arguments": {"x": {"from_parameter": "nir"}, "y": 0}},
+    "lt": {"process_id": "lt", "arguments": {"x": {"from_parameter": "red"}, "y": 1}},
+    "and": {"process_id": "and", "arguments": {"x": {"from_node": "gt"}, "y": {"from_node": "lt"}}},
+    "if": {"process_id": "if", "arguments": {"value": {"from_node": "and"}, "accept": {"from_node": "clip"}},
+           "result": True},
+}
+
+
+def main(size=4096):
+    parameters = {"nir": np.random.rand(size, size), "red": np.random.rand(size, size)}
+    variants = [False, True] + (["numexpr"] if numexpr is not None else [])
+    for fuse in variants:
+        graph = oeop.ProcessGraph(GRAPH, max_workers=1, fuse=fuse)
+        graph.execute(parameters)  # warm up
+        seconds = min(timeit.repeat(lambda: graph.execute(parameters), number=1, repeat=3))
+        print("fuse={!s:<8} {:8.3f} s".format(fuse, seconds))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,33 @@
+"""
+Compares the cumulative minimum skipping no-data values (`cummin` with `ignore_nodata=True`) computed by the compiled
+numba kernel and by the NumPy fallback (see `openeo_processes.kernels.nan_cumextreme`).
+
+The data cube has the dimensions (time, y, x) with 10% no-data values and is accumulated along the temporal dimension.
+
+Run with `python benchmarks/bench_kernels.py [size] [n_times]`, where `size` is the edge length of the spatial
+dimensions (default 1024) and `n_times` the length of the temporal dimension (default 64).
+
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from openeo_processes import kernels
+
+
+def main(size=1024, n_times=64):
+    data = np.random.rand(n_times, size, size).astype(np.float32)
+    data[data < 0.1] = np.nan
+    numba = kernels.numba
+    variants = (["numba"] if numba is not None else []) + ["numpy"]
+    for variant in variants:
+        kernels.numba = numba if variant == "numba" else None
+        kernels.nan_cumextreme(data)  # warm up, i.e. compile the kernel
+        seconds = min(timeit.repeat(lambda: kernels.nan_cumextreme(data), number=1, repeat=3))
+        print("{:<8} {:8.3f} s".format(variant, seconds))
+    kernels.numba = numba
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Compares the compositing statistics 'min', 'max', 'mean', 'sd' and 'count' of the same data being computed by one
+process each and by the fused reducer of the process graph executor (see `openeo_processes.fusion.fuse_reducers`).
+
+The data cube has the dimensions (time, y, x) with 10% no-data values and is reduced along the temporal dimension.
+
+Run with `python benchmarks/bench_statistics.py [size] [n_times]`, where `size` is the edge length of the spatial
+dimensions (default 1024) and `n_times` the length of the temporal dimension (default 64).
+
+"""
+import sys
+import timeit
+
+import numpy as np
+
+import openeo_processes as oeop
+from openeo_processes.fusion import fuse_reducers
+
+
+GRAPH = {process_id: {"process_id": process_id, "arguments": {"data": {"from_parameter": "data"}}}
+         for process_id in ["min", "max", "mean", "sd", "count"]}
+GRAPH.update({
+    "add_1": {"process_id": "add", "arguments": {"x": {"from_node": "min"}, "y": {"from_node": "max"}}},
+    "add_2": {"process_id": "add", "arguments": {"x": {"from_node": "mean"}, "y": {"from_node": "sd"}}},
+    "add_3": {"process_id": "add", "arguments": {"x": {"from_node": "add_1"}, "y": {"from_node": "add_2"}}},
+    "result": {"process_id": "add", "arguments": {"x": {"from_node": "add_3"}, "y": {"from_node": "count"}},
+               "result": True},
+})
+
+
+def separate(data):
+    return oeop.min(data) + oeop.max(data) + oeop.mean(data) + oeop.sd(data) + oeop.count(data)
+
+
+def main(size=1024, n_times=64):
+    data = np.random.rand(n_times, size, size)
+    data[data < 0.1] = np.nan
+    graph = oeop.ProcessGraph(GRAPH, max_workers=1)
+    assert any(node_id.endswith("_statistics") for node_id in fuse_reducers(GRAPH))
+    for name, case in [("separate", lambda: separate(data)), ("fused", lambda: graph.execute({"data": data}))]:
+        seconds = min(timeit.repeat(case, number=1, repeat=3))
+        print("{:<8} {:8.3f} s".format(name, seconds))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
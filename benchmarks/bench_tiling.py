@@ -0,0 +1,50 @@
+"""
+Measures the scaling of the tiled NumPy reducers with the number of threads.
+
+The median, the exact quantiles ('sort' and 'select') and the order are computed along the first (temporal) dimension
+of a (time, y, x) data cube with no-data values. The remaining dimensions are split into tiles, which are processed on
+a thread pool (see `openeo_processes.tiling.map_tiles`). The speed-up relative to a single thread is reported for
+1, 2, 4, ... threads up to the number of CPUs, e.g. up to 16 threads on a 16-core machine.
+
+Run with `python benchmarks/bench_tiling.py [size] [n_times]`, where `size` is the edge length of the spatial
+dimensions (default 1024) and `n_times` the length of the temporal dimension (default 64).
+
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+import openeo_processes as oeop
+
+
+CASES = {
+    "median": lambda data, **options: oeop.median(data, **options),
+    "quantiles (sort)": lambda data, **options: oeop.quantiles(data, probabilities=[0.1, 0.5, 0.9], **options),
+    "quantiles (select)": lambda data, **options: oeop.quantiles(data, probabilities=[0.1, 0.5, 0.9],
+                                                                 method="select", **options),
+    "order": lambda data, **options: oeop.order(data, nodata=True, **options),
+}
+
+
+def main(size=1024, n_times=64):
+    data = np.random.rand(n_times, size, size)
+    data[data < 0.05] = np.nan
+    n_cpus = os.cpu_count() or 1
+    n_workers = [2 ** i for i in range(n_cpus.bit_length()) if 2 ** i <= n_cpus]
+    if n_workers[-1] != n_cpus:
+        n_workers.append(n_cpus)
+
+    for name, case in CASES.items():
+        baseline = None
+        for max_workers in n_workers:
+            case(data, max_workers=max_workers)  # warm up
+            seconds = min(timeit.repeat(lambda: case(data, max_workers=max_workers), number=1, repeat=3))
+            baseline = baseline or seconds
+            print("{:<20} threads={:<3} {:8.3f} s  speed-up {:5.2f}".format(name, max_workers, seconds,
+                                                                            baseline / seconds))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
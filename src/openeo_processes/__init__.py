@@ -13,4 +13,7 @@ from openeo_processes.arrays import *
 from openeo_processes.comparison import *
 from openeo_processes.math import *
 from openeo_processes.texts import *
-from openeo_processes.utils import get_process, has_process
+from openeo_processes.utils import get_process, has_process, LabelIndex, mask_nodata
+from openeo_processes.process_graph import ProcessGraph, execute_process_graph
+from openeo_processes.lazy import lazy, Expression
+from openeo_processes.bitmask import Bitmask
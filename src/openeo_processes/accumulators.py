@@ -0,0 +1,815 @@
+from functools import partial
+
+import numpy as np
+
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
+from openeo_processes.utils import eval_datatype
+
+
+# Number of array elements, which are reduced at once when streaming over an array.
+BLOCK_SIZE = 2 ** 15
+
+# Default compression of quantile sketches, i.e. sketches have at most 51 centroids.
+COMPRESSION = 100
+
+# Record data type of a partial state, used for passing the states through dask reductions.
+MOMENTS_DTYPE = np.dtype([("count", np.float64), ("mean", np.float64), ("m2", np.float64)])
+
+# Statistics a `Statistics` state can provide, named after the corresponding processes.
+STATISTICS = ("min", "max", "extrema", "mean", "sd", "variance", "count")
+
+
+########################################################################################################################
+# Moments Accumulator
+########################################################################################################################
+
+class Moments:
+    """
+    Mergeable partial state of the first two moments of a sample, i.e. the number of values (`count`), their mean
+    (`mean`) and the sum of squared deviations from the mean (`m2`).
+
+    States can be created for any part of the data (e.g. tiles, dask chunks or single time slices) and merged with
+    the numerically stable pairwise update of Chan et al., which turns into Welford's algorithm if one of the parts
+    only contains a single value. Hence, the variance of a data set can be computed in a single pass while only
+    keeping the state of the output elements in memory.
+
+    """
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self, count, mean, m2):
+        """
+        Constructor of `Moments`.
+
+        Parameters
+        ----------
+        count : np.array or float
+            Number of (valid) values.
+        mean : np.array or float
+            Mean of the values, np.nan if `count` is zero.
+        m2 : np.array or float
+            Sum of the squared deviations of the values from their mean.
+
+        """
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    @classmethod
+    def from_data(cls, data, dimension=0, ignore_nodata=True):
+        """
+        Creates the state of the values along a dimension of an array.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers.
+        dimension : int, optional
+            Defines the dimension to compute the state along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that the state is np.nan if any value is such a
+            value.
+
+        Returns
+        -------
+        Moments :
+            State of the values along `dimension`.
+
+        """
+        data = np.asarray(data, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            if ignore_nodata:
+                valid = ~np.isnan(data)
+                count = np.sum(valid, axis=dimension, dtype=float)
+                mean = np.sum(data, axis=dimension, where=valid) / count
+                deviations = np.where(valid, data - np.expand_dims(mean, dimension), 0.)
+            else:
+                count = np.full(np.delete(data.shape, dimension), data.shape[dimension], dtype=float)
+                mean = np.mean(data, axis=dimension)
+                deviations = data - np.expand_dims(mean, dimension)
+        m2 = np.sum(deviations * deviations, axis=dimension)
+
+        return cls(count, mean, m2)
+
+    @classmethod
+    def from_records(cls, records):
+        """ Creates a state from a record array with the data type `MOMENTS_DTYPE`. """
+        return cls(records["count"], records["mean"], records["m2"])
+
+    def to_records(self):
+        """ Converts the state to a record array with the data type `MOMENTS_DTYPE`. """
+        records = np.empty(np.shape(self.count), dtype=MOMENTS_DTYPE)
+        records["count"] = self.count
+        records["mean"] = self.mean
+        records["m2"] = self.m2
+        return records
+
+    def merge(self, other):
+        """
+        Merges two states.
+
+        Parameters
+        ----------
+        other : Moments
+            State of other values, having the same (or a broadcastable) shape.
+
+        Returns
+        -------
+        Moments :
+            State of the values of both states.
+
+        """
+        count = self.count + other.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            mean = self.mean + delta * (other.count / count)
+            m2 = self.m2 + other.m2 + delta * delta * (self.count * other.count / count)
+
+        # states without any values must not affect the merged state
+        mean = np.where(other.count == 0, self.mean, np.where(self.count == 0, other.mean, mean))
+        m2 = np.where(other.count == 0, self.m2, np.where(self.count == 0, other.m2, m2))
+
+        return Moments(count, mean, m2)
+
+    def append(self, data, dimension=0, ignore_nodata=True):
+        """
+        Merges the state of new values, e.g. newly acquired time slices, into this state.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers, having the same shape as the state except for `dimension`.
+        dimension : int, optional
+            Defines the dimension of `data` containing the values to append (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+
+        Returns
+        -------
+        Moments :
+            The updated state itself.
+
+        """
+        merged = self.merge(Moments.from_data(data, dimension=dimension, ignore_nodata=ignore_nodata))
+        self.count, self.mean, self.m2 = merged.count, merged.mean, merged.m2
+        return self
+
+    def variance(self, ddof=1):
+        """
+        Computes the variance of the values.
+
+        Parameters
+        ----------
+        ddof : int, optional
+            Delta degrees of freedom (default is 1, i.e. the sample variance).
+
+        Returns
+        -------
+        np.array or float :
+            The variances, np.nan if there are not more than `ddof` values.
+
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+        return variance[()]
+
+    def sd(self, ddof=1):
+        """
+        Computes the standard deviation of the values.
+
+        Parameters
+        ----------
+        ddof : int, optional
+            Delta degrees of freedom (default is 1, i.e. the sample standard deviation).
+
+        Returns
+        -------
+        np.array or float :
+            The standard deviations, np.nan if there are not more than `ddof` values.
+
+        """
+        return np.sqrt(self.variance(ddof=ddof))
+
+
+########################################################################################################################
+# Statistics Accumulator
+########################################################################################################################
+
+class Statistics:
+    """
+    Mergeable partial state of several summary statistics of a sample, i.e. any subset of the number of valid values
+    (`n_valid`), the minimum (`minimum`), the maximum (`maximum`) and the first two moments (`moments`, see `Moments`).
+
+    All requested statistics are computed from the same block of data while it resides in the cache, so that the data
+    is read only once instead of once per statistic. Like `Moments`, states can be created for any part of the data
+    and merged. Statistics which have not been requested are None.
+
+    """
+
+    __slots__ = ("n_valid", "minimum", "maximum", "moments", "nodata")
+
+    def __init__(self, n_valid=None, minimum=None, maximum=None, moments=None, nodata=None):
+        """
+        Constructor of `Statistics`.
+
+        Parameters
+        ----------
+        n_valid : np.array or int, optional
+            Number of valid (i.e. finite) values.
+        minimum : np.array or float, optional
+            Minimum values, np.nan if there are no values.
+        maximum : np.array or float, optional
+            Maximum values, np.nan if there are no values.
+        moments : Moments, optional
+            Moments of the values, ignoring no-data values.
+        nodata : np.array or bool, optional
+            True if a no-data value has been encountered, which should not be ignored. None if no-data values are
+            ignored.
+
+        """
+        self.n_valid = n_valid
+        self.minimum = minimum
+        self.maximum = maximum
+        self.moments = moments
+        self.nodata = nodata
+
+    @staticmethod
+    def records_dtype(statistics=STATISTICS, dtype=np.float64, ignore_nodata=True):
+        """ Returns the record data type of a state with the given statistics, used for dask reductions. """
+        fields = []
+        if "count" in statistics:
+            fields.append(("n_valid", np.int64))
+        if {"min", "extrema"} & set(statistics):
+            fields.append(("minimum", dtype))
+        if {"max", "extrema"} & set(statistics):
+            fields.append(("maximum", dtype))
+        if {"mean", "sd", "variance"} & set(statistics):
+            fields.append(("moments", MOMENTS_DTYPE))
+        if not ignore_nodata:
+            fields.append(("nodata", np.bool_))
+        return np.dtype(fields)
+
+    @classmethod
+    def from_data(cls, data, dimension=0, ignore_nodata=True, statistics=STATISTICS):
+        """
+        Creates the state of the values along a dimension of an array.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers.
+        dimension : int, optional
+            Defines the dimension to compute the state along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that all statistics except the count are np.nan if
+            any value is such a value.
+        statistics : iterable of str, optional
+            Names of the statistics to compute, i.e. any of `STATISTICS` (default is all of them).
+
+        Returns
+        -------
+        Statistics :
+            State of the values along `dimension`.
+
+        """
+        data = np.asarray(data)
+        statistics = set(statistics)
+        state = cls()
+        if "count" in statistics:
+            state.n_valid = np.sum(np.isfinite(data), axis=dimension)
+        if {"min", "max", "extrema"} & statistics:
+            empty = np.full(np.delete(data.shape, dimension), np.nan)
+            if {"min", "extrema"} & statistics:
+                state.minimum = np.fmin.reduce(data, axis=dimension) if data.shape[dimension] > 0 else empty
+            if {"max", "extrema"} & statistics:
+                state.maximum = np.fmax.reduce(data, axis=dimension) if data.shape[dimension] > 0 else empty
+        if {"mean", "sd", "variance"} & statistics:
+            state.moments = Moments.from_data(data, dimension=dimension)
+        if not ignore_nodata:
+            state.nodata = np.any(np.isnan(data), axis=dimension) if data.dtype.kind in "fc" else \
+                np.zeros(np.delete(data.shape, dimension), dtype=bool)
+
+        return state
+
+    @classmethod
+    def from_records(cls, records):
+        """ Creates a state from a record array with the data type `Statistics.records_dtype(...)`. """
+        names = records.dtype.names
+        return cls(records["n_valid"] if "n_valid" in names else None,
+                   records["minimum"] if "minimum" in names else None,
+                   records["maximum"] if "maximum" in names else None,
+                   Moments.from_records(records["moments"]) if "moments" in names else None,
+                   records["nodata"] if "nodata" in names else None)
+
+    def to_records(self):
+        """ Converts the state to a record array with the data type `Statistics.records_dtype(...)`. """
+        fields = [name for name in self.__slots__ if getattr(self, name) is not None]
+        shape = np.shape(getattr(self, fields[0]).count if fields[0] == "moments" else getattr(self, fields[0]))
+        dtype = [(name, MOMENTS_DTYPE if name == "moments" else np.result_type(getattr(self, name)))
+                 for name in fields]
+        records = np.empty(shape, dtype=dtype)
+        for name in fields:
+            records[name] = self.moments.to_records() if name == "moments" else getattr(self, name)
+        return records
+
+    def merge(self, other):
+        """
+        Merges two states.
+
+        Parameters
+        ----------
+        other : Statistics
+            State of other values with the same statistics, having the same (or a broadcastable) shape.
+
+        Returns
+        -------
+        Statistics :
+            State of the values of both states.
+
+        """
+        return Statistics(
+            self.n_valid + other.n_valid if self.n_valid is not None else None,
+            np.fmin(self.minimum, other.minimum) if self.minimum is not None else None,
+            np.fmax(self.maximum, other.maximum) if self.maximum is not None else None,
+            self.moments.merge(other.moments) if self.moments is not None else None,
+            self.nodata | other.nodata if self.nodata is not None else None)
+
+    def append(self, data, dimension=0):
+        """
+        Merges the state of new values, e.g. newly acquired time slices, into this state. No-data values are handled
+        like they have been handled by this state.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers, having the same shape as the state except for `dimension`.
+        dimension : int, optional
+            Defines the dimension of `data` containing the values to append (default is 0).
+
+        Returns
+        -------
+        Statistics :
+            The updated state itself.
+
+        """
+        statistics = [statistic for statistic, name in [("count", "n_valid"), ("min", "minimum"), ("max", "maximum"),
+                                                        ("mean", "moments")] if getattr(self, name) is not None]
+        merged = self.merge(Statistics.from_data(data, dimension=dimension, ignore_nodata=self.nodata is None,
+                                                 statistics=statistics))
+        for name in self.__slots__:
+            setattr(self, name, getattr(merged, name))
+        return self
+
+    def get(self, statistic):
+        """
+        Returns a statistic of the values, as it is returned by the process of the same name.
+
+        Parameters
+        ----------
+        statistic : str
+            Name of the statistic, one of `STATISTICS`. The standard deviation and the variance are computed with 1 as
+            a degree of freedom.
+
+        Returns
+        -------
+        np.array or float or list :
+            The statistic, np.nan where a no-data value has been encountered, which should not be ignored. The extrema
+            are returned as a list containing the minimum and the maximum.
+
+        """
+        if statistic == "count":
+            return self.n_valid[()]
+        elif statistic == "extrema":
+            return [self.get("min"), self.get("max")]
+        elif statistic == "min":
+            values = self.minimum
+        elif statistic == "max":
+            values = self.maximum
+        elif statistic == "mean":
+            values = self.moments.mean
+        elif statistic == "variance":
+            values = self.moments.variance(ddof=1)
+        elif statistic == "sd":
+            values = self.moments.sd(ddof=1)
+        else:
+            raise ValueError("Unknown statistic '{}'.".format(statistic))
+
+        if self.nodata is not None:
+            values = np.where(self.nodata, np.nan, values)
+        return values[()]
+
+
+########################################################################################################################
+# Quantile Sketch
+########################################################################################################################
+
+class QuantileSketch:
+    """
+    Mergeable, approximate summary of the distribution of a sample for estimating quantiles, following the merging
+    t-digest of Dunning and Ertl.
+
+    The values are summarised by a fixed number of centroids (mean and weight), which are sorted by their means. The
+    size of the centroids is limited by the scale function k(q) = compression / (2 pi) * (asin(2q - 1) + pi / 2): all
+    values assigned to one centroid lie within one unit of k. Thus, a centroid around the quantile q covers at most
+    a fraction of about 2 pi sqrt(q (1 - q)) / compression of all values, which bounds the rank error of an estimate
+    relative to the distance to the closest tail. As long as all centroids contain single values, the estimates equal
+    the exact (linearly interpolated) quantiles. The minimum and maximum are tracked exactly.
+
+    All sketch components are arrays with the shape of the output (and an additional last axis for the centroids),
+    so that sketches of all pixels are created and merged at once.
+
+    """
+
+    __slots__ = ("means", "weights", "minimum", "maximum", "nodata", "compression")
+
+    def __init__(self, means, weights, minimum, maximum, nodata, compression=None):
+        """
+        Constructor of `QuantileSketch`.
+
+        Parameters
+        ----------
+        means : np.array
+            Means of the centroids, sorted along the last axis.
+        weights : np.array
+            Weights (i.e. number of values) of the centroids.
+        minimum : np.array
+            Minimum values.
+        maximum : np.array
+            Maximum values.
+        nodata : np.array
+            True if a no-data value has been encountered, which should not be ignored.
+        compression : int, optional
+            Compression parameter, the number of centroids is at most half of it. Defaults to `COMPRESSION`.
+
+        """
+        self.means = means
+        self.weights = weights
+        self.minimum = minimum
+        self.maximum = maximum
+        self.nodata = nodata
+        self.compression = compression or COMPRESSION
+
+    @staticmethod
+    def capacity(compression):
+        """ Returns the maximum number of centroids of a sketch with the given compression. """
+        return int(compression) // 2 + 1
+
+    @staticmethod
+    def records_dtype(compression):
+        """ Returns the record data type of a sketch with the given compression, used for dask reductions. """
+        capacity = QuantileSketch.capacity(compression)
+        return np.dtype([("means", np.float64, (capacity,)), ("weights", np.float64, (capacity,)),
+                         ("minimum", np.float64), ("maximum", np.float64), ("nodata", np.bool_)])
+
+    @classmethod
+    def from_data(cls, data, dimension=0, ignore_nodata=True, compression=None):
+        """
+        Creates the sketch of the values along a dimension of an array.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers.
+        dimension : int, optional
+            Defines the dimension to compute the sketch along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that all quantiles are np.nan if any value is such
+            a value.
+        compression : int, optional
+            Compression parameter (default is `COMPRESSION`).
+
+        Returns
+        -------
+        QuantileSketch :
+            Sketch of the values along `dimension`.
+
+        """
+        values = np.sort(np.moveaxis(np.asarray(data, dtype=float), dimension, -1), axis=-1)  # np.nan is sorted last
+        valid = ~np.isnan(values)
+        nodata = np.zeros(values.shape[:-1], dtype=bool) if ignore_nodata else ~np.all(valid, axis=-1)
+        maximum = np.fmax.reduce(values, axis=-1) if values.shape[-1] > 0 else np.full(values.shape[:-1], np.nan)
+        minimum = values[..., 0] if values.shape[-1] > 0 else maximum
+
+        return cls._compress(values, valid.astype(float), minimum, maximum, nodata, compression or COMPRESSION)
+
+    @classmethod
+    def from_records(cls, records, compression=None):
+        """ Creates a sketch from a record array with the data type `QuantileSketch.records_dtype(compression)`. """
+        return cls(records["means"], records["weights"], records["minimum"], records["maximum"], records["nodata"],
+                   compression=compression)
+
+    def to_records(self):
+        """ Converts the sketch to a record array with the data type `QuantileSketch.records_dtype(compression)`. """
+        records = np.empty(self.minimum.shape, dtype=self.records_dtype(self.compression))
+        records["means"] = self.means
+        records["weights"] = self.weights
+        records["minimum"] = self.minimum
+        records["maximum"] = self.maximum
+        records["nodata"] = self.nodata
+        return records
+
+    def merge(self, other):
+        """
+        Merges two sketches.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            Sketch of other values, having the same shape and compression.
+
+        Returns
+        -------
+        QuantileSketch :
+            Sketch of the values of both sketches.
+
+        """
+        means = np.concatenate([self.means, other.means], axis=-1)
+        weights = np.concatenate([self.weights, other.weights], axis=-1)
+        order = np.argsort(np.where(weights > 0, means, np.inf), axis=-1, kind="stable")
+        return self._compress(np.take_along_axis(means, order, axis=-1), np.take_along_axis(weights, order, axis=-1),
+                              np.fmin(self.minimum, other.minimum), np.fmax(self.maximum, other.maximum),
+                              self.nodata | other.nodata, self.compression)
+
+    def append(self, data, dimension=0, ignore_nodata=True):
+        """
+        Merges the sketch of new values, e.g. newly acquired time slices, into this sketch.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers, having the same shape as the sketch except for `dimension`.
+        dimension : int, optional
+            Defines the dimension of `data` containing the values to append (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+
+        Returns
+        -------
+        QuantileSketch :
+            The updated sketch itself.
+
+        """
+        merged = self.merge(QuantileSketch.from_data(data, dimension=dimension, ignore_nodata=ignore_nodata,
+                                                     compression=self.compression))
+        for name in ("means", "weights", "minimum", "maximum", "nodata"):
+            setattr(self, name, getattr(merged, name))
+        return self
+
+    def quantiles(self, probabilities):
+        """
+        Estimates quantiles by linear interpolation between the centroids, which are located at the centre of the
+        values they represent.
+
+        Parameters
+        ----------
+        probabilities : list
+            A list of probabilities to estimate quantiles for. The probabilities must be between 0 and 1.
+
+        Returns
+        -------
+        np.array or dask.array.Array :
+            The estimated quantiles, the first axis corresponding to `probabilities`. np.nan is returned if there are
+            no (valid) values.
+
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        if eval_datatype(self.minimum) == "dask":
+            out_index = tuple(range(1, self.minimum.ndim + 1))
+            centroid_index = out_index + (self.minimum.ndim + 1,)
+            return da.blockwise(_sketch_quantiles, (0,) + out_index, self.means, centroid_index,
+                                self.weights, centroid_index, self.minimum, out_index, self.maximum, out_index,
+                                self.nodata, out_index, new_axes={0: len(probabilities)}, concatenate=True,
+                                probabilities=probabilities, dtype=float,
+                                meta=np.empty((0,) * (self.minimum.ndim + 1)))
+
+        shape = self.minimum.shape
+        n_centroids = self.means.shape[-1]
+        means = self.means.reshape(-1, n_centroids)
+        weights = self.weights.reshape(-1, n_centroids)
+        minimum = self.minimum.reshape(-1, 1)
+        maximum = self.maximum.reshape(-1, 1)
+        quantiles = np.empty((len(probabilities), means.shape[0]))
+
+        # rows are processed in blocks to keep the comparison of all probabilities and centroids small
+        n_rows = max(BLOCK_SIZE // max(n_centroids * len(probabilities), 1), 1)
+        for start in range(0, means.shape[0], n_rows):
+            rows = slice(start, start + n_rows)
+            quantiles[:, rows] = self._interpolate(means[rows], weights[rows], minimum[rows], maximum[rows],
+                                                   probabilities).T
+
+        quantiles[:, self.nodata.ravel()] = np.nan
+        return quantiles.reshape((len(probabilities),) + shape)
+
+    @staticmethod
+    def _interpolate(means, weights, minimum, maximum, probabilities):
+        # move empty centroids to the end
+        order = np.argsort(weights == 0, axis=-1, kind="stable")
+        means = np.take_along_axis(means, order, axis=-1)
+        weights = np.take_along_axis(weights, order, axis=-1)
+
+        total = np.sum(weights, axis=-1, keepdims=True)
+        centres = np.where(weights > 0, np.cumsum(weights, axis=-1) - weights / 2., total - 0.5)
+        positions = np.concatenate([np.full_like(total, 0.5), centres, total - 0.5], axis=-1)
+        values = np.concatenate([minimum, np.where(weights > 0, means, maximum), maximum], axis=-1)
+
+        # the rank of a quantile follows the linear interpolation of NumPy, i.e. rank 0.5 is the first value
+        ranks = probabilities[None, :] * (total - 1) + 0.5
+        idxs = np.sum(positions[:, None, :] <= ranks[:, :, None], axis=-1) - 1
+        idxs = np.clip(idxs, 0, positions.shape[-1] - 2)
+        x_0 = np.take_along_axis(positions, idxs, axis=-1)
+        x_1 = np.take_along_axis(positions, idxs + 1, axis=-1)
+        v_0 = np.take_along_axis(values, idxs, axis=-1)
+        v_1 = np.take_along_axis(values, idxs + 1, axis=-1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fraction = np.where(x_1 > x_0, (ranks - x_0) / (x_1 - x_0), 0.)
+            quantiles = np.where(fraction >= 0.5, v_1 - (v_1 - v_0) * (1 - fraction), v_0 + (v_1 - v_0) * fraction)
+        return np.where(total > 0, quantiles, np.nan)
+
+    @staticmethod
+    def _compress(means, weights, minimum, maximum, nodata, compression):
+        """
+        Merges centroids (sorted by their means) lying within the same unit of the scale function. The resulting
+        centroids are sorted by their means as well, but empty centroids may lie in between.
+
+        """
+        capacity = QuantileSketch.capacity(compression)
+        shape = means.shape[:-1]
+        means = means.reshape(-1, means.shape[-1])
+        weights = weights.reshape(-1, weights.shape[-1])
+        n_rows = means.shape[0]
+
+        total = np.sum(weights, axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            q = (np.cumsum(weights, axis=-1) - weights / 2.) / total
+        # units of the scale function, looked up via their bounds in q, i.e. the inverse of the scale function
+        bounds = (np.sin(np.arange(capacity) * 2 * np.pi / compression - np.pi / 2) + 1) / 2
+        buckets = np.minimum(np.searchsorted(bounds, q.ravel(), side="right") - 1, capacity - 1)
+        idxs = np.repeat(np.arange(n_rows) * capacity, weights.shape[-1]) + buckets
+
+        new_weights = np.bincount(idxs, weights=weights.ravel(), minlength=n_rows * capacity)
+        new_sums = np.bincount(idxs, weights=np.where(weights > 0, means * weights, 0.).ravel(),
+                               minlength=n_rows * capacity)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            new_means = new_sums / new_weights
+
+        return QuantileSketch(new_means.reshape(shape + (capacity,)), new_weights.reshape(shape + (capacity,)),
+                              minimum, maximum, nodata, compression)
+
+
+def _sketch_quantiles(means, weights, minimum, maximum, nodata, probabilities):
+    return QuantileSketch(means, weights, minimum, maximum, nodata).quantiles(probabilities)
+
+
+########################################################################################################################
+# Streaming Reduction
+########################################################################################################################
+
+def compute_moments(data, dimension=0, ignore_nodata=True):
+    """
+    Computes the state of the values along a dimension of an array in a single pass.
+
+    NumPy arrays are processed in blocks of consecutive slices along `dimension`, each containing roughly
+    `BLOCK_SIZE` elements, whose states are merged one after another. Dask arrays are reduced chunk-wise with a tree
+    reduction of the chunk states.
+
+    Parameters
+    ----------
+    data : np.array or dask.array.Array
+        An array of numbers.
+    dimension : int, optional
+        Defines the dimension to compute the state along (default is 0).
+    ignore_nodata : bool, optional
+        Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+        Setting this flag to False considers no-data values so that the state is np.nan if any value is such a value.
+
+    Returns
+    -------
+    Moments :
+        State of the values along `dimension`. For dask arrays, the state consists of lazy dask arrays.
+
+    """
+    from_data = partial(Moments.from_data, ignore_nodata=ignore_nodata)
+    if eval_datatype(data) == "dask":
+        return Moments.from_records(_reduce_dask(data, dimension, from_data, Moments.from_records, MOMENTS_DTYPE))
+    else:
+        return _reduce_blocks(data, dimension, from_data)
+
+
+def compute_quantile_sketch(data, dimension=0, ignore_nodata=True, compression=COMPRESSION):
+    """
+    Computes the quantile sketch of the values along a dimension of an array in a single pass.
+
+    NumPy arrays are processed in blocks of consecutive slices along `dimension`, each containing roughly
+    `BLOCK_SIZE` elements, whose sketches are merged one after another. Dask arrays are reduced chunk-wise with a tree
+    reduction of the chunk sketches.
+
+    Parameters
+    ----------
+    data : np.array or dask.array.Array
+        An array of numbers.
+    dimension : int, optional
+        Defines the dimension to compute the sketch along (default is 0).
+    ignore_nodata : bool, optional
+        Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+        Setting this flag to False considers no-data values so that all quantiles are np.nan if any value is such a
+        value.
+    compression : int, optional
+        Compression parameter of the sketch (default is `COMPRESSION`), see `QuantileSketch`.
+
+    Returns
+    -------
+    QuantileSketch :
+        Sketch of the values along `dimension`. For dask arrays, the sketch consists of lazy dask arrays.
+
+    """
+    from_data = partial(QuantileSketch.from_data, ignore_nodata=ignore_nodata, compression=compression)
+    if eval_datatype(data) == "dask":
+        from_records = partial(QuantileSketch.from_records, compression=compression)
+        records = _reduce_dask(data, dimension, from_data, from_records, QuantileSketch.records_dtype(compression))
+        return from_records(records)
+    else:
+        # a block should contain at least as many values per output element as the sketch has centroids
+        return _reduce_blocks(data, dimension, from_data, min_slices=QuantileSketch.capacity(compression))
+
+
+def compute_statistics(data, dimension=0, ignore_nodata=True, statistics=STATISTICS):
+    """
+    Computes several statistics of the values along a dimension of an array in a single pass.
+
+    NumPy arrays are processed in blocks of consecutive slices along `dimension`, each containing roughly
+    `BLOCK_SIZE` elements, from which all statistics are computed before the states of the blocks are merged. Dask
+    arrays are reduced chunk-wise with a tree reduction of the chunk states.
+
+    Parameters
+    ----------
+    data : np.array or dask.array.Array
+        An array of numbers.
+    dimension : int, optional
+        Defines the dimension to compute the state along (default is 0).
+    ignore_nodata : bool, optional
+        Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+        Setting this flag to False considers no-data values so that all statistics except the count are np.nan if any
+        value is such a value.
+    statistics : iterable of str, optional
+        Names of the statistics to compute, i.e. any of `STATISTICS` (default is all of them).
+
+    Returns
+    -------
+    Statistics :
+        State of the values along `dimension`, see `Statistics.get`. For dask arrays, the state consists of lazy dask
+        arrays.
+
+    """
+    statistics = tuple(statistics)
+    from_data = partial(Statistics.from_data, ignore_nodata=ignore_nodata, statistics=statistics)
+    if eval_datatype(data) == "dask":
+        dtype = Statistics.records_dtype(statistics, dtype=data.dtype, ignore_nodata=ignore_nodata)
+        return Statistics.from_records(_reduce_dask(data, dimension, from_data, Statistics.from_records, dtype))
+    else:
+        return _reduce_blocks(data, dimension, from_data)
+
+
+def _reduce_blocks(data, dimension, from_data, min_slices=1):
+    """ Merges the states of blocks of consecutive slices along `dimension` one after another. """
+    data = np.asarray(data)
+    dimension = dimension % data.ndim
+    n = data.shape[dimension]
+    if n == 0:  # empty state, i.e. no-data for each remaining element
+        return from_data(data, dimension=dimension)
+
+    n_slices = max(BLOCK_SIZE // max(data.size // n, 1), min_slices)
+    state = None
+    for start in range(0, n, n_slices):
+        block = data[(slice(None),) * dimension + (slice(start, start + n_slices),)]
+        block_state = from_data(block, dimension=dimension)
+        state = block_state if state is None else state.merge(block_state)
+
+    return state
+
+
+def _reduce_dask(data, dimension, from_data, from_records, dtype):
+    """ Reduces a dask array along `dimension` with a tree reduction of the chunk states passed as record arrays. """
+    return da.reduction(data, partial(_chunk_state, from_data=from_data),
+                        partial(_combine_states, from_records=from_records),
+                        combine=partial(_combine_states, from_records=from_records), axis=dimension, dtype=dtype,
+                        meta=np.empty((0,) * (data.ndim - 1), dtype=dtype))
+
+
+def _chunk_state(data, axis, keepdims, from_data):
+    records = from_data(data, dimension=axis[0]).to_records()
+    return np.expand_dims(records, axis) if keepdims else records
+
+
+def _combine_states(records, axis, keepdims, from_records):
+    state = from_records(np.take(records, 0, axis=axis[0]))
+    for i in range(1, records.shape[axis[0]]):
+        state = state.merge(from_records(np.take(records, i, axis=axis[0])))
+    records = state.to_records()
+    return np.expand_dims(records, axis) if keepdims else records
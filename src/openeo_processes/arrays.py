@@ -1,8 +1,15 @@
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 
 from openeo_processes.utils import create_slices
 from openeo_processes.utils import process
+from openeo_processes.utils import LabelIndex
+from openeo_processes.tiling import map_tiles, map_elements
 from openeo_processes.comparison import is_valid
 from openeo_processes.comparison import is_empty
 
@@ -11,6 +18,161 @@ from openeo_processes.errors import ArrayElementParameterMissing
 from openeo_processes.errors import ArrayElementParameterConflict
 from openeo_processes.errors import GenericError
 
+# Number of elements of a 1-D array being compared at once by `array_contains`.
+ARRAY_CONTAINS_BLOCK_SIZE = 2**16
+
+# Maximum number of label arrays for which a mapping from labels to indices is kept by `array_element`.
+LABEL_MAP_CACHE_SIZE = 128
+
+# Maps the id of a labels array to a weak reference to the array and its mapping from labels to indices.
+_label_maps = OrderedDict()
+# Guards `_label_maps`, which is shared by the threads evaluating a process graph.
+_label_maps_lock = threading.Lock()
+
+
+def _get_label_map(labels):
+    """
+    Returns a dictionary mapping each label to the index of its first occurrence in the labels array `labels`.
+    The mapping is created once per labels array and cached, so that repeated label lookups (e.g. in callbacks) cost
+    O(1). Labels arrays must therefore not be modified in place.
+
+    """
+    key = id(labels)
+    with _label_maps_lock:
+        entry = _label_maps.get(key)
+    if entry is not None and entry[0]() is labels:
+        return entry[1]
+
+    label_map = {}
+    for i, label in enumerate(np.asarray(labels).tolist()):
+        label_map.setdefault(label, i)
+    try:
+        reference = weakref.ref(labels)
+    except TypeError:  # e.g. lists cannot be referenced weakly and are therefore not cached
+        return label_map
+    with _label_maps_lock:
+        _label_maps[key] = (reference, label_map)
+        while len(_label_maps) > LABEL_MAP_CACHE_SIZE:
+            _label_maps.popitem(last=False)
+
+    return label_map
+
+
+def _valid_mask(data):
+    """
+    Returns a boolean mask being False for the no-data values of `data`, i.e. np.nan and None values and the masked
+    values of masked arrays.
+
+    """
+    valid = ~pd.isnull(np.ma.getdata(data))
+    if np.ma.isMaskedArray(data):
+        valid &= ~np.ma.getmaskarray(data)
+    return valid
+
+
+def _count_nodata(data, dimension=0):
+    """
+    Counts the no-data values (np.nan, NaT) of `data` along `dimension`. Returns None if the data type of `data`
+    cannot represent no-data values (e.g. integers).
+
+    """
+    if data.dtype.kind not in "fcmM":
+        return None
+    return np.count_nonzero(pd.isnull(data), axis=dimension)
+
+
+def _rotate(data, shifts, dimension=0):
+    """ Rotates each series of `data` along `dimension` by its number of positions in `shifts` (towards the end). """
+    if not np.any(shifts):
+        return data
+    n = data.shape[dimension]
+    shape = [1] * data.ndim
+    shape[dimension] = n
+    idxs = np.arange(n).reshape(shape) - np.expand_dims(shifts, dimension)
+    np.mod(idxs, n, out=idxs)
+    return np.take_along_axis(data, idxs, axis=dimension)
+
+
+def _reverse_argsort(data, dimension):
+    """
+    Computes a stable permutation sorting `data` in descending order along `dimension`, in which np.nan is put first.
+    The flipped data is sorted and the permutation is flipped back, which keeps ties in their original order without
+    negating the data (which fails for unsigned integers).
+
+    """
+    permutation_idxs = np.argsort(np.flip(data, axis=dimension), axis=dimension, kind='stable')
+    np.subtract(data.shape[dimension] - 1, permutation_idxs, out=permutation_idxs)
+    return np.flip(permutation_idxs, axis=dimension)
+
+
+def _nan_argsort(data, dimension=0, asc=True, nodata_last=True, valid=None):
+    """
+    Computes a stable permutation sorting `data` along `dimension` in ascending or descending order, in which the
+    no-data values are put last or first, keeping their original order. The values are sorted in their data type,
+    e.g. small integer types are sorted with a radix sort.
+
+    By default, the no-data values are np.nan (or NaT), which NumPy sorts last, i.e. a stable ascending sort puts them
+    last and a reversed one (see `_reverse_argsort`) puts them first. Otherwise, they are moved to the other end by
+    rotating each series. If the no-data values are given by the boolean mask `valid` (e.g. the mask of a masked
+    array), they are put last or first by a second stable sort.
+
+    """
+    dimension = dimension % data.ndim
+    permutation_idxs = np.argsort(data, axis=dimension, kind='stable') if asc else _reverse_argsort(data, dimension)
+
+    if valid is not None:
+        invalid = ~np.take_along_axis(valid, permutation_idxs, axis=dimension)
+        nodata_idxs = np.argsort(invalid if nodata_last else ~invalid, axis=dimension, kind='stable')
+        return np.take_along_axis(permutation_idxs, nodata_idxs, axis=dimension)
+
+    if nodata_last != asc:
+        n_nodata = _count_nodata(data, dimension=dimension)
+        if n_nodata is not None:
+            permutation_idxs = _rotate(permutation_idxs, n_nodata if asc else -n_nodata, dimension=dimension)
+    return permutation_idxs
+
+
+def _nan_sort(data, dimension=0, asc=True, nodata_last=True):
+    """
+    Sorts `data` along `dimension` in ascending or descending order, in which the no-data values (np.nan) are put last
+    or first. Works like `_nan_argsort`, but sorts the values directly.
+
+    """
+    dimension = dimension % data.ndim
+    data_sorted = np.sort(data, axis=dimension)
+    if not asc:
+        data_sorted = np.flip(data_sorted, axis=dimension)
+    if nodata_last != asc:
+        n_nodata = _count_nodata(data, dimension=dimension)
+        if n_nodata is not None:
+            data_sorted = _rotate(data_sorted, n_nodata if asc else -n_nodata, dimension=dimension)
+    return data_sorted
+
+
+def _drop_nodata(data_sorted, n_nodata, dimension=0):
+    """
+    Removes the no-data values, which have been put last along `dimension`, from sorted data (or a permutation).
+    One-dimensional arrays are shortened. Multi-dimensional arrays keep their shape and are shortened to the longest
+    series of valid values. If the series have different lengths, a masked array is returned, whose masked values
+    are the positions after the end of each series.
+
+    """
+    if n_nodata is None or not np.any(n_nodata):
+        return data_sorted
+
+    dimension = dimension % data_sorted.ndim
+    n_valid = data_sorted.shape[dimension] - n_nodata
+    n_max = int(np.max(n_valid))
+    data_sorted = data_sorted[(slice(None),) * dimension + (slice(0, n_max),)]
+    if np.min(n_valid) == n_max:
+        return data_sorted
+
+    shape = [1] * data_sorted.ndim
+    shape[dimension] = n_max
+    positions = np.arange(n_max).reshape(shape)
+    return np.ma.MaskedArray(data_sorted, mask=positions >= np.expand_dims(n_valid, dimension))
+
+
 ########################################################################################################################
 # Array Contains Process
 ########################################################################################################################
@@ -40,9 +202,8 @@ class ArrayContains:
     def exec_num():
         pass
 
-    # TODO: refine this implementation for larger arrays
     @staticmethod
-    def exec_np(data, value):
+    def exec_np(data, value, dimension=None):
         """
         Checks whether the array specified for `data` contains the value specified in `value`.
         Returns `True` if there's a match, otherwise `False`.
@@ -52,31 +213,71 @@ class ArrayContains:
         data : np.array
             Array to find the value in.
         value : object
-            Value to find in `data`.
+            Value to find in `data`. No-data values (np.nan) are matched by no-data values.
+        dimension : int, optional
+            Dimension/axis along which to search for the (scalar) value. If it is given, a boolean array with the
+            shape of `data` without `dimension` is returned, otherwise only the first level of `data` is searched
+            (default).
 
         Returns
         -------
-        bool :
-            Returns `True` if the list contains the value, `False` otherwise.
+        bool or np.array :
+            Returns `True` if the list contains the value, `False` otherwise. If `dimension` is given, a boolean array
+            is returned, which is `True` for each element containing the value along `dimension`.
 
         Notes
         -----
         `in` is not working because this process checks only for the first level.
+        One-dimensional arrays are searched block by block, so that the search stops at the block containing the first
+        match.
 
         """
-        for elem in data:
-            if np.array(pd.isnull(value)).all() and np.isnan(elem):  # special handling for nan values
-                return True
-            elif np.array(elem == value).all():
-                return True
-        return False
+        data = np.asarray(data)
+        if dimension is not None:
+            return ArrayContains._matches(data, value).any(axis=dimension)
+
+        if data.dtype == object:
+            # arbitrary objects (e.g. dictionaries) can only be compared one by one
+            value_is_nan = np.array(pd.isnull(value)).all()
+            for elem in data:
+                if value_is_nan and np.array(pd.isnull(elem)).all():  # special handling for nan values
+                    return True
+                elif np.array(elem == value).all():
+                    return True
+            return False
+
+        if data.ndim == 0:
+            return False
+        elif data.ndim == 1:
+            if np.ndim(value) != 0:
+                return False
+            for i in range(0, data.size, ARRAY_CONTAINS_BLOCK_SIZE):
+                if ArrayContains._matches(data[i:i + ARRAY_CONTAINS_BLOCK_SIZE], value).any():
+                    return True
+            return False
+        else:
+            # the elements of the first level are sub-arrays, which have to match `value` as a whole
+            value = np.asarray(value)
+            if value.shape != data.shape[1:]:
+                return False
+            matches = ArrayContains._matches(data, value)
+            return bool(matches.reshape(len(data), -1).all(axis=1).any())
+
+    @staticmethod
+    def _matches(data, value):
+        """ Compares `data` element-wise with `value`, whereby no-data values (np.nan) are considered to be equal. """
+        value = np.asarray(value)
+        matches = np.asarray(data == value)
+        if data.dtype.kind in "fc" and value.dtype.kind in "fc":
+            matches = matches | (np.isnan(data) & np.isnan(value))
+        return matches
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -120,22 +321,24 @@ class ArrayElement:
         ----------
         data : np.array
             An array.
-        index : int, optional
-            The zero-based index of the element to retrieve (default is 0).
-        label : int or str, optional
-            The label of the element to retrieve.
+        index : int or list of int, optional
+            The zero-based index of the element to retrieve (default is 0). Several indices select several elements.
+        label : int or str or list, optional
+            The label of the element to retrieve. Several labels select several elements.
         dimension : int, optional
             Defines the index dimension (default is 0).
         return_nodata : bool, optional
             By default this process throws an `ArrayElementNotAvailable` exception if the index or label is invalid.
             If you want to return np.nan instead, set this flag to `True`.
-        labels : np.array, optional
-            The available labels.
+        labels : np.array or LabelIndex, optional
+            The available labels. A `LabelIndex` allows to look up the label with a binary search, otherwise a
+            mapping from labels to indices is created once per labels array and reused by later calls.
 
         Returns
         -------
         object
-            The value of the requested element.
+            The value of the requested element. Several requested elements are returned as an array, which is a view
+            of `data` if the elements are equally spaced along `dimension`.
 
         Raises
         ------
@@ -148,26 +351,70 @@ class ArrayElement:
 
         """
         ArrayElement._check_input(index, label, labels)
-        if label:
-            # Convert label to index, using labels
-            index = labels.tolist().index(label)
-        if index >= data.shape[dimension]:
-            if not return_nodata:
-                raise ArrayElementNotAvailable()
+        n = data.shape[dimension]
+        if label is not None:
+            # Convert label(s) to index/indices, using labels; unknown labels are mapped to an invalid index
+            if isinstance(labels, LabelIndex):
+                index = [ArrayElement._lookup(labels, elem, n) for elem in np.ravel(label)]
+            else:
+                label_map = _get_label_map(labels)
+                index = [label_map.get(elem, n) for elem in np.ravel(label).tolist()]
+            index = index[0] if np.ndim(label) == 0 else index
+
+        if np.ndim(index) == 0:
+            if index >= n:
+                if not return_nodata:
+                    raise ArrayElementNotAvailable()
+                else:
+                    array_elem = np.nan
             else:
-                array_elem = np.nan
+                idx = create_slices(index, axis=dimension, n_axes=len(data.shape))
+                array_elem = data[idx]
         else:
-            idx = create_slices(index, axis=dimension, n_axes=len(data.shape))
-            array_elem = data[idx]
+            indices = np.asarray(index, dtype=int)
+            is_available = indices < n
+            if is_available.all():
+                # equally spaced indices are selected with a slice, which results in a (strided) view
+                idx = create_slices(ArrayElement._to_slice(indices), axis=dimension, n_axes=len(data.shape))
+                array_elem = data[idx]
+            elif not return_nodata:
+                raise ArrayElementNotAvailable()
+            else:
+                array_elem = np.take(data, np.where(is_available, indices, 0), axis=dimension).astype(float)
+                array_elem[create_slices(~is_available, axis=dimension, n_axes=len(data.shape))] = np.nan
 
         return array_elem
 
+    @staticmethod
+    def _lookup(labels, label, n):
+        """ Looks up `label` in the `LabelIndex` `labels` and returns `n` if it is not available. """
+        try:
+            return labels.index(label)
+        except KeyError:
+            return n
+
+    @staticmethod
+    def _to_slice(indices):
+        """
+        Converts an array of equally spaced, ascending, non-negative indices to a slice, otherwise the indices are
+        returned (negative indices count from the end, so that a slice could stop before it starts).
+
+        """
+        if len(indices) == 0 or indices.min() < 0:
+            return indices
+        if len(indices) == 1:
+            return slice(indices[0], indices[0] + 1)
+        steps = np.diff(indices)
+        if steps[0] <= 0 or (steps != steps[0]).any():
+            return indices
+        return slice(indices[0], indices[-1] + 1, steps[0])
+
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
     @staticmethod
@@ -201,7 +448,7 @@ class ArrayElement:
         if index is None and label is None:
             raise ArrayElementParameterMissing()
         
-        if label and labels is None:
+        if label is not None and labels is None:
             msg = "Parameter 'labels' is needed when specifying input parameter 'label'."
             raise GenericError(msg)
 
@@ -236,7 +483,7 @@ class Count:
         pass
 
     @staticmethod
-    def exec_np(data, condition=None, context=None, dimension=0):
+    def exec_np(data, condition=None, context=None, dimension=0, max_workers=1, tile_size=None):
         """
         Gives the number of elements in an array that matches the specified condition.
         Remarks:
@@ -262,6 +509,12 @@ class Count:
             Additional data/keyword arguments to be passed to the condition.
         dimension : int, optional
             Defines the dimension along to count the elements (default is 0).
+        max_workers : int, optional
+            Number of processes evaluating the condition on tiles of the array in parallel (default is 1). If None, the
+            number of CPUs is used. The array is passed to the processes via shared memory (see
+            `openeo_processes.tiling.map_elements`), which pays off for conditions being evaluated element by element.
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
@@ -270,27 +523,48 @@ class Count:
 
         Notes
         -----
-        The condition/expression must be able to deal with NumPy arrays.
+        The condition is called once with the whole array, so it should be able to deal with NumPy arrays and return
+        a boolean array of the same shape. Conditions, which cannot deal with arrays, are evaluated element by element.
+        Valid elements (default) are counted with a single call of `is_valid` on the whole array.
 
         """
+        data = np.asarray(data)
         if condition is None:
-            condition = is_valid
-        if condition is True: # explicit check needed
-            count = data.shape[dimension]
+            count = np.sum(is_valid(data), axis=dimension)
+        elif condition is True:  # explicit check needed
+            reduced_shape = np.delete(data.shape, dimension)
+            count = np.full(reduced_shape, data.shape[dimension])[()]  # scalar for 1-D data, as `np.sum`
         elif callable(condition):
             context = context if context is not None else {}
-            count = sum(1 for x in data if condition(x, **context))
+            matches = map_elements(functools.partial(Count._evaluate, condition, context=context), data,
+                                   max_workers=max_workers, tile_size=tile_size)
+            count = np.sum(matches, axis=dimension)
         else:
             raise ValueError(condition)
 
         return count
 
+    @staticmethod
+    def _evaluate(condition, data, context):
+        """
+        Evaluates `condition` on the whole array `data`. If the condition does not return a result for each element,
+        it is evaluated element by element.
+
+        """
+        try:
+            matches = np.asarray(condition(data, **context))
+        except (TypeError, ValueError):
+            matches = None
+        if matches is None or matches.shape != data.shape:
+            matches = np.asarray(np.frompyfunc(lambda x: condition(x, **context), 1, 1)(data), dtype=object)
+        return matches == True  # counts only elements for which the condition is True
+
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -324,7 +598,7 @@ class ArrayApply:
         pass
 
     @staticmethod
-    def exec_np(data, process, context=None):
+    def exec_np(data, process, context=None, max_workers=1, tile_size=None):
         """
         Applies a unary process which takes a single value such as `absolute` or `sqrt` to each value in the array.
         This is basically what other languages call either a `for each` loop or a `map` function.
@@ -341,6 +615,12 @@ class ArrayApply:
                 - `context` : Additional data passed by the user.
         context : dict, optional
             Additional data/keyword arguments to be passed to the process.
+        max_workers : int, optional
+            Number of processes evaluating the process on tiles of the array in parallel (default is 1). If None, the
+            number of CPUs is used. The array is passed to the processes via shared memory (see
+            `openeo_processes.tiling.map_elements`), which pays off for processes being evaluated element by element.
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
@@ -355,14 +635,15 @@ class ArrayApply:
         """
 
         context = context if context is not None else {}
-        return process(data, **context)
+        return map_elements(functools.partial(process, **context), data, max_workers=max_workers,
+                            tile_size=tile_size)
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -396,7 +677,7 @@ class ArrayFilter:
         pass
 
     @staticmethod
-    def exec_np(data, condition, context=None):
+    def exec_np(data, condition, context=None, max_workers=1, tile_size=None):
         """
         Filters the array elements based on a logical expression so that afterwards an array is returned that only
         contains the values conforming to the condition.
@@ -413,6 +694,12 @@ class ArrayFilter:
                 - `context` : Additional data passed by the user.
         context : dict, optional
             Additional data/keyword arguments to be passed to the condition.
+        max_workers : int, optional
+            Number of processes evaluating the condition on tiles of the array in parallel (default is 1). If None, the
+            number of CPUs is used. The array is passed to the processes via shared memory (see
+            `openeo_processes.tiling.map_elements`), which pays off for conditions being evaluated element by element.
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
@@ -428,14 +715,16 @@ class ArrayFilter:
         """
 
         context = context if context is not None else {}
-        return data[condition(data, **context)]
+        data = np.asarray(data)
+        return data[map_elements(functools.partial(condition, **context), data, max_workers=max_workers,
+                                 tile_size=tile_size)]
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -512,7 +801,7 @@ class ArrayFind:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -571,7 +860,7 @@ class ArrayLabels:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -612,7 +901,8 @@ class First:
         Parameters
         ----------
         data : np.array
-            An array. An empty array resolves always with np.nan.
+            An array. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -630,7 +920,7 @@ class First:
 
         n_dims = len(data.shape)
         if ignore_nodata:  # skip np.nan values
-            nan_mask = ~pd.isnull(data)  # create mask for valid values (not np.nan)
+            nan_mask = _valid_mask(data)  # create mask for valid values (not np.nan or masked)
             idx_first = np.argmax(nan_mask, axis=dimension)
             first_elem = np.take_along_axis(data, np.expand_dims(idx_first, axis=dimension), axis=dimension)
         else:  # take the first element, no matter np.nan values are in the array
@@ -644,7 +934,7 @@ class First:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -685,7 +975,8 @@ class Last:
         Parameters
         ----------
         data : np.array
-            An array. An empty array resolves always with np.nan.
+            An array. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -716,7 +1007,7 @@ class Last:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -739,7 +1030,6 @@ def order():
     return Order()
 
 
-# TODO: can nodata algorithm be simplified/enhanced?
 class Order:
     """
     Class implementing all 'order' processes.
@@ -751,7 +1041,7 @@ class Order:
         pass
 
     @staticmethod
-    def exec_np(data, dimension=0, asc=True, nodata=None):
+    def exec_np(data, dimension=0, asc=True, nodata=None, max_workers=1, tile_size=None):
         """
         Computes a permutation which allows rearranging the data into ascending or descending order.
         In other words, this process computes the ranked (sorted) element positions in the original list.
@@ -762,7 +1052,8 @@ class Order:
         Parameters
         ----------
         data : np.array
-            An array to compute the order for.
+            An array to compute the order for. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values, the others are sorted in their data type.
         dimension : int, optional
             Defines the dimension to order along (default is 0).
         asc : bool, optional
@@ -770,56 +1061,58 @@ class Order:
             set this parameter to `False`.
         nodata : obj, optional
             Controls the handling of no-data values (np.nan). By default they are removed. If `True`, missing values
-            in the data are put last; if `False`, they are put first.
+            in the data are put last; if `False`, they are put first. Either way, they keep their original order.
+        max_workers : int, optional
+            Number of threads sorting tiles of the remaining dimensions in parallel (default is 1). If None, the number
+            of CPUs is used (see `openeo_processes.tiling.map_tiles`).
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
         np.array :
-            The computed permutation.
+            The computed permutation, having the same shape as `data`. If no-data values are removed from a
+            multi-dimensional array, the permutation is shortened along `dimension` to the largest number of valid
+            values and positions after the valid values of a series are masked (see `np.ma.MaskedArray`).
 
-        Notes
-        -----
-        - the case with nodata=False is complicated, since a simple nan masking destroys the structure of the array
-        - due to the flipping, the order of the np.nan values is wrong, but this is ignored, since this order should
-          not be relevant
         """
 
-        if asc:
-            permutation_idxs = np.argsort(data, kind='mergesort', axis=dimension)
-        else:  # [::-1] not possible
-            permutation_idxs = np.argsort(-data, kind='mergesort', axis=dimension)  # to get the indizes in descending order, the sign of the data is changed
+        if np.ma.isMaskedArray(data):
+            return Order._order_masked(data, dimension=dimension, asc=asc, nodata=nodata)
 
+        if nodata not in (None, True, False):
+            err_msg = "Data type of 'nodata' argument is not supported."
+            raise Exception(err_msg)
+
+        data = np.asarray(data)
+        nodata_last = nodata is not False  # removed no-data values are put last first
+        permutation_idxs = map_tiles(lambda tile: _nan_argsort(tile, dimension=dimension, asc=asc,
+                                                               nodata_last=nodata_last),
+                                     data, dimension=dimension, max_workers=max_workers, tile_size=tile_size)
         if nodata is None:  # ignore np.nan values
-            # sort the original data first, to get correct position of no data values
-            sorted_data = data[permutation_idxs]
-            return permutation_idxs[~pd.isnull(sorted_data)]
-        elif nodata is False:  # put location/index of np.nan values first
-            # sort the original data first, to get correct position of no data values
-            sorted_data = data[permutation_idxs]
-            nan_idxs = pd.isnull(sorted_data)
-
-            # flip permutation and nan mask
-            permutation_idxs_flip = np.flip(permutation_idxs, axis=dimension)
-            nan_idxs_flip = np.flip(nan_idxs, axis=dimension)
-
-            # flip causes the nan.values to be first, however the order of all other values is also flipped
-            # therefore the non np.nan values (i.e. the wrong flipped order) is replaced by the right order given by
-            # the original permutation values
-            permutation_idxs_flip[~nan_idxs_flip] = permutation_idxs[~nan_idxs]
-
-            return permutation_idxs_flip
-        elif nodata is True:  # default argsort behaviour, np.nan values are put last
-            return permutation_idxs
-        else:
+            return _drop_nodata(permutation_idxs, _count_nodata(data, dimension=dimension), dimension=dimension)
+        return permutation_idxs
+
+    @staticmethod
+    def _order_masked(data, dimension=0, asc=True, nodata=None):
+        """ Computes the permutation of a masked array, whose masked values are no-data values. """
+        if nodata not in (None, True, False):
             err_msg = "Data type of 'nodata' argument is not supported."
             raise Exception(err_msg)
 
+        valid = _valid_mask(data)
+        permutation_idxs = _nan_argsort(np.ma.getdata(data), dimension=dimension, asc=asc,
+                                        nodata_last=nodata is not False, valid=valid)
+        if nodata is None:  # ignore no-data values
+            return _drop_nodata(permutation_idxs, np.count_nonzero(~valid, axis=dimension), dimension=dimension)
+        return permutation_idxs
+
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -879,7 +1172,7 @@ class Rearrange:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -902,7 +1195,6 @@ def sort():
     return Sort()
 
 
-# TODO: can nodata=False algorithm be simplified?
 class Sort:
     """
     Class implementing all 'sort' processes.
@@ -923,7 +1215,8 @@ class Sort:
         Parameters
         ----------
         data : np.array
-            An array with data to sort.
+            An array with data to sort. Masked values of a masked array (see `openeo_processes.utils.mask_nodata`)
+            are no-data values, the others are sorted in their data type.
         dimension : int, optional
             Defines the dimension to sort along (default is 0).
         asc : bool, optional
@@ -936,35 +1229,46 @@ class Sort:
         Returns
         -------
         np.array :
-            The sorted array.
+            The sorted array, having the same shape as `data`. If no-data values are removed from a multi-dimensional
+            array, it is shortened along `dimension` to the largest number of valid values and positions after the
+            valid values of a series are masked (see `np.ma.MaskedArray`).
 
         """
-        if asc:
-            data_sorted = np.sort(data, axis=dimension)
-        else:  # [::-1] not possible
-            data_sorted = -np.sort(-data, axis=dimension)  # to get the indexes in descending order, the sign of the data is changed
+        if np.ma.isMaskedArray(data):
+            return Sort._sort_masked(data, dimension=dimension, asc=asc, nodata=nodata)
+
+        if nodata not in (None, True, False):
+            err_msg = "Data type of 'nodata' argument is not supported."
+            raise Exception(err_msg)
 
+        data = np.asarray(data)
+        data_sorted = _nan_sort(data, dimension=dimension, asc=asc, nodata_last=nodata is not False)
         if nodata is None:  # ignore np.nan values
-            nan_idxs = pd.isnull(data_sorted)
-            return data_sorted[~nan_idxs]
-        elif nodata == False:  # put np.nan values first
-            nan_idxs = pd.isnull(data_sorted)
-            data_sorted_flip = np.flip(data_sorted, axis=dimension)
-            nan_idxs_flip = pd.isnull(data_sorted_flip)
-            data_sorted_flip[~nan_idxs_flip] = data_sorted[~nan_idxs]
-            return data_sorted_flip
-        elif nodata == True:  # default sort behaviour, np.nan values are put last
-            return data_sorted
-        else:
+            return _drop_nodata(data_sorted, _count_nodata(data, dimension=dimension), dimension=dimension)
+        return data_sorted
+
+    @staticmethod
+    def _sort_masked(data, dimension=0, asc=True, nodata=None):
+        """ Sorts a masked array, whose masked values are no-data values. """
+        if nodata not in (None, True, False):
             err_msg = "Data type of 'nodata' argument is not supported."
             raise Exception(err_msg)
 
+        valid = _valid_mask(data)
+        permutation_idxs = _nan_argsort(np.ma.getdata(data), dimension=dimension, asc=asc,
+                                        nodata_last=nodata is not False, valid=valid)
+        data_sorted = np.take_along_axis(np.ma.getdata(data), permutation_idxs, axis=dimension)
+        valid_sorted = np.take_along_axis(valid, permutation_idxs, axis=dimension)
+        if nodata is None:  # ignore no-data values
+            return _drop_nodata(data_sorted, np.count_nonzero(~valid, axis=dimension), dimension=dimension)
+        return np.ma.MaskedArray(data_sorted, mask=~valid_sorted, fill_value=data.fill_value)
+
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -998,7 +1302,7 @@ class Mask:
         pass
 
     @staticmethod
-    def exec_np(data, mask, replacement=np.nan, dimension=0):
+    def exec_np(data, mask, replacement=np.nan, dimension=0, out=None):
         """
         Applies a mask to an array. A mask is an array for which corresponding elements among `data` and `mask` are
         compared and those elements in `data` are replaced whose elements in `mask` are non-zero (for numbers) or True
@@ -1016,6 +1320,9 @@ class Mask:
             The value used to replace masked values with.
         dimension : int, optional
             Defines the dimension along to apply the mask (default is 0).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `data` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1023,17 +1330,19 @@ class Mask:
             The masked array.
 
         """
-        if data.shape == mask.shape:
-            data[mask] = replacement
-        else:
-            data[mask[None, :, :]] = replacement
+        # a mask with less dimensions than `data` is broadcasted along the leading dimensions
+        if out is None:
+            return np.where(mask, replacement, data)
 
-        return data
+        if out is not data:
+            np.copyto(out, data)
+        np.copyto(out, replacement, where=np.asarray(mask, dtype=bool))
+        return out
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
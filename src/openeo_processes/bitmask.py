@@ -0,0 +1,237 @@
+import numpy as np
+
+
+########################################################################################################################
+# Three-Valued Logic Kernels
+########################################################################################################################
+
+# The kernels below implement openEO's three-valued logic (True, False and no-data) on pairs of arrays `(values, valid)`,
+# in which `values` is only True for valid True values. They only use bitwise operations, so that they work on boolean
+# arrays as well as on the bits of packed `uint8` arrays (see `Bitmask`).
+
+def logical_and(x, y):
+    """ Three-valued AND: False if any operand is False, no-data if the outcome is ambiguous. """
+    (x_values, x_valid), (y_values, y_valid) = x, y
+    valid = (x_valid & y_valid) | (x_valid & ~x_values) | (y_valid & ~y_values)
+    return x_values & y_values, valid
+
+
+def logical_or(x, y):
+    """ Three-valued OR: True if any operand is True, no-data if the outcome is ambiguous. """
+    (x_values, x_valid), (y_values, y_valid) = x, y
+    values = x_values | y_values
+    return values, (x_valid & y_valid) | values
+
+
+def logical_xor(x, y):
+    """ Three-valued XOR: no-data if any operand is no-data. """
+    (x_values, x_valid), (y_values, y_valid) = x, y
+    valid = x_valid & y_valid
+    return (x_values ^ y_values) & valid, valid
+
+
+def logical_not(x):
+    """ Three-valued NOT: no-data stays no-data. """
+    values, valid = x
+    return ~values & valid, valid
+
+
+def _reduce_or(data, axis):
+    """ Bitwise OR along `axis`, boolean arrays are reduced with their `any` method (which keeps dask arrays lazy). """
+    return data.any(axis=axis) if data.dtype == bool else np.bitwise_or.reduce(data, axis=axis)
+
+
+def _reduce_and(data, axis):
+    """ Bitwise AND along `axis`, boolean arrays are reduced with their `all` method (which keeps dask arrays lazy). """
+    return data.all(axis=axis) if data.dtype == bool else np.bitwise_and.reduce(data, axis=axis)
+
+
+def reduce_any(x, axis, ignore_nodata=True):
+    """ Three-valued ANY along `axis`, either ignoring no-data values or considering them. """
+    values, valid = x
+    any_values = _reduce_or(values, axis=axis)
+    if ignore_nodata:  # no-data if all values are no-data
+        return any_values, _reduce_or(valid, axis=axis)
+    else:  # no-data if no value is True and any value is no-data
+        return any_values, any_values | _reduce_and(valid, axis=axis)
+
+
+def reduce_all(x, axis, ignore_nodata=True):
+    """ Three-valued ALL along `axis`, either ignoring no-data values or considering them. """
+    values, valid = x
+    if ignore_nodata:  # no-data if all values are no-data
+        any_valid = _reduce_or(valid, axis=axis)
+        return _reduce_and(values | ~valid, axis=axis) & any_valid, any_valid
+    else:  # no-data if no value is False and any value is no-data
+        any_false = _reduce_or(valid & ~values, axis=axis)
+        return _reduce_and(values, axis=axis), any_false | _reduce_and(valid, axis=axis)
+
+
+def to_ternary(data):
+    """
+    Converts an array of logical values to a pair of boolean arrays `(values, valid)`. No-data values are np.nan, None
+    and the masked values of masked arrays.
+
+    """
+    data = data if hasattr(data, "dtype") else np.asanyarray(data)  # keeps lazy arrays (e.g. dask) lazy
+    values = np.ma.getdata(data) if np.ma.isMaskedArray(data) else data
+    if values.dtype == bool:
+        valid = np.ones(values.shape, dtype=bool)
+    elif values.dtype == object:
+        valid = np.frompyfunc(lambda v: v is not None and v == v, 1, 1)(values).astype(bool)
+    else:
+        valid = ~np.isnan(values) if values.dtype.kind in "fc" else np.ones(values.shape, dtype=bool)
+    if np.ma.isMaskedArray(data):
+        valid &= ~np.ma.getmaskarray(data)
+    values = np.where(valid, values, False).astype(bool) if values.dtype != bool else values & valid
+    return values, valid
+
+
+def from_ternary(values, valid, masked=False):
+    """
+    Converts a pair of boolean arrays `(values, valid)` to a masked boolean array or to a `float32` array, in which
+    no-data values are np.nan.
+
+    """
+    if masked:
+        return np.ma.MaskedArray(values, mask=~valid)
+    return np.where(valid, values, np.nan).astype(np.float32)
+
+
+########################################################################################################################
+# Bitmask
+########################################################################################################################
+
+class Bitmask:
+    """
+    Array of logical values with no-data values (three-valued logic), whose values and validity are packed into bits
+    along the last dimension, i.e. two bits per element instead of four bytes per element of a `float32` array with
+    np.nan values. The logical processes `and_`, `or_`, `xor`, `not_`, `any_` and `all_` operate directly on the packed
+    bytes, processing eight elements per operation. All other processes need a dense array (see `to_array`).
+
+    Attributes
+    ----------
+    values : np.ndarray
+        Packed bits (`uint8`) being set for valid True values.
+    valid : np.ndarray
+        Packed bits (`uint8`) being set for valid values. The bits padding the last dimension are not set.
+    shape : tuple
+        Shape of the unpacked array.
+
+    """
+
+    __slots__ = ("values", "valid", "shape")
+
+    def __init__(self, values, valid, shape):
+        """
+        Constructor of `Bitmask`.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Packed bits (`uint8`) being set for valid True values.
+        valid : np.ndarray
+            Packed bits (`uint8`) being set for valid values.
+        shape : tuple
+            Shape of the unpacked array.
+
+        """
+        self.values = values
+        self.valid = valid
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_array(cls, data):
+        """
+        Packs an array of logical values.
+
+        Parameters
+        ----------
+        data : np.ndarray or list
+            Array with at least one dimension of boolean values, numbers (np.nan being no-data), objects (None being
+            no-data) or a masked array (masked values being no-data).
+
+        Returns
+        -------
+        Bitmask :
+            Packed array.
+
+        """
+        if isinstance(data, Bitmask):
+            return data
+        values, valid = to_ternary(np.atleast_1d(data))
+        return cls(np.packbits(values, axis=-1), np.packbits(valid, axis=-1), values.shape)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.valid.nbytes
+
+    def __len__(self):
+        return self.shape[0]
+
+    def unpack(self):
+        """
+        Unpacks the bits into boolean arrays.
+
+        Returns
+        -------
+        np.ndarray :
+            Boolean array being True for valid True values.
+        np.ndarray :
+            Boolean array being True for valid values.
+
+        """
+        n = self.shape[-1]
+        return (np.unpackbits(self.values, axis=-1, count=n).astype(bool),
+                np.unpackbits(self.valid, axis=-1, count=n).astype(bool))
+
+    def to_array(self, masked=False):
+        """
+        Unpacks the bits into a dense array.
+
+        Parameters
+        ----------
+        masked : bool, optional
+            If True, a masked boolean array is returned, whose masked values are no-data values. Otherwise (default), a
+            `float32` array is returned, in which no-data values are np.nan.
+
+        Returns
+        -------
+        np.ndarray :
+            Dense array of logical values.
+
+        """
+        return from_ternary(*self.unpack(), masked=masked)
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.to_array()
+        return array if dtype is None else array.astype(dtype)
+
+    def __repr__(self):
+        return "Bitmask(shape={}, nbytes={})".format(self.shape, self.nbytes)
+
+    def reduce(self, reducer, dimension=0, ignore_nodata=True):
+        """
+        Reduces the array along `dimension` with a three-valued logic reducer (e.g. `reduce_any`). Dimensions except
+        the last one are reduced on the packed bits.
+
+        Returns
+        -------
+        Bitmask or bool or None :
+            Reduced array or a single logical value (None being no-data) if the array has only one dimension.
+
+        """
+        dimension = dimension % self.ndim
+        shape = self.shape[:dimension] + self.shape[dimension + 1:]
+        if dimension < self.ndim - 1:
+            values, valid = reducer((self.values, self.valid), axis=dimension, ignore_nodata=ignore_nodata)
+            return Bitmask(values, valid, shape)
+
+        values, valid = reducer(self.unpack(), axis=dimension, ignore_nodata=ignore_nodata)
+        if not shape:
+            return bool(values) if valid else None
+        return Bitmask(np.packbits(values, axis=-1), np.packbits(valid, axis=-1), shape)
@@ -2,8 +2,16 @@ import datetime
 import math
 
 import numpy as np
+
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
 from openeo_processes.utils import process
 from openeo_processes.utils import str2time
+from openeo_processes.utils import str2datetime64
+from openeo_processes.utils import LabelIndex
 
 
 # TODO: test if this works for different data types
@@ -25,6 +33,82 @@ def is_empty(data):
     return len(data) == 0
 
 
+def _map_objects(x, fun):
+    """
+    Applies the scalar function `fun` returning a boolean to each element of the object array `x`
+    (NumPy or dask array).
+
+    """
+    ufunc = np.frompyfunc(fun, 1, 1)
+    if da is not None and isinstance(x, da.Array):
+        return x.map_blocks(lambda block: ufunc(block).astype(bool), dtype=bool)
+    return np.asarray(ufunc(x)).astype(bool)
+
+
+def _nodata_mask(x):
+    """
+    Returns a boolean mask being True for each no-data value of the NumPy or dask array `x`. No-data values are NaN
+    and NaT values, since NumPy arrays do not support None, None values in object arrays and the masked values of
+    masked arrays.
+
+    """
+    if np.ma.isMaskedArray(x):
+        return np.ma.getmaskarray(x) | _nodata_mask(np.ma.getdata(x))
+    if x.dtype.kind in "fc":
+        return np.isnan(x)
+    elif x.dtype.kind in "mM":
+        return np.isnat(x)
+    elif x.dtype == object:
+        return _map_objects(x, lambda v: v is None or (isinstance(v, float) and math.isnan(v)))
+    else:
+        return np.zeros_like(x, dtype=bool)
+
+
+def _as_strings(array):
+    """
+    Converts object arrays only containing strings (e.g. labels passed as lists) to NumPy string arrays, so that they
+    are compared like string arrays. All other arrays are returned unchanged.
+
+    """
+    if array.dtype == object and array.size > 0 and all(isinstance(item, str) for item in array.flat):
+        return array.astype(str)
+    return array
+
+
+def _to_datetime64(value):
+    """
+    Converts temporal strings, datetime objects or `datetime64` values (or arrays of them) to UTC time stamps with
+    data type `datetime64[ns]`. None is returned for non-temporal values.
+
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, "ns")
+
+    array = _as_strings(np.asarray(value))
+    if array.dtype.kind in "US":
+        return str2datetime64(array)
+    elif array.dtype.kind == "M":
+        return array.astype("datetime64[ns]", copy=False)
+    else:
+        return None
+
+
+def _temporal_operands(x, y):
+    """
+    Converts both operands of a comparison to UTC time stamps (see `_to_datetime64`) if both are temporal, so that
+    temporal strings are compared based on their time stamps and not on their string representation.
+    Otherwise, the operands are returned as arrays, masked arrays keeping their masks, so that the results of the
+    comparison are masked at the no-data values.
+
+    """
+    x_time, y_time = _to_datetime64(x), _to_datetime64(y)
+    if x_time is None or y_time is None:
+        return np.asanyarray(x), np.asanyarray(y)
+    return x_time, y_time
+
+
 ########################################################################################################################
 # Is Nodata Process
 ########################################################################################################################
@@ -85,18 +169,48 @@ class IsNodata:
 
         Notes
         -----
-        Attention! Since None values are not supported NumPy and Pandas, this method has the same behaviour as `is_nan`.
+        Attention! Since None values are not supported NumPy and Pandas, this method has the same behaviour as `is_nan`
+        for numerical arrays, i.e. NaN values are considered to be no-data values. In object arrays, None values are
+        no-data values as well.
 
         """
-        return IsNodata.exec_num(x)
+        return _nodata_mask(np.asanyarray(x))
 
     @staticmethod
     def exec_xar(x):
-        return IsNodata.exec_num(x)
+        """
+        Checks whether the specified data is a missing data, i.e. equals to a no-data value/None.
+
+        Parameters
+        ----------
+        x : xr.DataArray
+            The data to check.
+
+        Returns
+        -------
+        xr.DataArray :
+            Array with True values if the data is a no-data value/None, otherwise False values.
+
+        """
+        return x.copy(data=_nodata_mask(x.data))
 
     @staticmethod
-    def exec_da(x):
-        return IsNodata.exec_num(x)
+    def exec_dar(x):
+        """
+        Checks whether the specified data is a missing data, i.e. equals to a no-data value/None.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            The data to check.
+
+        Returns
+        -------
+        dask.array.Array :
+            Array with True values if the data is a no-data value/None, otherwise False values.
+
+        """
+        return _nodata_mask(x)
 
 
 ########################################################################################################################
@@ -156,19 +270,61 @@ class IsNan:
 
         Returns
         -------
-        bool :
-            True if the data is a not a number, otherwise False.
+        np.array :
+            Array with True values if the data is a not a number, otherwise False values.
 
         """
-        return IsNan.exec_num(x)
+        return IsNan._mask(np.asarray(x))
 
     @staticmethod
     def exec_xar(x):
-        return IsNan.exec_num(x)
+        """
+        Checks whether the specified array `x` contains values being not a number (often abbreviated as NaN).
+        The definition of NaN follows the IEEE Standard 754. All non-numeric data types also return True.
+
+        Parameters
+        ----------
+        x : xr.DataArray
+            The data to check.
+
+        Returns
+        -------
+        xr.DataArray :
+            Array with True values if the data is a not a number, otherwise False values.
+
+        """
+        return x.copy(data=IsNan._mask(x.data))
 
     @staticmethod
-    def exec_da(x):
-        return IsNan.exec_num(x)
+    def exec_dar(x):
+        """
+        Checks whether the specified array `x` contains values being not a number (often abbreviated as NaN).
+        The definition of NaN follows the IEEE Standard 754. All non-numeric data types also return True.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            The data to check.
+
+        Returns
+        -------
+        dask.array.Array :
+            Array with True values if the data is a not a number, otherwise False values.
+
+        """
+        return IsNan._mask(x)
+
+    @staticmethod
+    def _mask(x):
+        """ Computes the NaN mask of a NumPy or dask array `x`. """
+        if x.dtype.kind in "fc":
+            return np.isnan(x)
+        elif x.dtype.kind in "biu":
+            return np.zeros_like(x, dtype=bool)
+        elif x.dtype == object:
+            return _map_objects(x, lambda v: IsNan.exec_num(v.item() if isinstance(v, np.generic) else v))
+        else:
+            return np.ones_like(x, dtype=bool)
 
 
 ########################################################################################################################
@@ -231,24 +387,70 @@ class IsValid:
 
         Parameters
         ----------
-        x : float or int or str
+        x : np.array
             The data to check.
 
         Returns
         -------
-        bool :
-            True if the data is valid, otherwise False.
+        np.array :
+            Array with True values if the data is valid, otherwise False values.
 
         """
-        return IsValid.exec_num(x)
+        return IsValid._mask(np.asanyarray(x))
 
     @staticmethod
     def exec_xar(x):
-        return IsValid.exec_num(x)
+        """
+        Checks whether the specified array `x` contains valid values. A value is considered valid if it is
+            - not a no-data value (null) and
+            - a finite number (only if it is a number). The definition of finite and infinite numbers follows the
+              IEEE Standard 754.
+
+        Parameters
+        ----------
+        x : xr.DataArray
+            The data to check.
+
+        Returns
+        -------
+        xr.DataArray :
+            Array with True values if the data is valid, otherwise False values.
+
+        """
+        return x.copy(data=IsValid._mask(x.data))
 
     @staticmethod
-    def exec_da(x):
-        return IsValid.exec_num(x)
+    def exec_dar(x):
+        """
+        Checks whether the specified array `x` contains valid values. A value is considered valid if it is
+            - not a no-data value (null) and
+            - a finite number (only if it is a number). The definition of finite and infinite numbers follows the
+              IEEE Standard 754.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            The data to check.
+
+        Returns
+        -------
+        dask.array.Array :
+            Array with True values if the data is valid, otherwise False values.
+
+        """
+        return IsValid._mask(x)
+
+    @staticmethod
+    def _mask(x):
+        """ Computes the validity mask of a NumPy or dask array `x`. """
+        if np.ma.isMaskedArray(x):
+            return ~np.ma.getmaskarray(x) & IsValid._mask(np.ma.getdata(x))
+        elif x.dtype.kind in "fc":
+            return np.isfinite(x)
+        elif x.dtype == object:
+            return _map_objects(x, IsValid.exec_num)
+        else:
+            return ~_nodata_mask(x)
 
 
 ########################################################################################################################
@@ -332,9 +534,10 @@ class Eq:
             return False
 
     @staticmethod
-    def exec_np(x, y, delta=None, case_sensitive=True, reduce=False):  # TODO: add equal checks for date strings
+    def exec_np(x, y, delta=None, case_sensitive=True, reduce=False):
         """
         Compares whether `x` is strictly equal to `y`.
+        Temporal strings are compared based on their time stamps (see `openeo_processes.utils.str2datetime64`).
 
         Parameters
         ----------
@@ -362,11 +565,19 @@ class Eq:
         if x is None or y is None:
             return None
 
+        x, y = _as_strings(np.asanyarray(x)), _as_strings(np.asanyarray(y))
         if x.dtype.kind.lower() in ['f', 'i'] and y.dtype.kind.lower() in ['f', 'i']:  # both arrays only contain numbers
             if type(delta) in [float, int]:
                 ar_eq = np.isclose(x, y, atol=delta)
             else:
                 ar_eq = x == y
+        elif x.dtype.kind in ['U', 'S'] and y.dtype.kind in ['U', 'S']:  # comparison of strings or dates
+            x_time = str2datetime64(x)
+            y_time = str2datetime64(y)
+            is_time = ~np.isnat(x_time) & ~np.isnat(y_time)
+            if not case_sensitive:
+                x, y = np.char.lower(x), np.char.lower(y)
+            ar_eq = np.where(is_time, x_time == y_time, x == y)
         else:
             ar_eq = x == y
 
@@ -380,8 +591,47 @@ class Eq:
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, delta=None, case_sensitive=True, reduce=False):
+        """
+        Compares whether `x` is strictly equal to `y` chunk-wise.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        delta : float, optional
+            Only applicable for comparing two arrays containing numbers. If this optional parameter is set to a
+            positive non-zero number the equality of two numbers is checked against a delta value.
+        case_sensitive : bool, optional
+            Only applicable for comparing two string arrays. Case sensitive comparison can be disabled by setting this
+            parameter to False.
+        reduce : bool, optional
+            If True, one value will be returned, i.e. if the arrays are equal.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is equal to `y`, otherwise False.
+
+        """
+        if x is None or y is None:
+            return None
+
+        if type(delta) in [float, int]:
+            ar_eq = da.isclose(x, y, atol=delta)
+        elif not case_sensitive and x.dtype.kind in ['U', 'S']:
+            y = y.map_blocks(np.char.lower) if isinstance(y, da.Array) else np.char.lower(y)
+            ar_eq = x.map_blocks(np.char.lower) == y
+        else:
+            ar_eq = x == y
+
+        if reduce:
+            return ar_eq.all()
+        else:
+            return ar_eq
 
 
 ########################################################################################################################
@@ -449,9 +699,9 @@ class Neq:
             return not eq_val
 
     @staticmethod
-    def exec_np(x, y, delta=None, case_sensitive=True, reduce=False):  # TODO: add equal checks for date strings
+    def exec_np(x, y, delta=None, case_sensitive=True, reduce=False):
         """
-        Compares whether `x` is strictly equal to `y`.
+        Compares whether `x` is not strictly equal to `y`.
 
         Parameters
         ----------
@@ -487,8 +737,37 @@ class Neq:
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, delta=None, case_sensitive=True, reduce=False):
+        """
+        Compares whether `x` is not strictly equal to `y` chunk-wise (see `Eq.exec_dar`).
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        delta : float, optional
+            Only applicable for comparing two arrays containing numbers. If this optional parameter is set to a
+            positive non-zero number the non-equality of two numbers is checked against a delta value.
+        case_sensitive : bool, optional
+            Only applicable for comparing two string arrays. Case sensitive comparison can be disabled by setting this
+            parameter to False.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is not equal to `y`, otherwise False.
+
+        """
+        eq_val = Eq.exec_dar(x, y, delta=delta, case_sensitive=case_sensitive, reduce=reduce)
+        if eq_val is None:
+            return None
+        else:
+            return ~eq_val
 
 
 ########################################################################################################################
@@ -576,7 +855,9 @@ class Gt:
         """
         if x is None or y is None:
             return None
-        elif x.dtype.kind.lower() in ['f', 'i', 'm']:
+
+        x, y = _temporal_operands(x, y)
+        if x.dtype.kind.lower() in ['f', 'i', 'u', 'm']:
             gt_ar = x > y
             if reduce:
                 return gt_ar.all()
@@ -586,15 +867,41 @@ class Gt:
             if reduce:
                 return False
             else:
-                return np.zeros(x.shape, dtype=np.bool)
+                return np.zeros(x.shape, dtype=bool)
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, reduce=False):
+        """
+        Compares whether `x` is strictly greater than `y` chunk-wise.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is strictly greater than `y`, otherwise False.
+
+        """
+        if x is None or y is None:
+            return None
+
+        gt_ar = x > y
+        if reduce:
+            return gt_ar.all()
+        else:
+            return gt_ar
 
 
 ########################################################################################################################
@@ -682,7 +989,9 @@ class Gte:
         """
         if x is None or y is None:
             return None
-        elif x.dtype.kind.lower() in ['f', 'i', 'm']:
+
+        x, y = _temporal_operands(x, y)
+        if x.dtype.kind.lower() in ['f', 'i', 'u', 'm']:
             gte_ar = x >= y
             if reduce:
                 return gte_ar.all()
@@ -692,15 +1001,41 @@ class Gte:
             if reduce:
                 return False
             else:
-                return np.zeros(x.shape, dtype=np.bool)
+                return np.zeros(x.shape, dtype=bool)
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, reduce=False):
+        """
+        Compares whether `x` is greater than or equal to `y` chunk-wise.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is greater than or equal to `y`, otherwise False.
+
+        """
+        if x is None or y is None:
+            return None
+
+        gte_ar = x >= y
+        if reduce:
+            return gte_ar.all()
+        else:
+            return gte_ar
 
 
 ########################################################################################################################
@@ -788,7 +1123,9 @@ class Lt:
         """
         if x is None or y is None:
             return None
-        elif x.dtype.kind.lower() in ['f', 'i', 'm']:
+
+        x, y = _temporal_operands(x, y)
+        if x.dtype.kind.lower() in ['f', 'i', 'u', 'm']:
             lt_ar = x < y
             if reduce:
                 return lt_ar.all()
@@ -798,15 +1135,41 @@ class Lt:
             if reduce:
                 return False
             else:
-                return np.zeros(x.shape, dtype=np.bool)
+                return np.zeros(x.shape, dtype=bool)
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, reduce=False):
+        """
+        Compares whether `x` is strictly less than `y` chunk-wise.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is strictly less than `y`, otherwise False.
+
+        """
+        if x is None or y is None:
+            return None
+
+        lt_ar = x < y
+        if reduce:
+            return lt_ar.all()
+        else:
+            return lt_ar
 
 
 ########################################################################################################################
@@ -894,7 +1257,9 @@ class Lte:
         """
         if x is None or y is None:
             return None
-        elif x.dtype.kind.lower() in ['f', 'i', 'm']:
+
+        x, y = _temporal_operands(x, y)
+        if x.dtype.kind.lower() in ['f', 'i', 'u', 'm']:
             lte_ar = x <= y
             if reduce:
                 return lte_ar.all()
@@ -904,15 +1269,41 @@ class Lte:
             if reduce:
                 return False
             else:
-                return np.zeros(x.shape, dtype=np.bool)
+                return np.zeros(x.shape, dtype=bool)
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y, reduce=False):
+        """
+        Compares whether `x` is less than or equal to `y` chunk-wise.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            First operand.
+        y : dask.array.Array or np.ndarray or float or int
+            Second operand.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` will be compared with the respective value in `y`. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            Returns True if `x` is less than or equal to `y`, otherwise False.
+
+        """
+        if x is None or y is None:
+            return None
+
+        lte_ar = x <= y
+        if reduce:
+            return lte_ar.all()
+        else:
+            return lte_ar
 
 
 ########################################################################################################################
@@ -997,8 +1388,8 @@ class Between:
 
         Parameters
         ----------
-        x : np.ndarray
-            The array values to check.
+        x : np.ndarray or LabelIndex
+            The array values to check. If a `LabelIndex` is given, the bounds are looked up with a binary search.
         min : float or int or datetime.datetime
             Lower boundary (inclusive) to check against.
         max : float or int or datetime.datetime
@@ -1018,10 +1409,18 @@ class Between:
         if x is None or min is None or max is None:
             return None
 
-        min = np.array(min)  # cast to np.array because of datetime objects
-        max = np.array(max)  # cast to np.array because of datetime objects
+        if isinstance(x, LabelIndex):  # binary search of the bounds in the sorted labels
+            between_ar = x.mask(min, max, exclude_max=exclude_max)
+            return between_ar.all() if reduce else between_ar
 
-        if Lt().exec_num(max, min):
+        x_time, min_time, max_time = _to_datetime64(x), _to_datetime64(min), _to_datetime64(max)
+        if x_time is not None and min_time is not None and max_time is not None:
+            x, min, max = x_time, min_time, max_time  # temporal values are only parsed once
+        else:
+            min = np.array(min)  # cast to np.array because of datetime objects
+            max = np.array(max)  # cast to np.array because of datetime objects
+
+        if Lt.exec_np(max, min, reduce=True):
             return False
 
         if exclude_max:
@@ -1034,6 +1433,36 @@ class Between:
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, min, max, exclude_max=False, reduce=False):
+        """
+        By default this process checks chunk-wise whether `x` is greater than or equal to `min` and lower than or
+        equal to `max`. If `exclude_max` is set to True the upper bound is excluded.
+
+        Parameters
+        ----------
+        x : dask.array.Array
+            The array values to check.
+        min : float or int
+            Lower boundary (inclusive) to check against.
+        max : float or int
+            Upper boundary (inclusive) to check against.
+        exclude_max : bool, optional
+            Exclude the upper boundary `max` if set to True. Defaults to False.
+        reduce : bool, optional
+            If True, one value will be returned.
+            If False, each value in `x` evaluated and returned. Defaults to False.
+
+        Returns
+        -------
+        dask.array.Array :
+            True if `x` is between the specified bounds, otherwise False.
+
+        """
+        if x is None or min is None or max is None:
+            return None
+
+        if exclude_max:
+            return Gte.exec_dar(x, min, reduce=reduce) & Lt.exec_dar(x, max, reduce=reduce)
+        else:
+            return Gte.exec_dar(x, min, reduce=reduce) & Lte.exec_dar(x, max, reduce=reduce)
 
@@ -14,6 +14,15 @@ class QuantilesParameterConflict(Exception):
         return self.message
 
 
+class QuantilesMethodNotSupported(Exception):
+    def __init__(self, method):
+        self.message = "The process 'quantiles' does not support the method '{}'. Supported methods are 'sort', " \
+                       "'select' and 'sketch'.".format(method)
+
+    def __str__(self):
+        return self.message
+
+
 class ArrayElementParameterMissing(Exception):
     def __init__(self):
         self.message = "The process 'array_element' requires either the 'index' or 'labels' parameter to be set."
@@ -45,3 +54,27 @@ class GenericError(Exception):
 
     def __str__(self):
         return self.message
+
+
+class ProcessNotAvailable(Exception):
+    def __init__(self, process_id):
+        self.message = "The process '{}' is not available.".format(process_id)
+
+    def __str__(self):
+        return self.message
+
+
+class ProcessParameterMissing(Exception):
+    def __init__(self, parameter_name):
+        self.message = "The process parameter '{}' is required, but no value has been passed.".format(parameter_name)
+
+    def __str__(self):
+        return self.message
+
+
+class DataTypeNotSupported(Exception):
+    def __init__(self, process_name, datatype):
+        self.message = "The process '{}' does not support {} data yet.".format(process_name, datatype)
+
+    def __str__(self):
+        return self.message
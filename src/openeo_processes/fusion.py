@@ -0,0 +1,534 @@
+import inspect
+import numbers
+import itertools
+
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+from openeo_processes.utils import get_process, eval_datatype
+from openeo_processes.accumulators import compute_statistics
+from openeo_processes.bitmask import logical_and, logical_or, logical_not
+from openeo_processes.logic import _three_valued
+
+
+# Reducers, which can be computed from a common `Statistics` state if they share their input.
+REDUCERS = ("min", "max", "extrema", "mean", "sd", "variance", "count")
+
+# Number of array elements processed at once by a fused kernel, i.e. 256 kB per float64 intermediate, which keeps
+# all intermediates of a typical band math formula within the L2 cache.
+TILE_SIZE = 2 ** 15
+
+
+########################################################################################################################
+# Elementwise Kernels
+########################################################################################################################
+
+class _Kernel:
+    """
+    Elementwise kernel of an openEO process, which can be applied to tiles of its (broadcasted) arguments.
+
+    """
+
+    __slots__ = ("fun", "defaults", "numexpr")
+
+    def __init__(self, fun, numexpr=None):
+        """
+        Constructor of `_Kernel`.
+
+        Parameters
+        ----------
+        fun : callable
+            NumPy implementation of the process, which needs to work on any slice of its arguments independently.
+        numexpr : str, optional
+            Expression template for numexpr, referencing the arguments of `fun` with curly brackets. If it is not
+            given, the process is always evaluated with NumPy.
+
+        """
+        self.fun = fun
+        self.defaults = {name: parameter.default for name, parameter in inspect.signature(fun).parameters.items()
+                         if parameter.default is not inspect.Parameter.empty}
+        self.numexpr = numexpr
+
+
+def _clip(x, min_x, max_x):
+    return np.where(np.where(x < min_x, min_x, x) > max_x, max_x, np.where(x < min_x, min_x, x))
+
+
+def _eq(x, y, delta=None, case_sensitive=True):
+    return np.isclose(x, y, atol=delta) if type(delta) in [float, int] else x == y
+
+
+def _neq(x, y, delta=None, case_sensitive=True):
+    return ~_eq(x, y, delta=delta)
+
+
+def _and(x, y):
+    return _three_valued(logical_and, np.logical_and, x, y)
+
+
+def _or(x, y):
+    return _three_valued(logical_or, np.logical_or, x, y)
+
+
+def _not(x):
+    return _three_valued(logical_not, np.logical_not, x)
+
+
+def _linear_scale_range(x, input_min, input_max, output_min=0., output_max=1.):
+    return ((x - input_min) / (input_max - input_min)) * (output_max - output_min) + output_min
+
+
+# Elementwise processes from `math`, `comparison` and `logic`, which can be fused. Processes depending on more than
+# the element itself must not be added here. The logical processes follow the three-valued logic of `logic`, numexpr
+# cannot evaluate them for floating point inputs (with np.nan), which are therefore evaluated with NumPy.
+KERNELS = {
+    # math
+    "absolute": _Kernel(lambda x: np.abs(x), "abs({x})"),
+    "add": _Kernel(lambda x, y: x + y, "({x} + {y})"),
+    "arccos": _Kernel(lambda x: np.arccos(x), "arccos({x})"),
+    "arcosh": _Kernel(lambda x: np.arccosh(x), "arccosh({x})"),
+    "arcsin": _Kernel(lambda x: np.arcsin(x), "arcsin({x})"),
+    "arctan": _Kernel(lambda x: np.arctan(x), "arctan({x})"),
+    "arctan2": _Kernel(lambda y, x: np.arctan2(y, x), "arctan2({y}, {x})"),
+    "arsinh": _Kernel(lambda x: np.arcsinh(x), "arcsinh({x})"),
+    "artanh": _Kernel(lambda x: np.arctanh(x), "arctanh({x})"),
+    "ceil": _Kernel(lambda x: np.ceil(x)),
+    "clip": _Kernel(_clip, "where(where({x} < {min_x}, {min_x}, {x}) > {max_x}, {max_x}, "
+                           "where({x} < {min_x}, {min_x}, {x}))"),
+    "cos": _Kernel(lambda x: np.cos(x), "cos({x})"),
+    "cosh": _Kernel(lambda x: np.cosh(x), "cosh({x})"),
+    "divide": _Kernel(lambda x, y: x / y, "({x} / {y})"),
+    "exp": _Kernel(lambda p: np.exp(p), "exp({p})"),
+    "floor": _Kernel(lambda x: np.floor(x)),
+    "linear_scale_range": _Kernel(_linear_scale_range, "((({x} - {input_min}) / ({input_max} - {input_min})) * "
+                                                       "({output_max} - {output_min}) + {output_min})"),
+    "ln": _Kernel(lambda x: np.log(x), "log({x})"),
+    "log": _Kernel(lambda x, base: np.log(x) / np.log(base), "(log({x}) / log({base}))"),
+    "mod": _Kernel(lambda x, y: np.mod(x, y)),
+    "multiply": _Kernel(lambda x, y: x * y, "({x} * {y})"),
+    "normalized_difference": _Kernel(lambda x, y: (x - y) / (x + y), "(({x} - {y}) / ({x} + {y}))"),
+    "power": _Kernel(lambda base, p: np.power(base, np.asarray(p, dtype=float)), "({base} ** {p})"),
+    "round": _Kernel(lambda x, p=0: np.around(x, p)),
+    "scale": _Kernel(lambda x, factor=1.: x * factor, "({x} * {factor})"),
+    "sgn": _Kernel(lambda x: np.sign(x)),
+    "sin": _Kernel(lambda x: np.sin(x), "sin({x})"),
+    "sinh": _Kernel(lambda x: np.sinh(x), "sinh({x})"),
+    "sqrt": _Kernel(lambda x: np.sqrt(x), "sqrt({x})"),
+    "subtract": _Kernel(lambda x, y: x - y, "({x} - {y})"),
+    "tan": _Kernel(lambda x: np.tan(x), "tan({x})"),
+    "tanh": _Kernel(lambda x: np.tanh(x), "tanh({x})"),
+    # comparison
+    "eq": _Kernel(_eq),
+    "gt": _Kernel(lambda x, y: x > y, "({x} > {y})"),
+    "gte": _Kernel(lambda x, y: x >= y, "({x} >= {y})"),
+    "lt": _Kernel(lambda x, y: x < y, "({x} < {y})"),
+    "lte": _Kernel(lambda x, y: x <= y, "({x} <= {y})"),
+    "neq": _Kernel(_neq),
+    # logic
+    "and": _Kernel(_and, "({x} & {y})"),
+    "if": _Kernel(lambda value, accept, reject=np.nan: np.where(value, accept, reject),
+                  "where({value}, {accept}, {reject})"),
+    "not": _Kernel(_not, "(~{x})"),
+    "or": _Kernel(_or, "({x} | {y})"),
+}
+
+# Processes of `KERNELS` whose numexpr expressions need boolean operands, because numexpr evaluates '&', '|' and '~'
+# bitwise on integers, and the processes whose numexpr expressions return boolean values.
+_LOGICAL_PROCESSES = {"and", "not", "or"}
+_BOOLEAN_PROCESSES = _LOGICAL_PROCESSES | {"gt", "gte", "lt", "lte"}
+
+
+########################################################################################################################
+# Fused Expression
+########################################################################################################################
+
+class _Input:
+    """ Input of a fused expression, i.e. an argument which is not computed inside the expression itself. """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Operation:
+    """ Elementwise process inside a fused expression. """
+
+    __slots__ = ("process_id", "kernel", "arguments")
+
+    def __init__(self, process_id, arguments):
+        self.process_id = process_id
+        self.kernel = KERNELS[process_id]
+        self.arguments = arguments
+
+
+class FusedExpression:
+    """
+    Chain of elementwise processes, which is evaluated as a single kernel.
+
+    For NumPy arrays, the expression is evaluated tile by tile: all processes are applied to a cache-sized tile of the
+    inputs before moving on to the next one and only the final result is written to a full-size array. Thus, the
+    intermediate results of the chain never exist as full-size arrays. Alternatively, numexpr can be used as a
+    backend, if it is installed. All other data types (e.g. scalars or xarray) are handled by evaluating the processes
+    one after another with their regular implementations.
+
+    """
+
+    def __init__(self, operation, backend="numpy", tile_size=None):
+        """
+        Constructor of `FusedExpression`.
+
+        Parameters
+        ----------
+        operation : _Operation
+            Final operation of the expression, whose arguments are either operations, inputs or constants.
+        backend : str, optional
+            Either 'numpy' (default) or 'numexpr'. If numexpr is not installed or cannot handle the expression,
+            'numpy' is used.
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `TILE_SIZE`.
+
+        """
+        self.operation = operation
+        self.backend = backend
+        self.tile_size = tile_size or TILE_SIZE
+        self._constants = {}
+        self._boolean_inputs = set()
+        self._numexpr = self._to_numexpr(operation) if backend == "numexpr" and numexpr is not None else None
+
+    def __call__(self, **inputs):
+        """
+        Evaluates the expression.
+
+        Parameters
+        ----------
+        **inputs :
+            Values of the inputs of the expression.
+
+        Returns
+        -------
+        object :
+            Result of the expression.
+
+        """
+        if not self._is_fusable(inputs.values()):
+            return self._evaluate_processes(self.operation, inputs)
+
+        if self._numexpr is not None and all(np.asarray(inputs[name]).dtype == bool for name in self._boolean_inputs):
+            try:
+                return numexpr.evaluate(self._numexpr, local_dict=dict(self._constants, **inputs))
+            except (TypeError, ValueError, KeyError, NotImplementedError):  # e.g. unsupported data types
+                pass
+
+        return self._evaluate_tiled(inputs)
+
+    @staticmethod
+    def _is_fusable(values):
+        """ Checks if the values only consist of scalars and numeric/boolean arrays, with at least one array. """
+        has_array = False
+        for value in values:
+            if isinstance(value, np.ndarray) and not isinstance(value, np.ma.MaskedArray):
+                if value.dtype.kind not in "biuf":
+                    return False
+                has_array = True
+            elif not isinstance(value, (numbers.Number, np.generic)):
+                return False
+        return has_array
+
+    def _evaluate_tiled(self, inputs):
+        """ Evaluates the expression with NumPy tile by tile and writes the results into a preallocated array. """
+        shape = np.broadcast_shapes(*(np.shape(value) for value in inputs.values()))
+        if np.prod(shape) <= self.tile_size:
+            return self._evaluate_kernels(self.operation, inputs)
+
+        arrays = {name: np.broadcast_to(value, shape) if isinstance(value, np.ndarray) else value
+                  for name, value in inputs.items()}
+        result = None
+        for tile in self._tiles(shape):
+            tile_result = self._evaluate_kernels(self.operation, {name: value[tile]
+                                                                  if isinstance(value, np.ndarray) else value
+                                                                  for name, value in arrays.items()})
+            if result is None:
+                result = np.empty(shape, dtype=np.result_type(tile_result))
+            result[tile] = tile_result
+
+        return result
+
+    def _tiles(self, shape):
+        """
+        Generates slices for tiles with at most `tile_size` elements in C-order, i.e. the last axes are kept
+        entirely and the array is split along the first axis which does not fit into a tile anymore.
+
+        """
+        n_inner = 1
+        axis = len(shape) - 1
+        while axis > 0 and n_inner * shape[axis] <= self.tile_size:
+            n_inner *= shape[axis]
+            axis -= 1
+        step = max(self.tile_size // n_inner, 1)
+
+        for outer_index in itertools.product(*(range(n) for n in shape[:axis])):
+            for start in range(0, shape[axis], step):
+                yield outer_index + (slice(start, start + step),)
+
+    def _evaluate_kernels(self, node, inputs):
+        if isinstance(node, _Operation):
+            return node.kernel.fun(**{name: self._evaluate_kernels(argument, inputs)
+                                      for name, argument in node.arguments.items()})
+        elif isinstance(node, _Input):
+            return inputs[node.name]
+        else:
+            return node
+
+    def _evaluate_processes(self, node, inputs):
+        if isinstance(node, _Operation):
+            return get_process(node.process_id)(**{name: self._evaluate_processes(argument, inputs)
+                                                   for name, argument in node.arguments.items()})
+        elif isinstance(node, _Input):
+            return inputs[node.name]
+        else:
+            return node
+
+    def _to_numexpr(self, node):
+        """ Translates the expression to a numexpr expression or returns None if this is not possible. """
+        if isinstance(node, _Operation):
+            if node.kernel.numexpr is None:
+                return None
+            arguments = {}
+            for name, argument in dict(node.kernel.defaults, **node.arguments).items():
+                if node.process_id in _LOGICAL_PROCESSES:
+                    if isinstance(argument, _Input):  # checked to be boolean when the expression is evaluated
+                        self._boolean_inputs.add(argument.name)
+                    elif not (isinstance(argument, _Operation) and argument.process_id in _BOOLEAN_PROCESSES):
+                        return None
+                arguments[name] = self._to_numexpr(argument)
+                if arguments[name] is None:
+                    return None
+            return node.kernel.numexpr.format(**arguments)
+        elif isinstance(node, _Input):
+            return node.name
+        elif isinstance(node, (numbers.Number, np.generic)):
+            name = "_c{}".format(len(self._constants))
+            self._constants[name] = node
+            return name
+        else:
+            return None
+
+
+########################################################################################################################
+# Process Graph Fusion
+########################################################################################################################
+
+def fuse_process_graph(process_graph, backend="numpy", tile_size=None):
+    """
+    Replaces chains of elementwise processes in a process graph with fused expressions.
+
+    A node is merged into its consumer if both are elementwise processes, the node is not the result node and its
+    result is not used by any other node. The last node of each chain is replaced by a node calling a
+    `FusedExpression` (stored under the key 'process'), whose inputs are the references to all nodes and parameters
+    the chain depends on.
+
+    Parameters
+    ----------
+    process_graph : dict
+        openEO process graph, i.e. a dictionary mapping node ids to nodes.
+    backend : str, optional
+        Backend of the fused expressions, either 'numpy' (default) or 'numexpr'.
+    tile_size : int, optional
+        Number of elements per tile. Defaults to `TILE_SIZE`.
+
+    Returns
+    -------
+    dict :
+        New process graph with fused nodes. Nodes which are not fused are taken over unchanged.
+
+    """
+    fusable = {node_id for node_id, node in process_graph.items() if _is_elementwise(node)}
+    consumers = {node_id: [] for node_id in process_graph}
+    for node_id, node in process_graph.items():
+        for dependency in _find_node_refs(node.get("arguments", {})):
+            if dependency in consumers:
+                consumers[dependency].append(node_id)
+
+    # nodes which are computed inside the fused expression of their only consumer
+    merged = {node_id for node_id in fusable
+              if not process_graph[node_id].get("result", False)
+              and len(consumers[node_id]) == 1 and consumers[node_id][0] in fusable}
+
+    fused_graph = {}
+    for node_id, node in process_graph.items():
+        if node_id in merged:
+            continue
+        if node_id in fusable and any(dependency in merged
+                                      for dependency in _find_node_refs(node.get("arguments", {}))):
+            inputs = {}
+            operation = _build_operation(node, process_graph, merged, inputs)
+            fused_node = {"process_id": node["process_id"],
+                          "process": FusedExpression(operation, backend=backend, tile_size=tile_size),
+                          "arguments": inputs}
+            if node.get("result", False):
+                fused_node["result"] = True
+            fused_graph[node_id] = fused_node
+        else:
+            fused_graph[node_id] = node
+
+    return fused_graph
+
+
+def _is_elementwise(node):
+    """ Checks if a node applies an elementwise process to scalar arguments or references only. """
+    if node["process_id"] not in KERNELS:
+        return False
+    for name, value in node.get("arguments", {}).items():
+        if name == "reduce" and value:
+            return False
+        if isinstance(value, dict):
+            if "from_node" not in value and "from_parameter" not in value:
+                return False
+        elif not (value is None or isinstance(value, (numbers.Number, str))):
+            return False
+    return True
+
+
+def _find_node_refs(value):
+    if isinstance(value, dict):
+        if "from_node" in value:
+            return [value["from_node"]]
+        return [node_id for v in value.values() for node_id in _find_node_refs(v)]
+    elif isinstance(value, list):
+        return [node_id for v in value for node_id in _find_node_refs(v)]
+    else:
+        return []
+
+
+def _build_operation(node, process_graph, merged, inputs):
+    """ Builds the operation tree of a node, registering all external references in `inputs`. """
+    arguments = {}
+    for name, value in node.get("arguments", {}).items():
+        if name == "reduce":
+            continue
+        if isinstance(value, dict) and value.get("from_node") in merged:
+            arguments[name] = _build_operation(process_graph[value["from_node"]], process_graph, merged, inputs)
+        elif isinstance(value, dict):
+            ref = {key: value[key] for key in ("from_node", "from_parameter") if key in value}
+            input_name = next((input_name for input_name, input_ref in inputs.items() if input_ref == ref), None)
+            if input_name is None:
+                input_name = "x{}".format(len(inputs))
+                inputs[input_name] = ref
+            arguments[name] = _Input(input_name)
+        else:
+            arguments[name] = value
+    return _Operation(node["process_id"], arguments)
+
+
+########################################################################################################################
+# Reducer Fusion
+########################################################################################################################
+
+class _StatisticsState:
+    """ Computes the `Statistics` state of all reducers sharing an input in a single pass over the data. """
+
+    __slots__ = ("statistics", "dimension", "ignore_nodata")
+
+    def __init__(self, statistics, dimension=0, ignore_nodata=True):
+        self.statistics = statistics
+        self.dimension = dimension
+        self.ignore_nodata = ignore_nodata
+
+    def __call__(self, data):
+        """ Returns the state or None if the data cannot be reduced in a single pass (e.g. masked arrays). """
+        if eval_datatype(data) == "dask" or (isinstance(data, np.ndarray) and not isinstance(data, np.ma.MaskedArray)
+                                             and data.dtype.kind in "biuf"):
+            if data.ndim > 0 and data.size > 0:
+                return compute_statistics(data, dimension=self.dimension, ignore_nodata=self.ignore_nodata,
+                                          statistics=self.statistics)
+        return None
+
+
+class _Statistic:
+    """ Takes the result of a reducer from a `Statistics` state or evaluates the reducer itself if there is none. """
+
+    __slots__ = ("process_id", "arguments")
+
+    def __init__(self, process_id, arguments):
+        self.process_id = process_id
+        self.arguments = arguments
+
+    def __call__(self, state, data):
+        if state is None:
+            return get_process(self.process_id)(data=data, **self.arguments)
+        return state.get(self.process_id)
+
+
+def fuse_reducers(process_graph):
+    """
+    Replaces reducers (see `REDUCERS`), which share their input, with a single pass over the input.
+
+    Reducers are fused if they reduce the same node or parameter along the same dimension, have the same value of
+    `ignore_nodata` and only scalar arguments ('count' only without a condition). An additional node computes the
+    `Statistics` state of all of them (see `openeo_processes.accumulators.compute_statistics`), from which the
+    reducer nodes take their results. Inputs, which cannot be reduced in a single pass, are passed on to the regular
+    process implementations.
+
+    Parameters
+    ----------
+    process_graph : dict
+        openEO process graph, i.e. a dictionary mapping node ids to nodes.
+
+    Returns
+    -------
+    dict :
+        New process graph with fused reducers. Nodes which are not fused are taken over unchanged.
+
+    """
+    groups = {}
+    for node_id, node in process_graph.items():
+        key = _reducer_key(node)
+        if key is not None:
+            groups.setdefault(key, []).append(node_id)
+
+    fused_graph = dict(process_graph)
+    for ((ref_type, ref), dimension, ignore_nodata), node_ids in groups.items():
+        if len(node_ids) < 2:
+            continue
+        state_id = "_".join(node_ids) + "_statistics"
+        while state_id in fused_graph:
+            state_id += "_"
+        data_ref = {ref_type: ref}
+        statistics = tuple(process_graph[node_id]["process_id"] for node_id in node_ids)
+        fused_graph[state_id] = {"process_id": "statistics",
+                                 "process": _StatisticsState(statistics, dimension, ignore_nodata),
+                                 "arguments": {"data": data_ref}}
+        for node_id in node_ids:
+            node = process_graph[node_id]
+            arguments = {name: value for name, value in node["arguments"].items() if name != "data"}
+            fused_node = {"process_id": node["process_id"], "process": _Statistic(node["process_id"], arguments),
+                          "arguments": {"state": {"from_node": state_id}, "data": data_ref}}
+            if node.get("result", False):
+                fused_node["result"] = True
+            fused_graph[node_id] = fused_node
+
+    return fused_graph
+
+
+def _reducer_key(node):
+    """ Returns the key of reducers, which can be fused with the reducer `node`, or None if it cannot be fused. """
+    if node["process_id"] not in REDUCERS:
+        return None
+    arguments = node.get("arguments", {})
+    data = arguments.get("data")
+    if not (isinstance(data, dict) and len(data) == 1 and ("from_node" in data or "from_parameter" in data)):
+        return None
+
+    parameters = {"data", "dimension", "condition", "context"} if node["process_id"] == "count" else \
+        {"data", "dimension", "ignore_nodata"}
+    if set(arguments) - parameters or arguments.get("condition") is not None or arguments.get("context"):
+        return None
+    if any(isinstance(value, (dict, list)) for name, value in arguments.items() if name != "data"):
+        return None
+
+    return next(iter(data.items())), arguments.get("dimension", 0), arguments.get("ignore_nodata", True)
@@ -0,0 +1,100 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+########################################################################################################################
+# Cumulative Kernels
+########################################################################################################################
+
+def _nan_cumextreme(data, out, largest):
+    """
+    Single-pass cumulative minimum or maximum skipping np.nan values, which stay np.nan in the result.
+
+    Parameters
+    ----------
+    data : np.array
+        3-dimensional array (outer, n, inner), which is accumulated along its second dimension.
+    out : np.array
+        Array with the same shape as `data` the results are written to.
+    largest : bool
+        If True, the cumulative maxima are computed, otherwise the cumulative minima.
+
+    """
+    n_outer, n, n_inner = data.shape
+    extreme = np.empty(n_inner, dtype=data.dtype)
+    for o in range(n_outer):
+        extreme[:] = np.nan
+        for i in range(n):
+            for k in range(n_inner):
+                value = data[o, i, k]
+                if value != value:  # np.nan is skipped, but stays in the result
+                    out[o, i, k] = value
+                    continue
+                current = extreme[k]
+                if current != current or (value > current if largest else value < current):
+                    extreme[k] = value
+                out[o, i, k] = extreme[k]
+
+
+if numba is not None:
+    _nan_cumextreme = numba.njit(nogil=True, cache=True)(_nan_cumextreme)
+
+
+def nan_cumextreme(data, dimension=0, largest=False, out=None):
+    """
+    Computes cumulative minima or maxima of a NumPy array along `dimension`, skipping no-data values (np.nan), which
+    stay in the result. The input array is not modified (unless it is passed as `out`) and the data type of floating
+    point arrays is preserved.
+
+    If numba is installed, the series are scanned by a compiled single-pass kernel, which neither allocates a no-data
+    mask nor intermediate arrays. Otherwise, `np.fmin.accumulate` or `np.fmax.accumulate` is used and the no-data
+    values are filled in again.
+
+    Parameters
+    ----------
+    data : np.array
+        An array of numbers.
+    dimension : int, optional
+        Defines the dimension to accumulate along (default is 0).
+    largest : bool, optional
+        If True, the cumulative maxima are computed, otherwise the cumulative minima (default).
+    out : np.array, optional
+        Array to store the result in, e.g. `data` to compute the result in place. By default, a new array is
+        allocated.
+
+    Returns
+    -------
+    np.array :
+        An array with the computed cumulative minima or maxima.
+
+    """
+    data = np.asarray(data)
+    if data.dtype.kind != "f":  # no np.nan values possible
+        ufunc = np.maximum if largest else np.minimum
+        return ufunc.accumulate(data, axis=dimension, out=out)
+
+    if numba is None:
+        nan_idxs = np.isnan(data)  # computed first, since `out` may be `data`
+        ufunc = np.fmax if largest else np.fmin
+        data_acc = ufunc.accumulate(data, axis=dimension, out=out)
+        np.copyto(data_acc, np.nan, where=nan_idxs)
+        return data_acc
+
+    dimension = dimension % data.ndim
+    shape = (int(np.prod(data.shape[:dimension])), data.shape[dimension], int(np.prod(data.shape[dimension + 1:])))
+    values = np.ascontiguousarray(data).reshape(shape)
+    if out is not None and out.dtype == data.dtype and out.flags.c_contiguous:
+        # the kernel reads every element before writing it, so `out` may also be `data`
+        _nan_cumextreme(values, out.reshape(shape), largest)
+        return out
+
+    data_acc = np.empty_like(values)
+    _nan_cumextreme(values, data_acc, largest)
+    if out is not None:
+        np.copyto(out, data_acc.reshape(data.shape))
+        return out
+    return data_acc.reshape(data.shape)
@@ -0,0 +1,230 @@
+import inspect
+import numbers
+from contextlib import contextmanager
+
+from openeo_processes.utils import get_process, _lazy_state
+from openeo_processes.process_graph import ProcessGraph
+
+
+# Maps process ids to the names of the process parameters, which positional arguments are bound to.
+_parameter_names = {}
+
+
+@contextmanager
+def lazy():
+    """
+    Context manager enabling the lazy mode, in which processes are not executed immediately, but return expressions.
+    Processes called with an expression as an argument return an expression as well, also outside of the context.
+    The expression is evaluated by calling its `compute` method.
+
+    Examples
+    --------
+    >>> with lazy():
+    ...     ndvi = normalized_difference(nir, red)
+    ...     result = clip(linear_scale_range(ndvi, -1, 1, 0, 255), 0, 255)
+    >>> result.compute()
+
+    """
+    enabled = _lazy_state.enabled
+    _lazy_state.enabled = True
+    try:
+        yield
+    finally:
+        _lazy_state.enabled = enabled
+
+
+class Expression:
+    """
+    Lazy call of an openEO process, whose arguments may be further expressions.
+
+    Computing an expression translates the expression graph into an openEO process graph, which is optimised before
+    being executed by `ProcessGraph`:
+        - constant folding: calls with constant arguments only (numbers, strings, e.g. `multiply(pi(), 2)`) are
+          evaluated once while building the process graph,
+        - common-subexpression elimination: identical calls on the same inputs are only evaluated once,
+        - fusion: chains of elementwise processes are fused into single kernels, so that no full-size intermediate
+          arrays are allocated (see `openeo_processes.fusion`).
+    All other arguments (e.g. NumPy arrays, xarray data arrays or dask arrays) become parameters of the process graph,
+    so that the processes are executed with the implementations matching their data types.
+
+    """
+
+    __slots__ = ("process_id", "arguments")
+
+    def __init__(self, process_id, arguments):
+        """
+        Constructor of `Expression`.
+
+        Parameters
+        ----------
+        process_id : str
+            Id of the process.
+        arguments : dict
+            Named arguments of the process call.
+
+        """
+        self.process_id = process_id
+        self.arguments = arguments
+
+    @classmethod
+    def from_call(cls, process_id, processor, args, kwargs):
+        """
+        Creates an expression from a process call with positional and keyword arguments.
+
+        Parameters
+        ----------
+        process_id : str
+            Id of the process.
+        processor : callable
+            Function returning the class instance implementing the process. The positional arguments are bound to
+            the parameters of its implementations.
+        args : tuple
+            Positional arguments of the process call.
+        kwargs : dict
+            Keyword arguments of the process call.
+
+        Returns
+        -------
+        Expression :
+            Expression representing the process call.
+
+        """
+        arguments = dict(zip(cls._get_parameter_names(process_id, processor), args))
+        arguments.update(kwargs)
+        return cls(process_id, arguments)
+
+    @staticmethod
+    def _get_parameter_names(process_id, processor):
+        if process_id not in _parameter_names:
+            instance = processor()
+            signatures = [inspect.signature(getattr(instance, name))
+                          for name in ("exec_np", "exec_xar", "exec_dar", "exec_num") if hasattr(instance, name)]
+            _parameter_names[process_id] = max((list(signature.parameters) for signature in signatures), key=len)
+        return _parameter_names[process_id]
+
+    def __repr__(self):
+        arguments = ", ".join("{}={}".format(name, "<{}>".format(type(value).__name__)
+                                             if not isinstance(value, (Expression, numbers.Number, str)) else
+                                             repr(value)) for name, value in self.arguments.items())
+        return "{}({})".format(self.process_id, arguments)
+
+    def to_process_graph(self):
+        """
+        Translates the expression graph into an openEO process graph, applying constant folding and
+        common-subexpression elimination.
+
+        Returns
+        -------
+        dict :
+            openEO process graph. It is empty if the whole expression has been folded into a constant.
+        dict :
+            Values of the parameters of the process graph.
+        object :
+            Reference to the result, i.e. `{"from_node": ...}` or the constant value of the expression.
+
+        """
+        builder = _GraphBuilder()
+        enabled = _lazy_state.enabled
+        _lazy_state.enabled = False  # constants are folded by executing the processes
+        try:
+            result = builder.add(self)
+        finally:
+            _lazy_state.enabled = enabled
+
+        if isinstance(result, dict) and "from_node" in result:
+            builder.process_graph[result["from_node"]]["result"] = True
+        elif isinstance(result, dict):  # a folded array is passed as a parameter
+            result = builder.parameters[result["from_parameter"]]
+        return builder.process_graph, builder.parameters, result
+
+    def compute(self, fuse=True, max_workers=None):
+        """
+        Optimises and executes the expression.
+
+        Parameters
+        ----------
+        fuse : bool or str, optional
+            If True (default), chains of elementwise processes are fused into single kernels. Setting it to 'numexpr'
+            uses numexpr for evaluating the fused kernels.
+        max_workers : int, optional
+            Maximum number of nodes being evaluated at the same time. Defaults to the number of CPUs.
+
+        Returns
+        -------
+        object :
+            Result of the expression.
+
+        """
+        process_graph, parameters, result = self.to_process_graph()
+        if not process_graph:
+            return result
+
+        enabled = _lazy_state.enabled
+        _lazy_state.enabled = False
+        try:
+            return ProcessGraph(process_graph, max_workers=max_workers, fuse=fuse).execute(parameters)
+        finally:
+            _lazy_state.enabled = enabled
+
+
+class _GraphBuilder:
+    """ Builds an openEO process graph from an expression graph. """
+
+    def __init__(self):
+        self.process_graph = {}
+        self.parameters = {}
+        self._nodes = {}  # maps the keys of process calls to node ids
+        self._refs = {}  # maps ids of expressions and parameter values to their references
+        self._values = []  # keeps parameter values alive, so that their ids stay unique
+
+    def add(self, expression):
+        """ Adds an expression and returns a reference to its result or its value if it is a constant. """
+        if id(expression) in self._refs:
+            return self._refs[id(expression)]
+
+        arguments = {name: self._convert(value) for name, value in expression.arguments.items()}
+        if all(self._is_constant(value) for value in arguments.values()):
+            ref = self._convert(get_process(expression.process_id)(**arguments))
+        else:
+            key = (expression.process_id, self._freeze(arguments))
+            if key not in self._nodes:
+                node_id = "{}{}".format(expression.process_id, len(self.process_graph))
+                self.process_graph[node_id] = {"process_id": expression.process_id, "arguments": arguments}
+                self._nodes[key] = node_id
+            ref = {"from_node": self._nodes[key]}
+
+        self._refs[id(expression)] = ref
+        self._values.append(expression)
+        return ref
+
+    def _convert(self, value):
+        """ Converts an argument to a constant, a node reference or a parameter reference. """
+        if isinstance(value, Expression):
+            return self.add(value)
+        elif value is None or isinstance(value, (numbers.Number, str)):
+            return value
+        elif isinstance(value, list):
+            return [self._convert(v) for v in value]
+        elif id(value) not in self._refs:
+            name = "x{}".format(len(self.parameters))
+            self.parameters[name] = value
+            self._refs[id(value)] = {"from_parameter": name}
+            self._values.append(value)
+        return self._refs[id(value)]
+
+    @classmethod
+    def _is_constant(cls, value):
+        if isinstance(value, dict):
+            return False
+        elif isinstance(value, list):
+            return all(cls._is_constant(v) for v in value)
+        return True
+
+    @classmethod
+    def _freeze(cls, value):
+        """ Converts an argument into a hashable key. """
+        if isinstance(value, dict):
+            return tuple(sorted((k, cls._freeze(v)) for k, v in value.items()))
+        elif isinstance(value, list):
+            return tuple(cls._freeze(v) for v in value)
+        return type(value), value
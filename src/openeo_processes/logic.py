@@ -1,6 +1,59 @@
 import numpy as np
+
+try:
+    import xarray as xr
+except ImportError:
+    xr = None
+
 from openeo_processes.utils import process
 from openeo_processes.comparison import is_empty
+from openeo_processes.bitmask import Bitmask, logical_and, logical_or, logical_xor, logical_not, reduce_any, \
+    reduce_all, to_ternary, from_ternary
+
+
+def _three_valued(kernel, fun, *operands, out=None):
+    """
+    Applies an elementwise logical operation to arrays following openEO's three-valued logic.
+
+    Packed arrays (`Bitmask`) are processed bitwise, other operands being packed as well. Boolean and integer arrays
+    cannot contain no-data values, so that `fun` is applied directly. All other arrays (i.e. with np.nan, None or
+    masked no-data values) are converted to boolean values and validity, on which `kernel` is evaluated. The result is
+    a masked array if any operand is masked, otherwise a `float32` array with np.nan values.
+
+    Parameters
+    ----------
+    kernel : callable
+        Three-valued logic kernel (see `openeo_processes.bitmask`).
+    fun : callable
+        NumPy function accepting an `out` argument, which is applied if no operand can contain no-data values.
+    operands : np.array or Bitmask or bool
+        Operands of the logical operation.
+    out : np.ndarray, optional
+        Array to store the result in. Ignored for packed arrays.
+
+    Returns
+    -------
+    np.array or Bitmask :
+        Result of the logical operation.
+
+    """
+    packed = [operand for operand in operands if isinstance(operand, Bitmask)]
+    if packed:
+        shape = packed[0].shape
+        operands = [Bitmask.from_array(np.broadcast_to(operand, shape)) for operand in operands]
+        values, valid = kernel(*((operand.values, operand.valid) for operand in operands))
+        return Bitmask(values, valid, shape)
+
+    operands = [operand if hasattr(operand, "dtype") else np.asanyarray(operand) for operand in operands]
+    if all(operand.dtype.kind in "biu" and not np.ma.isMaskedArray(operand) for operand in operands):
+        return fun(*operands, out=out)
+
+    masked = any(np.ma.isMaskedArray(operand) for operand in operands)
+    result = from_ternary(*kernel(*(to_ternary(operand) for operand in operands)), masked=masked)
+    if out is None:
+        return result
+    np.copyto(out, result)
+    return out
 
 
 ########################################################################################################################
@@ -51,34 +104,38 @@ class And:
         return x and y if None not in [x, y] else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Checks if both arrays are true.
         Evaluates parameter `x` before `y` and stops once the outcome is unambiguous.
-        If any argument is np.nan, the result will be np.nan if the outcome is ambiguous.
+        If any argument is np.nan (or masked), the result will be np.nan (or masked) if the outcome is ambiguous.
+        Packed arrays (`Bitmask`) are combined bitwise and result in a packed array.
 
         Parameters
         ----------
-        x : np.array or bool
+        x : np.array or Bitmask or bool
             A boolean value.
-        y : np.array or bool
+        y : np.array or Bitmask or bool
             A boolean value.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Boolean result of the logical AND.
 
         """
-        return x & y
+        return _three_valued(logical_and, np.logical_and, x, y, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, y):
+        return And.exec_np(x, y)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return And.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -129,33 +186,37 @@ class Or:
         return None if None in [x, y] and False in [x, y] else x or y
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Checks if at least one of the array values is True. Evaluates parameter `x` before `y` and stops once the
-        outcome is unambiguous. If a component is np.nan, the result will be np.nan if the outcome is ambiguous.
+        outcome is unambiguous. If a component is np.nan (or masked), the result will be np.nan (or masked) if the
+        outcome is ambiguous. Packed arrays (`Bitmask`) are combined bitwise and result in a packed array.
 
         Parameters
         ----------
-        x : bool
+        x : np.array or Bitmask or bool
             A boolean value.
-        y : bool
+        y : np.array or Bitmask or bool
             A boolean value.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Boolean result of the logical OR.
 
         """
-        return x | y
+        return _three_valued(logical_or, np.logical_or, x, y, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, y):
+        return Or.exec_np(x, y)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Or.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -205,36 +266,37 @@ class Xor:
         return sum([x, y]) == 1 if None not in [x, y] else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
-        Checks if exactly one of the array values is true. If a component is np.nan, the result will be np.nan if the
-        outcome is ambiguous.
+        Checks if exactly one of the array values is true. If a component is np.nan (or masked), the result will be
+        np.nan (or masked) for this element. Packed arrays (`Bitmask`) are combined bitwise and result in a packed
+        array.
 
         Parameters
         ----------
-        x : bool
+        x : np.array or Bitmask or bool
             A boolean value.
-        y : bool
+        y : np.array or Bitmask or bool
             A boolean value.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Boolean result of the logical XOR.
 
         """
-        if np.any(np.isnan(x)) or np.any(np.isnan(y)):
-            return np.nan
-        else:
-            return (x + y) == 1
+        return _three_valued(logical_xor, np.logical_xor, x, y, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, y):
+        return Xor.exec_np(x, y)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Xor.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -281,31 +343,35 @@ class Not:
         return not x if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Inverts booleans so that True/1 gets False/0 and False/0 gets True/1.
-        The no-data value np.nan is passed through and therefore gets propagated.
+        The no-data value np.nan (or masked values) is passed through and therefore gets propagated.
+        Packed arrays (`Bitmask`) are inverted bitwise and result in a packed array.
 
         Parameters
         ----------
-        x : np.array
+        x : np.array or Bitmask
             Boolean values to invert.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Inverted boolean values.
 
         """
-        return ~x
+        return _three_valued(logical_not, np.logical_not, x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Not.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Not.exec_np(x)
 
 
 ########################################################################################################################
@@ -356,7 +422,7 @@ class If:
         return accept if value else reject
 
     @staticmethod
-    def exec_np(value, accept, reject=np.nan):
+    def exec_np(value, accept, reject=np.nan, out=None):
         """
         If the array value passed is True, returns the value of the `accept` parameter,
         otherwise returns the value of the `reject` parameter.
@@ -369,6 +435,9 @@ class If:
             A value that is returned if the boolean value is True.
         reject : object, optional
             A value that is returned if the boolean value is not True. Defaults to None.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `accept` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -377,15 +446,22 @@ class If:
 
         """
 
-        return np.where(value, accept, reject)
+        if out is None:
+            return np.where(value, accept, reject)
+
+        # works for any of `out`, `accept` or `reject` referring to the same array
+        value = np.asarray(value, dtype=bool)
+        np.copyto(out, accept, where=value)
+        np.copyto(out, reject, where=~value)
+        return out
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(value, accept, reject=np.nan):
+        return xr.where(value, accept, reject)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(value, accept, reject=np.nan):
+        return If.exec_np(value, accept, reject=reject)
 
 
 ########################################################################################################################
@@ -429,8 +505,9 @@ class Any:
 
         Parameters
         ----------
-        data : np.array
-            A boolean array. An empty array resolves always with None.
+        data : np.array or Bitmask
+            A boolean array. An empty array resolves always with None. Packed arrays (`Bitmask`) are reduced bitwise
+            and result in a packed array, or in True, False or None if they have only one dimension.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -439,35 +516,29 @@ class Any:
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Boolean result of the logical operation.
 
         """
+        if isinstance(data, Bitmask):
+            return data.reduce(reduce_any, dimension=dimension, ignore_nodata=ignore_nodata)
+
         if is_empty(data):
             return np.nan
 
         if len(data.shape) == 1:  # exand data if it has only one dimension
             data = data[:, None]
 
-        nan_ar = np.isnan(data)
-        if ignore_nodata:
-            nan_mask = np.all(nan_ar, axis=dimension)
-            data[nan_ar] = False
-        else:
-            nan_mask = np.any(nan_ar, axis=dimension)
-
-        data_any = np.any(data, axis=dimension)
-        data_any = data_any.astype(np.float32)  # convert to float to store NaN values
-        data_any[nan_mask] = np.nan
-        return data_any
+        values, valid = reduce_any(to_ternary(data), axis=dimension, ignore_nodata=ignore_nodata)
+        return from_ternary(values, valid, masked=np.ma.isMaskedArray(data))
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        return Any.exec_np(data, ignore_nodata=ignore_nodata, dimension=dimension)
 
 
 ########################################################################################################################
@@ -510,8 +581,9 @@ class All:
 
         Parameters
         ----------
-        data : np.array
-            A boolean array. An empty array resolves always with None.
+        data : np.array or Bitmask
+            A boolean array. An empty array resolves always with None. Packed arrays (`Bitmask`) are reduced bitwise
+            and result in a packed array, or in True, False or None if they have only one dimension.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -520,33 +592,26 @@ class All:
 
         Returns
         -------
-        np.array :
+        np.array or Bitmask :
             Boolean result of the logical operation.
 
         """
+        if isinstance(data, Bitmask):
+            return data.reduce(reduce_all, dimension=dimension, ignore_nodata=ignore_nodata)
+
         if is_empty(data):
             return np.nan
 
         if len(data.shape) == 1:  # exand data if it has only one dimension
             data = data[:, None]
 
-        nan_ar = np.isnan(data)
-        if ignore_nodata:
-            nan_mask = np.all(nan_ar, axis=dimension)
-            data_all = np.all(data, axis=dimension)
-        else:
-            nan_mask = np.any(nan_ar, axis=dimension)  # flag elements with at least one NaN value along the dimension
-            data_all = np.all(data, axis=dimension)
-            nan_mask = nan_mask & data_all  # reset nan mask to only mask trues and NaN values
-
-        data_all = data_all.astype(np.float32)  # convert to float to store NaN values
-        data_all[nan_mask] = np.nan
-        return data_all
+        values, valid = reduce_all(to_ternary(data), axis=dimension, ignore_nodata=ignore_nodata)
+        return from_ternary(values, valid, masked=np.ma.isMaskedArray(data))
 
     @staticmethod
     def exec_xar():
         pass
 
     @staticmethod
-    def exec_da():
-        pass
\ No newline at end of file
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        return All.exec_np(data, ignore_nodata=ignore_nodata, dimension=dimension)
\ No newline at end of file
@@ -6,11 +6,20 @@ try:
 except ImportError:
     xar_addons = None
 
-from openeo_processes.utils import process
+try:
+    import dask.array as da
+except ImportError:
+    da = None
+
+from openeo_processes.utils import process, eval_datatype, mask_nodata
 from openeo_processes.comparison import is_empty
+from openeo_processes.accumulators import compute_moments, compute_quantile_sketch, compute_statistics, COMPRESSION
+from openeo_processes.tiling import map_tiles
+from openeo_processes.kernels import nan_cumextreme
 
 from openeo_processes.errors import QuantilesParameterConflict
 from openeo_processes.errors import QuantilesParameterMissing
+from openeo_processes.errors import QuantilesMethodNotSupported
 
 
 ########################################################################################################################
@@ -90,7 +99,7 @@ class Floor:
         return np.floor(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         The greatest integer less than or equal to the numbers `x`. This process is not an alias for the 'int' process as
         defined by some mathematicians. See the examples for negative numbers in both processes for differences.
@@ -100,6 +109,9 @@ class Floor:
         ----------
         x : np.array
             Numbers to round down.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -107,15 +119,15 @@ class Floor:
             Numbers rounded down.
 
         """
-        return np.floor(x)
+        return np.floor(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Floor.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Floor.exec_np(x)
 
 
 ########################################################################################################################
@@ -163,7 +175,7 @@ class Ceil:
         return np.ceil(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         The least integer greater than or equal to the given numbers.
         The no-data value np.nan is passed through and therefore gets propagated.
@@ -172,6 +184,9 @@ class Ceil:
         ----------
         x : np.array
             Numbers to round up.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -179,15 +194,15 @@ class Ceil:
             Numbers rounded up.
 
         """
-        return np.ceil(x)
+        return np.ceil(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Ceil.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Ceil.exec_np(x)
 
 
 ########################################################################################################################
@@ -245,7 +260,9 @@ class Int:
         Parameters
         ----------
         x : np.array
-            Numbers.
+            Numbers. Integer arrays are returned unchanged and the no-data values of masked arrays (see
+            `openeo_processes.utils.mask_nodata`) stay masked, whereas the no-data values of floating point arrays
+            are returned as None in an object array.
 
         Returns
         -------
@@ -253,6 +270,12 @@ class Int:
             Integer part of the numbers.
 
         """
+        if np.ma.isMaskedArray(x) and x.dtype.kind == "f":  # no-data values stay masked
+            x = mask_nodata(x)
+            return np.ma.MaskedArray(np.trunc(x.filled(0)).astype(np.int64), mask=x.mask)
+        elif x.dtype.kind in "biu":  # integers (also masked ones) do not contain np.nan values
+            return x.copy()
+
         int_x = x.astype(int)
         obj_x = int_x.astype(object)  # convert array to object type to enable storing None values
         obj_x[np.isnan(x)] = None
@@ -264,7 +287,7 @@ class Int:
         pass
 
     @staticmethod
-    def exec_da():
+    def exec_dar():
         pass
 
 
@@ -321,7 +344,7 @@ class Round:
         return builtins.round(x, p)
 
     @staticmethod
-    def exec_np(x, p=0):
+    def exec_np(x, p=0, out=None):
         """
         Rounds real numbers `x` to specified precision `p`.
         If the fractional part of `x` is halfway between two integers, one of which is even and the other odd,
@@ -338,6 +361,9 @@ class Round:
             A positive number specifies the number of digits after the decimal point to round to.
             A negative number means rounding to a power of ten, so for example -2 rounds to the nearest hundred.
             Defaults to 0.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -345,15 +371,15 @@ class Round:
             The rounded numbers.
 
         """
-        return np.around(x, p)
+        return np.around(x, p, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, p=0):
+        return Round.exec_np(x, p=p)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, p=0):
+        return Round.exec_np(x, p=p)
 
 
 ########################################################################################################################
@@ -401,7 +427,7 @@ class Exp:
         return np.exp(p) if p is not None else p
 
     @staticmethod
-    def exec_np(p):
+    def exec_np(p, out=None):
         """
         Exponential function to the base e raised to the power of `p`.
         The no-data value np.nan is passed through and therefore gets propagated.
@@ -410,6 +436,9 @@ class Exp:
         ----------
         p : np.array
             The numerical exponent.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `p` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -417,15 +446,15 @@ class Exp:
             The computed values for e raised to the power of `p`.
 
         """
-        return np.exp(p)
+        return np.exp(p, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(p):
+        return Exp.exec_np(p)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(p):
+        return Exp.exec_np(p)
 
 
 ########################################################################################################################
@@ -477,7 +506,7 @@ class Log:
         return Log.exec_np(x, base) if x is not None and base is not None else None
 
     @staticmethod
-    def exec_np(x, base):
+    def exec_np(x, base, out=None):
         """
         Logarithm to the base `base` of the numbers `x` is defined to be the inverse function of taking `base` to the
         powers of `x`. The no-data value np.nan is passed through and therefore gets propagated if any of the arguments
@@ -490,6 +519,9 @@ class Log:
             Numbers to compute the logarithm for.
         base : int or float
             The numerical base.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -497,15 +529,15 @@ class Log:
             The computed logarithm.
 
         """
-        return np.log(x)/np.log(base)
+        return np.divide(np.log(x, out=out), np.log(base), out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, base):
+        return Log.exec_np(x, base)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, base):
+        return Log.exec_np(x, base)
 
 
 ########################################################################################################################
@@ -555,7 +587,7 @@ class Ln:
         return np.log(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         The natural logarithm is the logarithm to the base e of the numbers `x`, which equals to using the log process
         with the base set to e. The natural logarithm is the inverse function of taking e to the powers `x`. The no-data
@@ -566,6 +598,9 @@ class Ln:
         ----------
         x : np.array
             Numbers to compute the natural logarithm for.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -573,15 +608,15 @@ class Ln:
             The computed natural logarithms.
 
         """
-        return np.log(x)
+        return np.log(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Ln.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Ln.exec_np(x)
 
 
 ########################################################################################################################
@@ -629,7 +664,7 @@ class Cos:
         return np.cos(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the cosine of `x`.
         Works on radians only. The no-data value np.nan is passed through and therefore gets propagated.
@@ -638,6 +673,9 @@ class Cos:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -645,15 +683,15 @@ class Cos:
             The computed cosines of `x`.
 
         """
-        return np.cos(x)
+        return np.cos(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Cos.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Cos.exec_np(x)
 
 
 ########################################################################################################################
@@ -702,7 +740,7 @@ class Arccos:
         return np.arccos(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the arc cosine of `x`. The arc cosine is the inverse function of the cosine so that
         `arccos(cos(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -712,6 +750,9 @@ class Arccos:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -719,15 +760,15 @@ class Arccos:
             The computed angles in radians.
 
         """
-        return np.arccos(x)
+        return np.arccos(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Arccos.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Arccos.exec_np(x)
 
 
 ########################################################################################################################
@@ -775,7 +816,7 @@ class Cosh:
         return np.cosh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the hyperbolic cosine of `x`. Works on radians only.
         The no-data value np.nan is passed through and therefore gets propagated.
@@ -784,6 +825,9 @@ class Cosh:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -791,15 +835,15 @@ class Cosh:
             The computed hyperbolic cosines of `x`.
 
         """
-        return np.cosh(x)
+        return np.cosh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Cosh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Cosh.exec_np(x)
 
 
 ########################################################################################################################
@@ -848,7 +892,7 @@ class Arcosh:
         return np.arccosh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the inverse hyperbolic cosine of `x`. It is the inverse function of the hyperbolic cosine so that
         `arcosh(cosh(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -858,6 +902,9 @@ class Arcosh:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -865,15 +912,15 @@ class Arcosh:
             The computed angles in radians.
 
         """
-        return np.arccosh(x)
+        return np.arccosh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Arcosh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Arcosh.exec_np(x)
 
 
 ########################################################################################################################
@@ -921,7 +968,7 @@ class Sin:
         return np.sin(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the sine of `x`.
         Works on radians only. The no-data value np.nan is passed through and therefore gets propagated.
@@ -930,6 +977,9 @@ class Sin:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -937,15 +987,15 @@ class Sin:
             The computed sines of `x`.
 
         """
-        return np.sin(x)
+        return np.sin(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Sin.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Sin.exec_np(x)
 
 
 ########################################################################################################################
@@ -994,7 +1044,7 @@ class Arcsin:
         return np.arcsin(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the arc sine of `x`. The arc sine is the inverse function of the sine so that
         `arcsin(sin(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -1004,6 +1054,9 @@ class Arcsin:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1011,15 +1064,15 @@ class Arcsin:
             The computed angles in radians.
 
         """
-        return np.arcsin(x)
+        return np.arcsin(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Arcsin.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Arcsin.exec_np(x)
 
 
 ########################################################################################################################
@@ -1067,7 +1120,7 @@ class Sinh:
         return np.sinh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the hyperbolic sine of `x`. Works on radians only.
         The no-data value np.nan is passed through and therefore gets propagated.
@@ -1076,6 +1129,9 @@ class Sinh:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1083,15 +1139,15 @@ class Sinh:
             The computed hyperbolic sines of `x`.
 
         """
-        return np.sinh(x)
+        return np.sinh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Sinh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Sinh.exec_np(x)
 
 
 ########################################################################################################################
@@ -1140,7 +1196,7 @@ class Arsinh:
         return np.arcsinh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the inverse hyperbolic sine of `x`. It is the inverse function of the hyperbolic sine so that
         `arsinh(sinh(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -1150,6 +1206,9 @@ class Arsinh:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1157,15 +1216,15 @@ class Arsinh:
             The computed angles in radians.
 
         """
-        return np.arcsinh(x)
+        return np.arcsinh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Arsinh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Arsinh.exec_np(x)
 
 
 ########################################################################################################################
@@ -1214,7 +1273,7 @@ class Tan:
         return np.tan(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the tangent of `x`. The tangent is defined to be the sine of `x` divided by the cosine of `x`.
         Works on radians only. The no-data value np.nan is passed through and therefore gets propagated.
@@ -1224,6 +1283,9 @@ class Tan:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1231,15 +1293,15 @@ class Tan:
             The computed tangents of `x`.
 
         """
-        return np.tan(x)
+        return np.tan(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Tan.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Tan.exec_np(x)
 
 
 ########################################################################################################################
@@ -1288,7 +1350,7 @@ class Arctan:
         return np.arctan(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the arc tangent of `x`. The arc tangent is the inverse function of the tangent so that
         `arctan(tan(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -1298,6 +1360,9 @@ class Arctan:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1305,15 +1370,15 @@ class Arctan:
             The computed angles in radians.
 
         """
-        return np.arctan(x)
+        return np.arctan(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Arctan.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Arctan.exec_np(x)
 
 
 ########################################################################################################################
@@ -1362,7 +1427,7 @@ class Tanh:
         return np.tanh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the hyperbolic tangent of `x`.  The hyperbolic tangent is defined to be the hyperbolic sine of `x`
         divided by the hyperbolic cosine of `x`. Works on radians only.
@@ -1372,6 +1437,9 @@ class Tanh:
         ----------
         x : np.array
             Angles in radians.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1379,15 +1447,15 @@ class Tanh:
             The computed hyperbolic tangents of `x`.
 
         """
-        return np.tanh(x)
+        return np.tanh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Tanh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Tanh.exec_np(x)
 
 
 ########################################################################################################################
@@ -1436,7 +1504,7 @@ class Artanh:
         return np.arctanh(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the inverse hyperbolic tangent of `x`. It is the inverse function of the hyperbolic tangent so that
         `artanh(tanh(x)) = x`. Works on radians only. The no-data value np.nan is passed through and therefore gets
@@ -1446,6 +1514,9 @@ class Artanh:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1453,15 +1524,15 @@ class Artanh:
             The computed angles in radians.
 
         """
-        return np.arctanh(x)
+        return np.arctanh(x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x):
+        return Artanh.exec_np(x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Artanh.exec_np(x)
 
 
 ########################################################################################################################
@@ -1512,7 +1583,7 @@ class Arctan2:
         return np.arctan2(y, x) if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(y, x):
+    def exec_np(y, x, out=None):
         """
         Computes the arc tangent of two arrays `x` and `y`. It is similar to calculating the arc tangent of `y/x`,
         except that the signs of both arguments are used to determine the quadrant of the result. Works on radians only.
@@ -1524,6 +1595,9 @@ class Arctan2:
             Numbers to be used as dividend.
         x : np.array
             Numbers to be used as divisor.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `y` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1531,15 +1605,15 @@ class Arctan2:
             The computed angles in radians.
 
         """
-        return np.arctan2(y, x)
+        return np.arctan2(y, x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(y, x):
+        return Arctan2.exec_np(y, x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(y, x):
+        return Arctan2.exec_np(y, x)
 
 
 ########################################################################################################################
@@ -1602,7 +1676,7 @@ class LinearScaleRange:
                                           output_max=output_max) if x is not None else x
 
     @staticmethod
-    def exec_np(x, input_min, input_max, output_min=0., output_max=1.):
+    def exec_np(x, input_min, input_max, output_min=0., output_max=1., out=None):
         """
         Performs a linear transformation between the input and output range. The underlying formula is:
         `((x - input_min) / (input_max - input_min)) * (output_max - output_min) + output_min`.
@@ -1624,6 +1698,9 @@ class LinearScaleRange:
             Minimum value of the desired output range (default is 0.).
         output_max : int or float, optional
             Maximum value of the desired output range (default is 1.).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1631,15 +1708,21 @@ class LinearScaleRange:
             The transformed numbers.
 
         """
-        return ((x - input_min) / (input_max - input_min)) * (output_max - output_min) + output_min
+        if out is None:
+            return ((x - input_min) / (input_max - input_min)) * (output_max - output_min) + output_min
+
+        np.subtract(x, input_min, out=out)
+        np.divide(out, input_max - input_min, out=out)
+        np.multiply(out, output_max - output_min, out=out)
+        return np.add(out, output_min, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, input_min, input_max, output_min=0., output_max=1.):
+        return LinearScaleRange.exec_np(x, input_min, input_max, output_min=output_min, output_max=output_max)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, input_min, input_max, output_min=0., output_max=1.):
+        return LinearScaleRange.exec_np(x, input_min, input_max, output_min=output_min, output_max=output_max)
 
 
 ########################################################################################################################
@@ -1689,7 +1772,7 @@ class Scale:
         return x*factor if x is not None else x
 
     @staticmethod
-    def exec_np(x, factor=1.):
+    def exec_np(x, factor=1., out=None):
         """
         Scales `x` with a multiplicand `factor`.
         The no-data value np.nan is passed through and therefore gets propagated.
@@ -1700,6 +1783,9 @@ class Scale:
             A number to scale.
         factor : int or float, optional
             The scale factor/multiplicand (default is 1.).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1707,15 +1793,15 @@ class Scale:
             The scaled numbers.
 
         """
-        return x*factor
+        return np.multiply(x, factor, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, factor=1.):
+        return Scale.exec_np(x, factor=factor)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, factor=1.):
+        return Scale.exec_np(x, factor=factor)
 
 
 ########################################################################################################################
@@ -1765,7 +1851,7 @@ class Mod:
         return x % y if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Remainder after division of `x` by `y`. The result of a modulo operation has the sign of the divisor.
         The no-data value None is passed through and therefore gets propagated if any of the arguments is None.
@@ -1776,6 +1862,9 @@ class Mod:
             Numbers to be used as dividend.
         y : np.array
             Numbers to be used as divisor.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1783,15 +1872,15 @@ class Mod:
             The remainders after division.
 
         """
-        return np.mod(x, y)
+        return np.mod(x, y, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, y):
+        return Mod.exec_np(x, y)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Mod.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -1839,7 +1928,7 @@ class Absolute:
         return abs(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the absolute value of real numbers `x`, which is the "unsigned" portion of `x` and
         often denoted as `|x|`. The no-data value np.nan is passed through and therefore gets propagated.
@@ -1848,6 +1937,9 @@ class Absolute:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1855,7 +1947,7 @@ class Absolute:
             The computed absolute values.
 
         """
-        return np.abs(x)
+        return np.abs(x, out=out)
 
     @staticmethod
     def exec_xar(x):
@@ -1877,8 +1969,8 @@ class Absolute:
         return x.abs()
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Absolute.exec_np(x)
 
 
 ########################################################################################################################
@@ -1931,7 +2023,7 @@ class Sgn:
         return np.sign(x) if x is not None else x
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         The signum (also known as sign) of `x` is defined as:
 
@@ -1945,6 +2037,9 @@ class Sgn:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -1952,7 +2047,7 @@ class Sgn:
             The computed signum values of `x`.
 
         """
-        return np.sign(x)
+        return np.sign(x, out=out)
 
     @staticmethod
     def exec_xar(data):
@@ -1979,8 +2074,8 @@ class Sgn:
         return data.sign()
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Sgn.exec_np(x)
 
 
 ########################################################################################################################
@@ -2030,7 +2125,7 @@ class Sqrt:
         return np.sqrt(x)
 
     @staticmethod
-    def exec_np(x):
+    def exec_np(x, out=None):
         """
         Computes the square root of real numbers `x`, which is equal to calculating `x` to the power of 0.5.
         Square roots of `x` are numbers `a` such that `a^2 = x`. Therefore, the square root is the inverse function
@@ -2041,6 +2136,9 @@ class Sqrt:
         ----------
         x : np.array
             Numbers.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -2048,7 +2146,7 @@ class Sqrt:
             The computed square roots.
 
         """
-        return np.sqrt(x)
+        return np.sqrt(x, out=out)
 
     @staticmethod
     def exec_xar(data):
@@ -2072,8 +2170,8 @@ class Sqrt:
         return data.sqrt()
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x):
+        return Sqrt.exec_np(x)
 
 
 ########################################################################################################################
@@ -2123,7 +2221,7 @@ class Power:
         return np.power(base, float(p)) if base is not None and p is not None else None  # float(p) because of error message in NumPy: ValueError: Integers to negative integer powers are not allowed.
 
     @staticmethod
-    def exec_np(base, p):
+    def exec_np(base, p, out=None):
         """
         Computes the exponentiation for the bases `base` raised to the power of `p`.
         The no-data value np.nan is passed through and therefore gets propagated if any of the arguments is np.nan.
@@ -2134,6 +2232,9 @@ class Power:
             The numerical bases.
         p : int or float
             The numerical exponent.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `base` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -2142,15 +2243,39 @@ class Power:
 
         """
 
-        return np.power(base, float(p))  # float(p) because of error message in NumPy: ValueError: Integers to negative integer powers are not allowed.
+        return np.power(base, float(p), out=out)  # float(p) because of error message in NumPy: ValueError: Integers to negative integer powers are not allowed.
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(base, p):
+        return Power.exec_np(base, p)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(base, p):
+        return Power.exec_np(base, p)
+
+
+def _xar_dimension(data, dimension):
+    """
+    Returns the name of the dimension `dimension` of the xarray object `data`, which can be given by its name or by
+    its index.
+
+    """
+    if isinstance(dimension, str):
+        return dimension
+    return data.dims[dimension]
+
+
+def _reduce_masked(data, reducer, ignore_nodata=True, dimension=0, **kwargs):
+    """
+    Reduces the masked array `data` along `dimension` with a reducer of `np.ma` (e.g. `np.ma.min`), which skips the
+    masked (no-data) values and keeps the data type if possible. If no-data values are not ignored, the results of all
+    series containing a masked value are masked.
+
+    """
+    result = reducer(data, axis=dimension, **kwargs)
+    if not ignore_nodata:
+        result = np.ma.masked_where(np.ma.getmaskarray(data).any(axis=dimension), result, copy=False)
+    return result
 
 
 ########################################################################################################################
@@ -2191,7 +2316,8 @@ class Mean:
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to false considers no-data values so that np.nan is returned if any value is such a value.
@@ -2207,6 +2333,9 @@ class Mean:
         if is_empty(data):
             return np.nan
 
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.mean, ignore_nodata=ignore_nodata, dimension=dimension)
+
         if not ignore_nodata:
             return np.mean(data, axis=dimension)
         else:
@@ -2225,8 +2354,8 @@ class Mean:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the mean along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the mean along (default is 0).
 
         Returns
         -------
@@ -2237,11 +2366,38 @@ class Mean:
         if is_empty(data):
             return np.nan
 
-        return data.mean(data, dim=dimension, skipna=~ignore_nodata)
+        return data.mean(dim=_xar_dimension(data, dimension), skipna=ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        The arithmetic mean of an array of numbers is the quantity commonly called the average.
+        It is defined as the sum of all elements divided by the number of elements.
+        The mean is computed chunk-wise with a tree reduction of the partial sums and counts.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the mean along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            The computed arithmetic mean values.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.mean(data, axis=dimension)
+        else:
+            return da.nanmean(data, axis=dimension)
 
 
 ########################################################################################################################
@@ -2282,7 +2438,8 @@ class Min:
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -2298,6 +2455,9 @@ class Min:
         if is_empty(data):
             return np.nan
 
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.min, ignore_nodata=ignore_nodata, dimension=dimension)
+
         if not ignore_nodata:
             return np.min(data, axis=dimension)
         else:
@@ -2316,8 +2476,8 @@ class Min:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the minimum along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the minimum along (default is 0).
 
         Returns
         -------
@@ -2328,11 +2488,37 @@ class Min:
         if is_empty(data):
             return np.nan
 
-        return data.min(data, dim=dimension, skipna=~ignore_nodata)
+        return data.min(dim=_xar_dimension(data, dimension), skipna=ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes the smallest value of an array of numbers, which is is equal to the last element of a sorted
+        (i.e., ordered) version the array. The minimum is computed chunk-wise with a tree reduction.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the minimum value along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            The minimum values.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.min(data, axis=dimension)
+        else:
+            return da.nanmin(data, axis=dimension)
 
 
 ########################################################################################################################
@@ -2369,7 +2555,8 @@ class Max():
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -2385,6 +2572,9 @@ class Max():
         if is_empty(data):
             return np.nan
 
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.max, ignore_nodata=ignore_nodata, dimension=dimension)
+
         if not ignore_nodata:
             return np.max(data, axis=dimension)
         else:
@@ -2403,8 +2593,8 @@ class Max():
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the maximum along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the maximum along (default is 0).
 
         Returns
         -------
@@ -2415,11 +2605,37 @@ class Max():
         if is_empty(data):
             return np.nan
 
-        return data.max(data, dim=dimension, skipna=~ignore_nodata)
+        return data.max(dim=_xar_dimension(data, dimension), skipna=ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes the largest value of an array of numbers, which is is equal to the first element of a sorted
+        (i.e., ordered) version the array. The maximum is computed chunk-wise with a tree reduction.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the maximum value along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            The maximum values.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.max(data, axis=dimension)
+        else:
+            return da.nanmax(data, axis=dimension)
 
 
 ########################################################################################################################
@@ -2452,7 +2668,7 @@ class Median:
         pass
 
     @staticmethod
-    def exec_np(data, ignore_nodata=True, dimension=0):
+    def exec_np(data, ignore_nodata=True, dimension=0, max_workers=1, tile_size=None):
         """
         The statistical median of an array of numbers is the value separating the higher half from the lower half of
         the data. Remarks:
@@ -2465,12 +2681,18 @@ class Median:
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the median along (default is 0).
+        max_workers : int, optional
+            Number of threads computing the medians of tiles of the remaining dimensions in parallel (default is 1).
+            If None, the number of CPUs is used (see `openeo_processes.tiling.map_tiles`).
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
@@ -2482,10 +2704,13 @@ class Median:
         if is_empty(data):
             return np.nan
 
-        if not ignore_nodata:
-            return np.median(data, axis=dimension)
-        else:
-            return np.nanmedian(data, axis=dimension)
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.median, ignore_nodata=ignore_nodata, dimension=dimension)
+
+        median = np.median if not ignore_nodata else np.nanmedian
+        return map_tiles(lambda tile: median(tile, axis=dimension), data, dimension=dimension,
+                         out_axis=lambda axis: axis - (axis > dimension % np.ndim(data)),
+                         max_workers=max_workers, tile_size=tile_size)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0):
@@ -2505,8 +2730,8 @@ class Median:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the median along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the median along (default is 0).
 
         Returns
         -------
@@ -2517,11 +2742,38 @@ class Median:
         if is_empty(data):
             return np.nan
 
-        return data.median(data, dim=dimension, skipna=~ignore_nodata)
+        return data.median(dim=_xar_dimension(data, dimension), skipna=ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        The statistical median of an array of numbers is the value separating the higher half from the lower half of
+        the data. Since the median cannot be merged from partial results, the array is rechunked to a single chunk
+        along `dimension`, i.e. only the complete series of one chunk of the remaining dimensions is loaded at a time.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the median along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            The computed statistical medians.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.median(data, axis=dimension)
+        else:
+            return da.nanmedian(data, axis=dimension)
 
 
 ########################################################################################################################
@@ -2560,12 +2812,14 @@ class Sd:
         It is defined to be the square root of the corresponding variance (see `variance`). A low standard deviation
         indicates that the values tend to be close to the expected value, while a high standard deviation indicates
         that the values are spread out over a wider range.
-
+        The data is read only once by merging the moments of consecutive blocks along `dimension` (see
+        `openeo_processes.accumulators.Moments`).
 
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -2585,10 +2839,10 @@ class Sd:
         if is_empty(data):
             return np.nan
 
-        if not ignore_nodata:
-            return np.std(data, axis=dimension, ddof=1)
-        else:
-            return np.nanstd(data, axis=dimension, ddof=1)
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.std, ignore_nodata=ignore_nodata, dimension=dimension, ddof=1)
+
+        return compute_moments(data, dimension=dimension, ignore_nodata=ignore_nodata).sd(ddof=1)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0):
@@ -2606,8 +2860,8 @@ class Sd:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the standard deviation along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the standard deviation along (default is 0).
 
         Returns
         -------
@@ -2622,18 +2876,48 @@ class Sd:
         if is_empty(data):
             return np.nan
 
-        return data.std(data, dim=dimension, skipna=~ignore_nodata)
+        dimension = _xar_dimension(data, dimension)
+        moments = compute_moments(data.data, dimension=data.get_axis_num(dimension), ignore_nodata=ignore_nodata)
+        return data.isel({dimension: 0}, drop=True).copy(data=moments.sd(ddof=1))
 
     @staticmethod
-    def exec_da():
-        pass
-
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes the sample standard deviation, which quantifies the amount of variation of an array of numbers.
+        It is defined to be the square root of the corresponding variance (see `variance`). The standard deviation is
+        computed chunk-wise with a tree reduction of the partial moments.
 
-########################################################################################################################
-# Variance Process
-########################################################################################################################
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the standard deviation along (default is 0).
 
-@process
+        Returns
+        -------
+        dask.array.Array :
+            The computed sample standard deviations.
+
+        Notes
+        -----
+        The standard deviation is computed with 1 as a degree of freedom.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        return compute_moments(data, dimension=dimension, ignore_nodata=ignore_nodata).sd(ddof=1)
+
+
+########################################################################################################################
+# Variance Process
+########################################################################################################################
+
+@process
 def variance():
     """
     Returns class instance of `Variance`.
@@ -2664,11 +2948,14 @@ class Variance:
         Computes the sample variance of an array of numbers by calculating the square of the standard deviation
         (see `sd`). It is defined to be the expectation of the squared deviation of a random variable from its
         expected value. Basically, it measures how far the numbers in the array are spread out from their average value.
+        The data is read only once by merging the moments of consecutive blocks along `dimension` (see
+        `openeo_processes.accumulators.Moments`).
 
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -2684,10 +2971,10 @@ class Variance:
         if is_empty(data):
             return np.nan
 
-        if not ignore_nodata:
-            return np.var(data, axis=dimension, ddof=1)
-        else:
-            return np.nanvar(data, axis=dimension, ddof=1)
+        if np.ma.isMaskedArray(data):
+            return _reduce_masked(data, np.ma.var, ignore_nodata=ignore_nodata, dimension=dimension, ddof=1)
+
+        return compute_moments(data, dimension=dimension, ignore_nodata=ignore_nodata).variance(ddof=1)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0):
@@ -2703,8 +2990,8 @@ class Variance:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the variance along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the variance along (default is 0).
 
         Returns
         -------
@@ -2716,11 +3003,36 @@ class Variance:
         if is_empty(data):
             return np.nan
 
-        return data.var(data, dim=dimension, skipna=~ignore_nodata)
+        dimension = _xar_dimension(data, dimension)
+        moments = compute_moments(data.data, dimension=data.get_axis_num(dimension), ignore_nodata=ignore_nodata)
+        return data.isel({dimension: 0}, drop=True).copy(data=moments.variance(ddof=1))
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes the sample variance of an array of numbers by calculating the square of the standard deviation
+        (see `sd`). The variance is computed chunk-wise with a tree reduction of the partial moments.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the variance along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            The computed sample variances.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        return compute_moments(data, dimension=dimension, ignore_nodata=ignore_nodata).variance(ddof=1)
 
 
 ########################################################################################################################
@@ -2756,12 +3068,14 @@ class Extrema:
     def exec_np(data, dimension=0, ignore_nodata=True):
         """
         Two element array containing the minimum and the maximum values of data. This process is basically an alias
-        for calling both `min` and `max`.
+        for calling both `min` and `max`, but both are computed in a single pass over the data (see
+        `openeo_processes.accumulators.compute_statistics`).
 
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -2778,16 +3092,74 @@ class Extrema:
         if is_empty(data):
             return [np.nan, np.nan]
 
-        return [min(data, dimension=dimension, ignore_nodata=ignore_nodata),
-                max(data, dimension=dimension, ignore_nodata=ignore_nodata)]
+        if np.ma.isMaskedArray(data):
+            return [Min.exec_np(data, dimension=dimension, ignore_nodata=ignore_nodata),
+                    Max.exec_np(data, dimension=dimension, ignore_nodata=ignore_nodata)]
+
+        return compute_statistics(data, dimension=dimension, ignore_nodata=ignore_nodata,
+                                  statistics=["extrema"]).get("extrema")
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(data, dimension=0, ignore_nodata=True):
+        """
+        Two element array containing the minimum and the maximum values of data. This process is basically an alias
+        for calling both `min` and `max`, but both are computed in a single pass over the data (or a single tree
+        reduction for dask-backed arrays).
+
+        Parameters
+        ----------
+        data : xr.DataArray
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the extrema along (default is 0).
+
+        Returns
+        -------
+        list of xr.DataArray :
+            A list containing the minimum and maximum values for the specified numbers. The first element is the
+            minimum, the second element is the maximum. If the input array is empty both elements are set to np.nan.
+
+        """
+        if is_empty(data):
+            return [np.nan, np.nan]
+
+        dimension = _xar_dimension(data, dimension)
+        extrema = compute_statistics(data.data, dimension=data.get_axis_num(dimension), ignore_nodata=ignore_nodata,
+                                     statistics=["extrema"]).get("extrema")
+        template = data.isel({dimension: 0}, drop=True)
+        return [template.copy(data=extreme) for extreme in extrema]
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, dimension=0, ignore_nodata=True):
+        """
+        Two element array containing the minimum and the maximum values of data. This process is basically an alias
+        for calling both `min` and `max`, but both are computed by a single tree reduction.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the extrema along (default is 0).
+
+        Returns
+        -------
+        list of dask.array.Array :
+            A list containing the minimum and maximum values for the specified numbers. The first element is the
+            minimum, the second element is the maximum. If the input array is empty both elements are set to np.nan.
+
+        """
+        if is_empty(data):
+            return [np.nan, np.nan]
+
+        return compute_statistics(data, dimension=dimension, ignore_nodata=ignore_nodata,
+                                  statistics=["extrema"]).get("extrema")
 
 
 ########################################################################################################################
@@ -2847,7 +3219,7 @@ class Clip:
         return x
 
     @staticmethod
-    def exec_np(x, min_x, max_x):
+    def exec_np(x, min_x, max_x, out=None):
         """
         Clips a number between specified minimum and maximum values. A value larger than the maximal value will have
         the maximal value, a value lower than minimal value will have the minimal value.
@@ -2861,6 +3233,9 @@ class Clip:
             Minimum value. If `x` is lower than this value, the process will return the value of this parameter.
         max_x : int or float
             Maximum value. If `x` is greater than this value, the process will return the value of this parameter.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -2868,21 +3243,17 @@ class Clip:
             The value clipped to the specified range.
 
         """
-        x = np.where(x < min_x, min_x, x)
-        x = np.where(x > max_x, max_x, x)
-
-        return x
+        return np.clip(x, min_x, max_x, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, min_x, max_x):
+        return x.clip(min_x, max_x)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, min_x, max_x):
+        return Clip.exec_np(x, min_x, max_x)
 
 
-# TODO: quantiles with nans are not working properly/really slow -> own implementation (e.g. like in SGRT)?
 ########################################################################################################################
 # Quantiles Process
 ########################################################################################################################
@@ -2913,7 +3284,8 @@ class Quantiles:
         pass
 
     @staticmethod
-    def exec_np(data, probabilities=None, q=None, dimension=0, ignore_nodata=True):
+    def exec_np(data, probabilities=None, q=None, dimension=0, ignore_nodata=True, method="sort",
+                compression=COMPRESSION, max_workers=1, tile_size=None):
         """
         Calculates quantiles, which are cut points dividing the range of a probability distribution into either
 
@@ -2926,7 +3298,9 @@ class Quantiles:
         Parameters
         ----------
         data : np.array
-            An array of numbers.
+            An array of numbers. Masked values of a masked array (see `openeo_processes.utils.mask_nodata`) are
+            no-data values. The exact quantiles of masked arrays are computed by sorting the values in their data
+            type, i.e. without converting them to float.
         probabilities : list, optional
             A list of probabilities to calculate quantiles for. The probabilities must be between 0 and 1.
         q : int, optional
@@ -2937,6 +3311,20 @@ class Quantiles:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        method : str, optional
+            Algorithm used for computing the quantiles:
+                - 'sort' (default): exact quantiles by sorting the values (`np.nanpercentile`),
+                - 'select': exact quantiles by selecting only the required order statistics (`np.partition`),
+                - 'sketch': approximate quantiles from a mergeable t-digest sketch, which is computed in a single pass
+                  (see `openeo_processes.accumulators.QuantileSketch`).
+        compression : int, optional
+            Compression parameter of the sketch used by the 'sketch' method (default is 100). Higher values give more
+            accurate estimates.
+        max_workers : int, optional
+            Number of threads computing the exact quantiles of tiles of the remaining dimensions in parallel (default
+            is 1). If None, the number of CPUs is used (see `openeo_processes.tiling.map_tiles`).
+        tile_size : int, optional
+            Number of elements per tile. Defaults to `openeo_processes.tiling.TILE_SIZE`.
 
         Returns
         -------
@@ -2953,9 +3341,37 @@ class Quantiles:
             If both parameters `probabilities` and `q` are None.
         QuantilesParameterConflict :
             If both parameters `probabilities` and `q` are set.
-
-        """
-        Quantiles._check_input(probabilities, q)
+        QuantilesMethodNotSupported :
+            If `method` is not one of 'sort', 'select' or 'sketch'.
+
+        """
+        Quantiles._check_input(probabilities, q, method)
+        if np.ma.isMaskedArray(data) and method != "sketch":
+            probabilities = Quantiles._get_probabilities(probabilities, q)
+            if is_empty(data):
+                return [np.nan] * len(probabilities)
+            return Quantiles._select_masked(data, probabilities, dimension=dimension, ignore_nodata=ignore_nodata)
+        elif np.ma.isMaskedArray(data):
+            data = data.astype(float).filled(np.nan)
+
+        # the quantiles are stacked along a new first dimension
+        out_axis = lambda axis: axis - (axis > dimension % np.ndim(data)) + 1
+
+        if method == "select":
+            probabilities = Quantiles._get_probabilities(probabilities, q)
+            if is_empty(data):
+                return [np.nan] * len(probabilities)
+            return map_tiles(lambda tile: Quantiles._select(tile, probabilities, dimension=dimension,
+                                                            ignore_nodata=ignore_nodata),
+                             data, dimension=dimension, out_axis=out_axis, max_workers=max_workers,
+                             tile_size=tile_size)
+        elif method == "sketch":
+            probabilities = Quantiles._get_probabilities(probabilities, q)
+            if is_empty(data):
+                return [np.nan] * len(probabilities)
+            sketch = compute_quantile_sketch(data, dimension=dimension, ignore_nodata=ignore_nodata,
+                                             compression=compression)
+            return sketch.quantiles(probabilities)
 
         # convert quantiles and probabilities to percentiles
         if probabilities is not None:
@@ -2966,13 +3382,13 @@ class Quantiles:
         if is_empty(data):
             return [np.nan] * len(probabilities)
 
-        if not ignore_nodata:
-            return np.percentile(data, probabilities, axis=dimension)
-        else:
-            return np.nanpercentile(data, probabilities, axis=dimension)
+        percentile = np.percentile if not ignore_nodata else np.nanpercentile
+        return map_tiles(lambda tile: percentile(tile, probabilities, axis=dimension), data, dimension=dimension,
+                         out_axis=out_axis, max_workers=max_workers, tile_size=tile_size)
 
     @staticmethod
-    def exec_xar(data, ignore_nodata=True, dimension=0, probabilities=None, q=None):
+    def exec_xar(data, ignore_nodata=True, dimension=0, probabilities=None, q=None, method="sort",
+                 compression=COMPRESSION):
         """
         Calculates quantiles, which are cut points dividing the range of a probability distribution into either
 
@@ -2991,11 +3407,17 @@ class Quantiles:
         q : int, optional
             A number of intervals to calculate quantiles for. Calculates q-quantiles with (nearly) equal-sized
             intervals.
-        dimension : int, optional
-            Defines the dimension to calculate the quantiles along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the quantiles along (default is 0).
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        method : str, optional
+            Algorithm used for computing the quantiles, either 'sort' (default) or 'select' for exact quantiles or
+            'sketch' for approximate quantiles (see `Quantiles.exec_np`). Arrays backed by dask arrays are processed
+            as described in `Quantiles.exec_dar`.
+        compression : int, optional
+            Compression parameter of the sketch used by the 'sketch' method (default is 100).
 
         Returns
         -------
@@ -3012,24 +3434,198 @@ class Quantiles:
             If both parameters `probabilities` and `q` are None.
         QuantilesParameterConflict :
             If both parameters `probabilities` and `q` are set.
+        QuantilesMethodNotSupported :
+            If `method` is not one of 'sort', 'select' or 'sketch'.
 
         """
-        Quantiles._check_input(probabilities, q)
+        Quantiles._check_input(probabilities, q, method)
+        probabilities = Quantiles._get_probabilities(probabilities, q)
 
-        if q is not None:
-            probabilities = list(np.arange(0, 1, 1./q))[1:]
+        if is_empty(data):
+            return [np.nan] * len(probabilities)
+
+        dimension = _xar_dimension(data, dimension)
+        if method == "sort":
+            return data.quantile(np.array(probabilities), dim=dimension, skipna=ignore_nodata)
+
+        exec_fun = Quantiles.exec_dar if da is not None and isinstance(data.data, da.Array) else Quantiles.exec_np
+        quantiles = exec_fun(data.data, probabilities, dimension=data.get_axis_num(dimension),
+                             ignore_nodata=ignore_nodata, method=method, compression=compression)
+        # same layout as `xr.DataArray.quantile`, i.e. the quantiles are stacked along a new first dimension
+        template = data.isel({dimension: 0}, drop=True).expand_dims(quantile=probabilities)
+        return template.copy(data=quantiles)
+
+    @staticmethod
+    def exec_dar(data, probabilities=None, q=None, dimension=0, ignore_nodata=True, method="sort",
+                 compression=COMPRESSION):
+        """
+        Calculates quantiles, which are cut points dividing the range of a probability distribution into either
+
+            - intervals corresponding to the given probabilities or
+            - (nearly) equal-sized intervals (q-quantiles based on the parameter q).
+
+        Either the parameter `probabilities` or `q` must be specified, otherwise the `QuantilesParameterMissing`
+        exception is thrown. If both parameters are set the `QuantilesParameterConflict `exception is thrown.
+        The exact methods rechunk the array to a single chunk along `dimension`, whereas the 'sketch' method reduces
+        the chunks along `dimension` with a tree reduction of mergeable sketches.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers.
+        probabilities : list, optional
+            A list of probabilities to calculate quantiles for. The probabilities must be between 0 and 1.
+        q : int, optional
+            A number of intervals to calculate quantiles for. Calculates q-quantiles with (nearly) equal-sized
+            intervals.
+        dimension : int, optional
+            Defines the dimension to calculate the quantiles along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        method : str, optional
+            Algorithm used for computing the quantiles, either 'sort' (default) or 'select' for exact quantiles or
+            'sketch' for approximate quantiles (see `Quantiles.exec_np`).
+        compression : int, optional
+            Compression parameter of the sketch used by the 'sketch' method (default is 100).
+
+        Returns
+        -------
+        dask.array.Array :
+            An array with the computed quantiles, the first dimension corresponding to the probabilities.
+            If the input array is empty a list filled with np.nan values is returned.
+
+        Raises
+        ------
+        QuantilesParameterMissing :
+            If both parameters `probabilities` and `q` are None.
+        QuantilesParameterConflict :
+            If both parameters `probabilities` and `q` are set.
+        QuantilesMethodNotSupported :
+            If `method` is not one of 'sort', 'select' or 'sketch'.
+
+        """
+        Quantiles._check_input(probabilities, q, method)
+        probabilities = Quantiles._get_probabilities(probabilities, q)
 
         if is_empty(data):
             return [np.nan] * len(probabilities)
 
-        return data.quantile(np.array(probabilities), dim=dimension, skipna=~ignore_nodata)
+        if method == "sketch":
+            sketch = compute_quantile_sketch(data, dimension=dimension, ignore_nodata=ignore_nodata,
+                                             compression=compression)
+            return sketch.quantiles(probabilities)
+        else:
+            dimension = dimension % data.ndim
+            out_chunks = ((len(probabilities),),) + data.chunks[:dimension] + data.chunks[dimension + 1:]
+            return da.map_blocks(Quantiles._select, data.rechunk({dimension: -1}), probabilities,
+                                 dimension=dimension, ignore_nodata=ignore_nodata, drop_axis=dimension, new_axis=0,
+                                 chunks=out_chunks, dtype=float, meta=np.empty((0,) * data.ndim))
 
     @staticmethod
-    def exec_da():
-        pass
+    def _get_probabilities(probabilities, q):
+        """ Returns the given probabilities or the probabilities of the q-quantiles as a list of floats. """
+        if probabilities is not None:
+            return [float(probability) for probability in probabilities]
+        else:
+            return list(np.arange(1, q) / q)
+
+    @staticmethod
+    def _select(data, probabilities, dimension=0, ignore_nodata=True):
+        """
+        Computes exact quantiles (linear interpolation between the closest ranks, as `np.nanpercentile`) by selecting
+        the required order statistics with `np.partition` instead of sorting all values.
+
+        Since the ranks depend on the number of valid values, the series along `dimension` are grouped by their number
+        of valid values and all order statistics required for all probabilities are selected at once for each group.
+
+        Parameters
+        ----------
+        data : np.array
+            An array of numbers.
+        probabilities : list
+            A list of probabilities to calculate quantiles for. The probabilities must be between 0 and 1.
+        dimension : int, optional
+            Defines the dimension to calculate the quantiles along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+
+        Returns
+        -------
+        np.array :
+            An array with the computed quantiles, the first dimension corresponding to `probabilities`.
+
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        values = np.moveaxis(np.asarray(data, dtype=float), dimension, -1)
+        shape = values.shape[:-1]
+        values = values.reshape(-1, values.shape[-1])
+        quantiles = np.full((len(probabilities), values.shape[0]), np.nan)
+
+        n_nodata = np.count_nonzero(np.isnan(values), axis=-1)
+        if ignore_nodata:
+            n_valid = values.shape[-1] - n_nodata
+        else:  # series containing no-data values keep np.nan
+            n_valid = np.where(n_nodata > 0, 0, values.shape[-1])
+
+        for n in np.unique(n_valid):
+            if n == 0:
+                continue
+            rows = np.flatnonzero(n_valid == n)
+            ranks = probabilities * (n - 1)
+            lower = np.floor(ranks).astype(np.int64)
+            upper = np.minimum(lower + 1, n - 1)
+            selected = np.partition(values[rows], np.union1d(lower, upper), axis=-1)  # np.nan is moved to the end
+            v_0 = selected[:, lower].T
+            v_1 = selected[:, upper].T
+            fraction = (ranks - lower)[:, None]
+            quantiles[:, rows] = np.where(fraction >= 0.5, v_1 - (v_1 - v_0) * (1 - fraction),
+                                          v_0 + (v_1 - v_0) * fraction)
+
+        return quantiles.reshape((len(probabilities),) + shape)
+
+    @staticmethod
+    def _select_masked(data, probabilities, dimension=0, ignore_nodata=True):
+        """
+        Computes exact quantiles (linear interpolation between the closest ranks, as `np.nanpercentile`) of a masked
+        array. The values are sorted in their data type with the masked values at the end of each series and only the
+        selected order statistics are converted to float.
+
+        Parameters
+        ----------
+        data : np.ma.MaskedArray
+            An array of numbers, whose masked values are no-data values.
+        probabilities : list
+            A list of probabilities to calculate quantiles for. The probabilities must be between 0 and 1.
+        dimension : int, optional
+            Defines the dimension to calculate the quantiles along (default is 0).
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+
+        Returns
+        -------
+        np.ma.MaskedArray :
+            An array with the computed quantiles, the first dimension corresponding to `probabilities`. Quantiles of
+            series without (valid) values are masked.
+
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        n_valid = np.count_nonzero(~np.ma.getmaskarray(data), axis=dimension)
+        if not ignore_nodata:  # series containing no-data values are masked
+            n_valid = np.where(n_valid < data.shape[dimension], 0, n_valid)
+        values = np.moveaxis(np.ma.getdata(np.ma.sort(data, axis=dimension, endwith=True)), dimension, 0)
+
+        ranks = probabilities.reshape((-1,) + (1,) * n_valid.ndim) * (n_valid - 1)
+        lower = np.maximum(np.floor(ranks).astype(np.int64), 0)
+        upper = np.minimum(lower + 1, np.maximum(n_valid - 1, 0))
+        v_0 = np.take_along_axis(values, lower, axis=0).astype(float)
+        v_1 = np.take_along_axis(values, upper, axis=0).astype(float)
+        fraction = ranks - lower
+        quantiles = np.where(fraction >= 0.5, v_1 - (v_1 - v_0) * (1 - fraction), v_0 + (v_1 - v_0) * fraction)
+        return np.ma.masked_where(np.broadcast_to(n_valid == 0, quantiles.shape), quantiles, copy=False)
 
     @staticmethod
-    def _check_input(probabilities, q):
+    def _check_input(probabilities, q, method="sort"):
         """
         Checks if the probabilities `probabilities` and quantiles `q` are given correctly.
 
@@ -3043,6 +3639,8 @@ class Quantiles:
         q : int, optional
             A number of intervals to calculate quantiles for. Calculates q-quantiles with (nearly) equal-sized
             intervals.
+        method : str, optional
+            Algorithm used for computing the quantiles (default is 'sort').
 
         Raises
         ------
@@ -3050,6 +3648,8 @@ class Quantiles:
             If both parameters `probabilities` and `q` are None.
         QuantilesParameterConflict :
             If both parameters `probabilities` and `q` are set.
+        QuantilesMethodNotSupported :
+            If `method` is not one of 'sort', 'select' or 'sketch'.
 
         """
         if (probabilities is not None) and (q is not None):
@@ -3058,6 +3658,35 @@ class Quantiles:
         if probabilities is None and q is None:
             raise QuantilesParameterMissing()
 
+        if method not in ("sort", "select", "sketch"):
+            raise QuantilesMethodNotSupported(method)
+
+
+def _extreme_value(dtype, largest):
+    """ Returns the largest or smallest value of `dtype`, i.e. the identity of a cumulative minimum or maximum. """
+    if np.issubdtype(dtype, np.integer):
+        return np.iinfo(dtype).max if largest else np.iinfo(dtype).min
+    else:
+        return np.inf if largest else -np.inf
+
+
+def _nan_accumulate(data, ufunc, dimension, out=None):
+    """
+    Accumulates `data` along `dimension` with a NaN-ignoring ufunc (`np.fmin` or `np.fmax`) and fills in the np.nan
+    values of `data` again. Dask arrays are accumulated chunk-wise with a carry between the chunks, all other arrays
+    with `openeo_processes.kernels.nan_cumextreme`, optionally writing into `out`. The data type of `data` is kept.
+
+    """
+    if eval_datatype(data) == "dask":
+        if data.dtype.kind != "f":  # no np.nan values possible, the data type is kept
+            ufunc = np.maximum if ufunc is np.fmax else np.minimum
+            return da.reductions.cumreduction(ufunc.accumulate, ufunc, _extreme_value(data.dtype, ufunc is np.minimum),
+                                              data, axis=dimension, dtype=data.dtype)
+        data_acc = da.reductions.cumreduction(ufunc.accumulate, ufunc, np.nan, data, axis=dimension, dtype=data.dtype)
+        return da.where(da.isnan(data), np.nan, data_acc)
+    else:
+        return nan_cumextreme(data, dimension=dimension, largest=ufunc is np.fmax, out=out)
+
 
 ########################################################################################################################
 # Cummin Process
@@ -3089,7 +3718,7 @@ class Cummin:
         pass
 
     @staticmethod
-    def exec_np(data, ignore_nodata=True, dimension=0):
+    def exec_np(data, ignore_nodata=True, dimension=0, out=None):
         """
         Finds cumulative minima of an array of numbers. Every computed element is equal to the smaller one between
         current element and the previously computed element. The returned array and the input array have always the
@@ -3106,6 +3735,9 @@ class Cummin:
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative minima along (default is 0).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `data` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3117,13 +3749,9 @@ class Cummin:
             return np.nan
 
         if not ignore_nodata:
-            return np.minimum.accumulate(data, axis=dimension)
+            return np.minimum.accumulate(data, axis=dimension, out=out)
         else:
-            nan_idxs = np.isnan(data)
-            data[nan_idxs] = np.nanmax(data)
-            data_cummin = np.minimum.accumulate(data, axis=dimension).astype(float)
-            data_cummin[nan_idxs] = np.nan  # fill in the old np.nan values again
-            return data_cummin
+            return _nan_accumulate(data, np.fmin, dimension, out=out)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0):
@@ -3141,12 +3769,44 @@ class Cummin:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the cumulative minima along (default is 0).
+
+        Returns
+        -------
+        xr.DataArray :
+            An array with the computed cumulative minima.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        dimension = data.get_axis_num(_xar_dimension(data, dimension))
+        exec_fun = Cummin.exec_dar if da is not None and isinstance(data.data, da.Array) else Cummin.exec_np
+        return data.copy(data=exec_fun(data.data, ignore_nodata=ignore_nodata, dimension=dimension))
+
+    @staticmethod
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Finds cumulative minima of an array of numbers. Every computed element is equal to the smaller one between
+        current element and the previously computed element. The returned array and the input array have always the
+        same length. By default, no-data values are skipped, but stay in the result.
+        The array is scanned chunk by chunk along `dimension` and the last minima of a chunk are carried over to the
+        next one.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative minima along (default is 0).
 
         Returns
         -------
-        xr.DataArray :
+        dask.array.Array :
             An array with the computed cumulative minima.
 
         """
@@ -3154,18 +3814,10 @@ class Cummin:
             return np.nan
 
         if not ignore_nodata:
-            return np.minimum.accumulate(data, axis=dimension)
+            return da.reductions.cumreduction(np.minimum.accumulate, np.minimum, _extreme_value(data.dtype, True),
+                                              data, axis=dimension, dtype=data.dtype)
         else:
-            data = np.array(data)
-            nan_idxs = np.isnan(data)
-            data[nan_idxs] = np.nanmax(data)
-            data_cummin = np.minimum.accumulate(data, axis=dimension).astype(float)
-            data_cummin[nan_idxs] = np.nan
-            return data_cummin
-
-    @staticmethod
-    def exec_da():
-        pass
+            return _nan_accumulate(data, np.fmin, dimension)
 
 
 ########################################################################################################################
@@ -3198,7 +3850,7 @@ class Cummax:
         pass
 
     @staticmethod
-    def exec_np(data, ignore_nodata=True, dimension=0):
+    def exec_np(data, ignore_nodata=True, dimension=0, out=None):
         """
         Finds cumulative maxima of an array of numbers. Every computed element is equal to the bigger one between
         current element and the previously computed element. The returned array and the input array have always the
@@ -3215,6 +3867,9 @@ class Cummax:
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative maxima along (default is 0).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `data` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3226,13 +3881,9 @@ class Cummax:
             return np.nan
 
         if not ignore_nodata:
-            return np.maximum.accumulate(data, axis=dimension)
+            return np.maximum.accumulate(data, axis=dimension, out=out)
         else:
-            nan_idxs = np.isnan(data)
-            data[nan_idxs] = np.nanmin(data)
-            data_cummax = np.maximum.accumulate(data, axis=dimension).astype(float)
-            data_cummax[nan_idxs] = np.nan  # fill in the old np.nan values again
-            return data_cummax
+            return _nan_accumulate(data, np.fmax, dimension, out=out)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0):
@@ -3250,12 +3901,44 @@ class Cummax:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the cumulative maxima along (default is 0).
+
+        Returns
+        -------
+        xr.DataArray :
+            An array with the computed cumulative maxima.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        dimension = data.get_axis_num(_xar_dimension(data, dimension))
+        exec_fun = Cummax.exec_dar if da is not None and isinstance(data.data, da.Array) else Cummax.exec_np
+        return data.copy(data=exec_fun(data.data, ignore_nodata=ignore_nodata, dimension=dimension))
+
+    @staticmethod
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Finds cumulative maxima of an array of numbers. Every computed element is equal to the bigger one between
+        current element and the previously computed element. The returned array and the input array have always the
+        same length. By default, no-data values are skipped, but stay in the result.
+        The array is scanned chunk by chunk along `dimension` and the last maxima of a chunk are carried over to the
+        next one.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative maxima along (default is 0).
 
         Returns
         -------
-        xr.DataArray :
+        dask.array.Array :
             An array with the computed cumulative maxima.
 
         """
@@ -3263,18 +3946,10 @@ class Cummax:
             return np.nan
 
         if not ignore_nodata:
-            return np.maximum.accumulate(data, axis=dimension)
+            return da.reductions.cumreduction(np.maximum.accumulate, np.maximum, _extreme_value(data.dtype, False),
+                                              data, axis=dimension, dtype=data.dtype)
         else:
-            data = np.array(data)
-            nan_idxs = np.isnan(data)
-            data[nan_idxs] = np.nanmin(data)
-            data_cummax = np.maximum.accumulate(data, axis=dimension).astype(float)
-            data_cummax[nan_idxs] = np.nan
-            return data_cummax
-
-    @staticmethod
-    def exec_da():
-        pass
+            return _nan_accumulate(data, np.fmax, dimension)
 
 
 ########################################################################################################################
@@ -3307,7 +3982,7 @@ class Cumproduct:
         pass
 
     @staticmethod
-    def exec_np(data, ignore_nodata=True, dimension=0):
+    def exec_np(data, ignore_nodata=True, dimension=0, out=None):
         """
         Computes cumulative products of an array of numbers. Every computed element is equal to the product of current
         and all previous values. The returned array and the input array have always the same length. By default,
@@ -3323,6 +3998,9 @@ class Cumproduct:
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative products along (default is 0).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `data` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3334,10 +4012,12 @@ class Cumproduct:
             return np.nan
 
         if not ignore_nodata:
-            return np.cumprod(data, axis=dimension)
+            return np.cumprod(data, axis=dimension, out=out)
         else:
             nan_idxs = np.isnan(data)
-            data_cumprod = np.nancumprod(data, axis=dimension).astype(float)
+            data_cumprod = np.nancumprod(data, axis=dimension, out=out)
+            if out is None:
+                data_cumprod = data_cumprod.astype(float, copy=False)
             data_cumprod[nan_idxs] = np.nan  # fill in the old np.nan values again
             return data_cumprod
 
@@ -3371,8 +4051,38 @@ class Cumproduct:
         return xar_addons.cumulatives.compound_prod(data, dim=dimension, skipna=~ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes cumulative products of an array of numbers. Every computed element is equal to the product of current
+        and all previous values. The returned array and the input array have always the same length. By default,
+        no-data values are skipped, but stay in the result.
+        The array is scanned chunk by chunk along `dimension` and the last products of a chunk are carried over to the
+        next one.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the cumulative products along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            An array with the computed cumulative products.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.cumprod(data, axis=dimension)
+        else:
+            data_cumprod = da.nancumprod(data, axis=dimension).astype(float)
+            return da.where(da.isnan(data), np.nan, data_cumprod)  # fill in the old np.nan values again
 
 
 ########################################################################################################################
@@ -3405,7 +4115,7 @@ class Cumsum:
         pass
 
     @staticmethod
-    def exec_np(data, ignore_nodata=True, dimension=0):
+    def exec_np(data, ignore_nodata=True, dimension=0, out=None):
         """
         Computes cumulative sums of an array of numbers. Every computed element is equal to the sum of current and all
         previous values. The returned array and the input array have always the same length. By default, no-data values
@@ -3421,6 +4131,9 @@ class Cumsum:
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
         dimension : int, optional
             Defines the dimension to calculate the cumulative sums along (default is 0).
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `data` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3432,10 +4145,12 @@ class Cumsum:
             return np.nan
 
         if not ignore_nodata:
-            return np.cumsum(data, axis=dimension)
+            return np.cumsum(data, axis=dimension, out=out)
         else:
             nan_idxs = np.isnan(data)
-            data_cumsum = np.nancumsum(data, axis=dimension).astype(float)
+            data_cumsum = np.nancumsum(data, axis=dimension, out=out)
+            if out is None:
+                data_cumsum = data_cumsum.astype(float, copy=False)
             data_cumsum[nan_idxs] = np.nan  # fill in the old np.nan values again
             return data_cumsum
 
@@ -3469,8 +4184,38 @@ class Cumsum:
         return xar_addons.cumulatives.compound_sum(data, dim=dimension, skipna=~ignore_nodata)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0):
+        """
+        Computes cumulative sums of an array of numbers. Every computed element is equal to the sum of current
+        and all previous values. The returned array and the input array have always the same length. By default,
+        no-data values are skipped, but stay in the result.
+        The array is scanned chunk by chunk along `dimension` and the last sums of a chunk are carried over to the
+        next one.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the cumulative sums along (default is 0).
+
+        Returns
+        -------
+        dask.array.Array :
+            An array with the computed cumulative sums.
+
+        """
+        if is_empty(data):
+            return np.nan
+
+        if not ignore_nodata:
+            return da.cumsum(data, axis=dimension)
+        else:
+            data_cumsum = da.nancumsum(data, axis=dimension).astype(float)
+            return da.where(da.isnan(data), np.nan, data_cumsum)  # fill in the old np.nan values again
 
 
 ########################################################################################################################
@@ -3513,7 +4258,8 @@ class Sum:
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -3538,6 +4284,10 @@ class Sum:
         if is_empty(data) and len(extra_values) == 0:
             return np.nan
 
+        if np.ma.isMaskedArray(data):  # the integer data type is kept if there are no extra values
+            data_sum = _reduce_masked(data, np.ma.sum, ignore_nodata=ignore_nodata, dimension=dimension)
+            return data_sum + np.sum(extra_values) if len(extra_values) > 0 else data_sum
+
         if not ignore_nodata:
             summand = np.sum(extra_values)
             return np.sum(data, axis=dimension) + summand
@@ -3560,8 +4310,8 @@ class Sum:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the sum along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the sum along (default is 0).
         extra_values: list, optional
             Offers to add additional elements to the computed sum.
 
@@ -3586,11 +4336,43 @@ class Sum:
         else:
             summand = np.nansum(extra_values)
 
-        return data.sum(data, dim=dimension, skipna=~ignore_nodata) + summand
+        return data.sum(dim=_xar_dimension(data, dimension), skipna=ignore_nodata) + summand
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0, extra_values=None):
+        """
+        Sums up all elements in a sequential array of numbers and returns the computed sum. By default no-data values
+        are ignored. Setting `ignore_nodata` to false considers no-data values so that np.nan is returned if any element
+        is such a value. The sum is computed chunk-wise with a tree reduction.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the sum along (default is 0).
+        extra_values: list, optional
+            Offers to add additional elements to the computed sum.
+
+        Returns
+        -------
+        dask.array.Array :
+            The computed sum of the sequence of numbers.
+
+        """
+        extra_values = extra_values if extra_values is not None else []
+        if is_empty(data) and len(extra_values) == 0:
+            return np.nan
+
+        if not ignore_nodata:
+            summand = np.sum(extra_values)
+            return da.sum(data, axis=dimension) + summand
+        else:
+            summand = np.nansum(extra_values)
+            return da.nansum(data, axis=dimension) + summand
 
 
 ########################################################################################################################
@@ -3632,7 +4414,8 @@ class Product:
         Parameters
         ----------
         data : np.array
-            An array of numbers. An empty array resolves always with np.nan.
+            An array of numbers. An empty array resolves always with np.nan. Masked values of a masked array (see
+            `openeo_processes.utils.mask_nodata`) are no-data values.
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
@@ -3658,15 +4441,19 @@ class Product:
         if is_empty(data) and len(extra_values) == 0:
             return np.nan
 
-        if ignore_nodata:
-            data[np.isnan(data)] = 1.
+        if np.ma.isMaskedArray(data):  # the integer data type is kept if there are no extra values
+            data_prod = _reduce_masked(data, np.ma.prod, ignore_nodata=ignore_nodata, dimension=dimension)
+            return data_prod * np.prod(extra_values) if len(extra_values) > 0 else data_prod
 
         if len(extra_values) > 0:
             multiplicand = np.prod(extra_values)
         else:
             multiplicand = 1.
 
-        return np.prod(data, axis=dimension, initial=multiplicand)
+        if ignore_nodata:  # no-data values are treated as 1 without modifying `data`
+            return np.prod(data, axis=dimension, initial=multiplicand, where=~np.isnan(data))
+        else:
+            return np.prod(data, axis=dimension, initial=multiplicand)
 
     @staticmethod
     def exec_xar(data, ignore_nodata=True, dimension=0, extra_values=None):
@@ -3683,8 +4470,8 @@ class Product:
         ignore_nodata : bool, optional
             Indicates whether no-data values are ignored or not. Ignores them by default (=True).
             Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
-        dimension : int, optional
-            Defines the dimension to calculate the product along (default is 0).
+        dimension : int or str, optional
+            Defines the dimension (index or name) to calculate the product along (default is 0).
         extra_values: list, optional
             Offers to add additional elements to the computed sum.
 
@@ -3705,19 +4492,51 @@ class Product:
         if is_empty(data) and len(extra_values) == 0:
             return np.nan
 
-        if ignore_nodata:
-            data[np.isnan(data)] = 1.
-
         if len(extra_values) > 0:
             multiplicand = np.prod(extra_values)
         else:
             multiplicand = 1.
 
-        return data.prod(data, dim=dimension, skipna=~ignore_nodata) * multiplicand
+        return data.prod(dim=_xar_dimension(data, dimension), skipna=ignore_nodata) * multiplicand
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(data, ignore_nodata=True, dimension=0, extra_values=None):
+        """
+        Multiplies all elements in a sequential array of numbers and returns the computed product. By default no-data
+        values are ignored. Setting `ignore_nodata` to False considers no-data values so that np.nan is returned if any
+        element is such a value. The product is computed chunk-wise with a tree reduction.
+
+        Parameters
+        ----------
+        data : dask.array.Array
+            An array of numbers. An empty array resolves always with np.nan.
+        ignore_nodata : bool, optional
+            Indicates whether no-data values are ignored or not. Ignores them by default (=True).
+            Setting this flag to False considers no-data values so that np.nan is returned if any value is such a value.
+        dimension : int, optional
+            Defines the dimension to calculate the product along (default is 0).
+        extra_values: list, optional
+            Offers to add additional elements to the computed product.
+
+        Returns
+        -------
+        dask.array.Array :
+            The computed product of the sequence of numbers.
+
+        """
+        extra_values = extra_values if extra_values is not None else []
+        if is_empty(data) and len(extra_values) == 0:
+            return np.nan
+
+        if len(extra_values) > 0:
+            multiplicand = np.prod(extra_values)
+        else:
+            multiplicand = 1.
+
+        if not ignore_nodata:
+            return da.prod(data, axis=dimension) * multiplicand
+        else:
+            return da.nanprod(data, axis=dimension) * multiplicand
 
 
 ########################################################################################################################
@@ -3768,7 +4587,7 @@ class Add:
         return x + y if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Sums up the two numbers `x` and `y` (`x + y`) and returns the computed sum. No-data values are taken into
         account so that np.nan is returned if any element is such a value. The computations follow IEEE Standard 754.
@@ -3779,6 +4598,9 @@ class Add:
             The first summand.
         y : np.array or int or float
             The second summand.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3786,7 +4608,7 @@ class Add:
             The computed sum.
 
         """
-        return x + y
+        return np.add(x, y, out=out)
 
     @staticmethod
     def exec_xar(x, y):
@@ -3810,8 +4632,8 @@ class Add:
         return x + y
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Add.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -3863,7 +4685,7 @@ class Subtract:
         return x - y if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Subtracts argument `y` from the argument `x` (`x - y`) and returns the computed result. No-data values are
         taken into account so that np.nan is returned if any element is such a value. The computations follow
@@ -3875,6 +4697,9 @@ class Subtract:
             The minuend.
         y : np.array or int or float
             The subtrahend.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3882,7 +4707,7 @@ class Subtract:
             The computed result.
 
         """
-        return x - y
+        return np.subtract(x, y, out=out)
 
     @staticmethod
     def exec_xar(x, y):
@@ -3907,8 +4732,8 @@ class Subtract:
         return x - y
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Subtract.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -3959,7 +4784,7 @@ class Multiply:
         return x * y if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Multiplies the two numbers `x` and `y` (`x * y`) and returns the computed product.
         No-data values are taken into account so that np.nan is returned if any element is such a value.
@@ -3971,6 +4796,9 @@ class Multiply:
             The multiplier.
         y : np.array or int or float
             The multiplicand.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -3978,7 +4806,7 @@ class Multiply:
             The computed product.
 
         """
-        return x * y
+        return np.multiply(x, y, out=out)
 
     @staticmethod
     def exec_xar(x, y):
@@ -4003,8 +4831,8 @@ class Multiply:
         return x * y
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Multiply.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -4055,7 +4883,7 @@ class Divide:
         return x / y if x is not None and y is not None else None
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Divides argument `x` by the argument `y` (`x / y`) and returns the computed result. No-data values are taken
         into account so that None is returned if any element is such a value. The computations follow IEEE Standard 754.
@@ -4067,6 +4895,9 @@ class Divide:
             The dividend.
         y : np.array or int or float
             The divisor.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -4074,7 +4905,7 @@ class Divide:
             The computed result.
 
         """
-        return x / y
+        return np.divide(x, y, out=out)
 
     @staticmethod
     def exec_xar(x, y):
@@ -4099,8 +4930,8 @@ class Divide:
         return x / y
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return Divide.exec_np(x, y)
 
 
 ########################################################################################################################
@@ -4155,7 +4986,7 @@ class NormalizedDifference:
         return (x - y) / (x + y)
 
     @staticmethod
-    def exec_np(x, y):
+    def exec_np(x, y, out=None):
         """
         Computes the normalized difference for two arrays. The normalized difference is computed as
         `(x - y) / (x + y)´.
@@ -4171,6 +5002,9 @@ class NormalizedDifference:
             The array for the first band.
         y : np.ndarray
             The array for the second band.
+        out : np.ndarray, optional
+            Array to store the result in, e.g. `x` to compute the result in place. By default, a new array
+            is allocated.
 
         Returns
         -------
@@ -4178,15 +5012,20 @@ class NormalizedDifference:
            The computed normalized difference.
 
         """
-        return NormalizedDifference.exec_num(x, y)
+        if out is None:
+            return NormalizedDifference.exec_num(x, y)
+
+        x_plus_y = np.add(x, y)  # computed first, since `out` may be `x` or `y`
+        np.subtract(x, y, out=out)
+        return np.divide(out, x_plus_y, out=out)
 
     @staticmethod
-    def exec_xar():
-        pass
+    def exec_xar(x, y):
+        return NormalizedDifference.exec_np(x, y)
 
     @staticmethod
-    def exec_da():
-        pass
+    def exec_dar(x, y):
+        return NormalizedDifference.exec_np(x, y)
 
 if __name__ == '__main__':
     pass
@@ -0,0 +1,333 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from openeo_processes.utils import get_process, has_process
+from openeo_processes.fusion import fuse_process_graph, fuse_reducers
+
+from openeo_processes.errors import GenericError
+from openeo_processes.errors import ProcessNotAvailable
+from openeo_processes.errors import ProcessParameterMissing
+
+
+# Callback parameter names positional arguments of a callback call are bound to, e.g. `condition(x, **context)`.
+_POSITIONAL_PARAMETERS = (("x", "data"), ("y",))
+
+
+class _NodeRef:
+    """ Reference to the result of another node (`from_node`). """
+
+    __slots__ = ("node_id",)
+
+    def __init__(self, node_id):
+        self.node_id = node_id
+
+
+class _ParameterRef:
+    """ Reference to a process (graph) parameter (`from_parameter`). """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Callback:
+    """
+    Callable representation of a child process graph (e.g. a 'condition' or 'process' argument), which is bound to the
+    parameters of the parent process graph.
+
+    """
+
+    __slots__ = ("graph", "parent_parameters")
+
+    def __init__(self, graph, parent_parameters):
+        self.graph = graph
+        self.parent_parameters = parent_parameters
+
+    def __call__(self, *args, **kwargs):
+        """
+        Executes the child process graph.
+        Positional arguments are bound to the callback parameters 'x'/'data' (first argument) and 'y'
+        (second argument). Keyword arguments are passed as named parameters and are additionally available as the
+        'context' parameter, since processes pass on their context by unpacking it.
+
+        """
+        parameters = dict(self.parent_parameters)
+        parameters.update(kwargs)
+        if kwargs and "context" not in kwargs:
+            parameters["context"] = kwargs
+        for value, names in zip(args, _POSITIONAL_PARAMETERS):
+            for name in names:
+                parameters[name] = value
+
+        return self.graph.execute(parameters)
+
+
+class ProcessGraph:
+    """
+    Executable representation of an openEO process graph.
+
+    The process graph is prepared once: its nodes are sorted topologically, the process implementations are looked
+    up in the process registry and child process graphs (callbacks) are compiled recursively. Afterwards, the graph
+    can be executed many times with different parameters, e.g. when being used as a callback. Independent nodes are
+    evaluated concurrently in a thread pool and the result of a node is released as soon as its last consumer has
+    been evaluated. Reducers sharing their input (e.g. 'min', 'max' and 'mean' of the same data) are computed in a
+    single pass over the input (see `openeo_processes.fusion.fuse_reducers`).
+
+    """
+
+    def __init__(self, process_graph, max_workers=None, fuse=False):
+        """
+        Constructor of `ProcessGraph`.
+
+        Parameters
+        ----------
+        process_graph : dict
+            Either an openEO process graph, i.e. a dictionary mapping node ids to nodes, or a process definition
+            containing the key 'process_graph' and optionally 'parameters' with default values.
+        max_workers : int, optional
+            Maximum number of nodes being evaluated at the same time. Defaults to the number of CPUs. Setting it to 1
+            evaluates all nodes sequentially.
+        fuse : bool or str, optional
+            If True, chains of elementwise processes (e.g. band math) are fused into single kernels, which are
+            evaluated tile by tile, so that no full-size intermediate arrays are allocated (see
+            `openeo_processes.fusion`). Setting it to 'numexpr' uses numexpr for evaluating the fused kernels.
+            Defaults to False.
+
+        """
+        self._defaults = {}
+        if isinstance(process_graph.get("process_graph"), dict):
+            for parameter in process_graph.get("parameters", []):
+                if "default" in parameter:
+                    self._defaults[parameter["name"]] = parameter["default"]
+            process_graph = process_graph["process_graph"]
+
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self._fuse = fuse
+        if fuse:
+            process_graph = fuse_process_graph(process_graph, backend="numexpr" if fuse == "numexpr" else "numpy")
+        process_graph = fuse_reducers(process_graph)
+        self._nodes = {node_id: self._compile_node(node) for node_id, node in process_graph.items()}
+        self._result_node = self._find_result_node(process_graph)
+        self._dependencies = {node_id: self._find_dependencies(arguments)
+                              for node_id, (_, arguments) in self._nodes.items()}
+        self._dependents = {node_id: [] for node_id in self._nodes}
+        for node_id, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                self._dependents[dependency].append(node_id)
+        self._order = self._sort_topologically()
+
+        # number of nodes consuming the result of a node
+        self._n_consumers = {node_id: 0 for node_id in self._nodes}
+        for dependencies in self._dependencies.values():
+            for dependency in dependencies:
+                self._n_consumers[dependency] += 1
+
+        self._concurrent = self.max_workers > 1 and self._max_width() > 1
+
+    def __call__(self, *args, **kwargs):
+        return _Callback(self, {})(*args, **kwargs)
+
+    def execute(self, parameters=None):
+        """
+        Executes the process graph.
+
+        Parameters
+        ----------
+        parameters : dict, optional
+            Values of the process graph parameters referenced via 'from_parameter'.
+
+        Returns
+        -------
+        object :
+            Result of the result node.
+
+        Raises
+        ------
+        ProcessParameterMissing :
+            If a referenced parameter has neither been passed nor has a default value.
+
+        """
+        parameters = dict(self._defaults, **(parameters or {}))
+        if self._concurrent:
+            return self._execute_concurrently(parameters)
+        else:
+            return self._execute_sequentially(parameters)
+
+    def _execute_sequentially(self, parameters):
+        results = {}
+        n_consumers = dict(self._n_consumers)
+        for node_id in self._order:
+            results[node_id] = self._evaluate_node(node_id, results, parameters)
+            self._release(node_id, results, n_consumers)
+
+        return results[self._result_node]
+
+    def _execute_concurrently(self, parameters):
+        results = {}
+        n_consumers = dict(self._n_consumers)
+        n_pending = {node_id: len(dependencies) for node_id, dependencies in self._dependencies.items()}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            for node_id in self._order:
+                if n_pending[node_id] == 0:
+                    running[executor.submit(self._evaluate_node, node_id, results, parameters)] = node_id
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    results[node_id] = future.result()
+                    self._release(node_id, results, n_consumers)
+                    for dependent in self._dependents[node_id]:
+                        n_pending[dependent] -= 1
+                        if n_pending[dependent] == 0:
+                            running[executor.submit(self._evaluate_node, dependent, results, parameters)] = dependent
+
+        return results[self._result_node]
+
+    def _evaluate_node(self, node_id, results, parameters):
+        fun, arguments = self._nodes[node_id]
+        return fun(**self._resolve(arguments, results, parameters))
+
+    def _release(self, node_id, results, n_consumers):
+        """ Frees the results of all dependencies of `node_id`, which are not consumed by any other node anymore. """
+        for dependency in self._dependencies[node_id]:
+            n_consumers[dependency] -= 1
+            if n_consumers[dependency] == 0 and dependency != self._result_node:
+                del results[dependency]
+
+    def _resolve(self, value, results, parameters):
+        """ Replaces all node and parameter references in `value` with their actual values. """
+        if isinstance(value, _NodeRef):
+            return results[value.node_id]
+        elif isinstance(value, _ParameterRef):
+            try:
+                return parameters[value.name]
+            except KeyError:
+                raise ProcessParameterMissing(value.name)
+        elif isinstance(value, ProcessGraph):
+            return _Callback(value, parameters)
+        elif isinstance(value, dict):
+            return {k: self._resolve(v, results, parameters) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self._resolve(v, results, parameters) for v in value]
+        else:
+            return value
+
+    def _compile_node(self, node):
+        fun = node.get("process") or self._get_process(node["process_id"])
+        return fun, self._compile_argument(node.get("arguments", {}))
+
+    def _compile_argument(self, value):
+        """ Converts references and child process graphs in an argument to their internal representations. """
+        if isinstance(value, dict):
+            if "from_node" in value:
+                return _NodeRef(value["from_node"])
+            elif "from_parameter" in value:
+                return _ParameterRef(value["from_parameter"])
+            elif "process_graph" in value:
+                return ProcessGraph(value["process_graph"], max_workers=1, fuse=self._fuse)
+            else:
+                return {k: self._compile_argument(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self._compile_argument(v) for v in value]
+        else:
+            return value
+
+    @staticmethod
+    def _get_process(process_id):
+        """ Looks up the implementation of a process, first in the process registry, then in the package itself. """
+        if has_process(process_id):
+            return get_process(process_id)
+
+        import openeo_processes  # processes without data type dispatching, e.g. `e`, `pi` or the text processes
+        fun = getattr(openeo_processes, process_id, None)
+        if callable(fun) and getattr(fun, "__module__", "").startswith("openeo_processes."):
+            return fun
+
+        raise ProcessNotAvailable(process_id)
+
+    def _find_dependencies(self, value):
+        """ Collects the ids of all nodes referenced in `value`. """
+        if isinstance(value, _NodeRef):
+            if value.node_id not in self._nodes:
+                raise GenericError("The process graph has no node '{}'.".format(value.node_id))
+            return {value.node_id}
+        elif isinstance(value, dict):
+            values = value.values()
+        elif isinstance(value, list):
+            values = value
+        else:
+            return set()
+
+        dependencies = set()
+        for v in values:
+            dependencies |= self._find_dependencies(v)
+        return dependencies
+
+    @staticmethod
+    def _find_result_node(process_graph):
+        result_nodes = [node_id for node_id, node in process_graph.items() if node.get("result", False)]
+        if len(result_nodes) != 1:
+            raise GenericError("A process graph requires exactly one result node, but {} are given."
+                               .format(len(result_nodes)))
+        return result_nodes[0]
+
+    def _sort_topologically(self):
+        """ Sorts the nodes topologically with Kahn's algorithm, keeping the definition order for independent nodes. """
+        n_pending = {node_id: len(dependencies) for node_id, dependencies in self._dependencies.items()}
+        ready = deque(node_id for node_id in self._nodes if n_pending[node_id] == 0)
+        order = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for dependent in self._dependents[node_id]:
+                n_pending[dependent] -= 1
+                if n_pending[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self._nodes):
+            raise GenericError("The process graph contains a cycle.")
+
+        return order
+
+    def _max_width(self):
+        """ Computes the maximum number of nodes on the same dependency level of the graph. """
+        levels = {}
+        for node_id in self._order:
+            levels[node_id] = max((levels[d] + 1 for d in self._dependencies[node_id]), default=0)
+
+        widths = {}
+        for level in levels.values():
+            widths[level] = widths.get(level, 0) + 1
+        return max(widths.values(), default=0)
+
+
+def execute_process_graph(process_graph, parameters=None, max_workers=None, fuse=False):
+    """
+    Executes an openEO process graph.
+    If the same process graph is executed several times, it is more efficient to create a `ProcessGraph` once and
+    call its `execute` method.
+
+    Parameters
+    ----------
+    process_graph : dict
+        Either an openEO process graph, i.e. a dictionary mapping node ids to nodes, or a process definition
+        containing the key 'process_graph' and optionally 'parameters' with default values.
+    parameters : dict, optional
+        Values of the process graph parameters referenced via 'from_parameter'.
+    max_workers : int, optional
+        Maximum number of nodes being evaluated at the same time. Defaults to the number of CPUs.
+    fuse : bool or str, optional
+        If True, chains of elementwise processes are fused into single kernels. Setting it to 'numexpr' uses numexpr
+        for evaluating them. Defaults to False.
+
+    Returns
+    -------
+    object :
+        Result of the result node.
+
+    """
+    return ProcessGraph(process_graph, max_workers=max_workers, fuse=fuse).execute(parameters)
@@ -0,0 +1,245 @@
+import os
+import pickle
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# Number of array elements per tile processed by a worker, i.e. 8 MB per float64 tile.
+TILE_SIZE = 2 ** 20
+
+
+def map_tiles(fun, data, dimension=0, out_axis=None, max_workers=None, tile_size=None):
+    """
+    Applies a function reducing or transforming an array along `dimension` to tiles of the array on a thread pool.
+    The tiles keep the complete series along `dimension` and split the largest of the other axes, so that every tile
+    can be processed independently. Most NumPy kernels (sorting, partitioning, arithmetic) release the GIL, so that
+    the tiles are processed in parallel.
+
+    Parameters
+    ----------
+    fun : callable
+        Function called with a tile of `data` (as only positional argument). It must not depend on the values along the
+        split axis, i.e. it may only operate along `dimension`.
+    data : np.array or list
+        Array to split into tiles.
+    dimension : int, optional
+        Dimension which is kept entirely in every tile (default is 0).
+    out_axis : callable, optional
+        Function mapping the split axis of `data` to the corresponding axis in the results of `fun`, along which the
+        results of the tiles are concatenated. By default, the results are assumed to have the same dimensions as
+        `data`.
+    max_workers : int, optional
+        Maximum number of threads. Defaults to the number of CPUs. If it is 1, `fun` is applied to `data` at once.
+    tile_size : int, optional
+        Number of elements per tile. Defaults to `TILE_SIZE`.
+
+    Returns
+    -------
+    np.array :
+        Result of `fun` for the whole array.
+
+    """
+    data = np.asarray(data)
+    max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    tile_size = tile_size or TILE_SIZE
+    if max_workers <= 1 or data.ndim < 2 or data.size <= tile_size:
+        return fun(data)
+
+    dimension = dimension % data.ndim
+    axes = [axis for axis in range(data.ndim) if axis != dimension]
+    axis = max(axes, key=lambda a: data.shape[a])
+    n_tiles = min(-(-data.size // tile_size), data.shape[axis])
+    if n_tiles <= 1:
+        return fun(data)
+
+    step = -(-data.shape[axis] // n_tiles)
+    index = [slice(None)] * data.ndim
+    tiles = []
+    for start in range(0, data.shape[axis], step):
+        index[axis] = slice(start, start + step)
+        tiles.append(data[tuple(index)])
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tiles))) as executor:
+        results = list(executor.map(fun, tiles))
+
+    return np.concatenate(results, axis=out_axis(axis) if out_axis is not None else axis)
+
+
+########################################################################################################################
+# Process Pool Execution
+########################################################################################################################
+
+class _SharedArray:
+    """
+    NumPy array placed in a `multiprocessing.shared_memory` block, which can be attached by other processes by its
+    name without pickling the data.
+
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        """
+        Constructor of `_SharedArray`.
+
+        Parameters
+        ----------
+        shape : tuple
+            Shape of the array.
+        dtype : np.dtype
+            Data type of the array.
+        name : str, optional
+            Name of an existing shared memory block to attach. If None, a new block is created and owned by this
+            instance, i.e. it is removed by `close`.
+
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self._owner = name is None
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self._memory = shared_memory.SharedMemory(name=name, create=self._owner, size=size if self._owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._memory.buf)
+
+    @property
+    def spec(self):
+        """ tuple : Name, shape and data type needed to attach the array in another process. """
+        return self._memory.name, self.shape, self.dtype.str
+
+    def close(self):
+        """ Releases the array and removes the shared memory block if it is owned by this instance. """
+        self.array = None
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# Function and shared arrays of a worker process, which are set by `_init_worker`.
+_worker_state = {}
+
+
+def _init_worker(fun, input_spec, output_spec):
+    _worker_state["fun"] = fun
+    _worker_state["input"] = _SharedArray(input_spec[1], input_spec[2], name=input_spec[0])
+    _worker_state["output"] = _SharedArray(output_spec[1], output_spec[2], name=output_spec[0])
+
+
+def _evaluate_tile(start, stop):
+    """
+    Evaluates the function of the worker on the elements `start:stop` and writes them into the shared output.
+
+    Returns
+    -------
+    str or None :
+        None if the results were written, otherwise the data type of the results, which cannot be safely cast to the
+        data type of the output (object if the results do not have one value per element).
+
+    """
+    values = _worker_state["input"].array.reshape(-1)[start:stop]
+    output = _worker_state["output"].array.reshape(-1)[start:stop]
+    result = np.asarray(_worker_state["fun"](values))
+    if result.shape != output.shape or result.dtype.hasobject:
+        return np.dtype(object).str
+    if not np.can_cast(result.dtype, output.dtype, casting="safe"):
+        return result.dtype.str
+    output[...] = result
+    return None
+
+
+def _get_context(fun):
+    """
+    Returns the multiprocessing context used to start the worker processes or None if `fun` has to be applied in the
+    calling process. Forking is only safe as long as no other threads are running (e.g. the threads of a
+    `ProcessGraph`), otherwise the processes are started by a fork server (or spawned if there is none), which
+    requires `fun` to be picklable.
+
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    try:
+        pickle.dumps(fun)
+    except Exception:
+        return None
+    if "forkserver" not in methods:
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["openeo_processes"])  # imported once by the fork server, not by every worker
+    return context
+
+
+def map_elements(fun, data, max_workers=None, tile_size=None):
+    """
+    Applies an elementwise function to an array on a pool of processes, e.g. for callbacks which are evaluated element
+    by element and thus hold the GIL. The array is copied into shared memory once, the processes evaluate the function
+    on disjoint tiles of it and write the results into a shared output array, so that no arrays are pickled.
+
+    The function is first evaluated on the first tile in the calling process to determine the data type of the
+    results. Tiles whose results have a wider data type are evaluated again after the output array has been promoted
+    to it. If the results do not have one value per element or object arrays are involved, which cannot be placed in
+    shared memory, the function is applied to the whole array in the calling process instead.
+
+    Parameters
+    ----------
+    fun : callable
+        Function called with a flat tile of `data` (as only positional argument), returning an array with one value
+        per element. The processes are forked if no other threads are running, otherwise they are started by a
+        fork server, which requires `fun` to be picklable (e.g. a module-level function, but not a lambda).
+        Functions, which are not picklable, are then applied to `data` at once in the calling process.
+    data : np.array or list
+        Array to process.
+    max_workers : int, optional
+        Maximum number of processes. Defaults to the number of CPUs. If it is 1, `fun` is applied to `data` at once.
+    tile_size : int, optional
+        Number of elements per tile. Defaults to `TILE_SIZE`.
+
+    Returns
+    -------
+    np.array :
+        Result of `fun` for the whole array with the shape of `data`.
+
+    """
+    data = np.asarray(data)
+    max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+    tile_size = tile_size or TILE_SIZE
+    if max_workers <= 1 or data.size <= tile_size or data.dtype.hasobject:
+        return fun(data)
+
+    context = _get_context(fun)
+    if context is None:
+        return fun(data)
+
+    first = np.asarray(fun(data.reshape(-1)[:tile_size]))
+    if first.shape != (tile_size,) or first.dtype.hasobject:
+        return fun(data)
+
+    with _SharedArray(data.shape, data.dtype) as shared_input:
+        shared_input.array[...] = data
+        shared_output = _SharedArray(data.shape, first.dtype)
+        try:
+            shared_output.array.reshape(-1)[:tile_size] = first
+            starts = list(range(tile_size, data.size, tile_size))
+            while starts:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(starts)), mp_context=context,
+                                         initializer=_init_worker,
+                                         initargs=(fun, shared_input.spec, shared_output.spec)) as executor:
+                    dtypes = list(executor.map(_evaluate_tile, starts, [start + tile_size for start in starts]))
+                dtypes = {start: np.dtype(dtype) for start, dtype in zip(starts, dtypes) if dtype is not None}
+                if any(dtype.hasobject for dtype in dtypes.values()):
+                    return fun(data)
+                if dtypes:  # promotes the output and evaluates the tiles with wider results again
+                    promoted = _SharedArray(data.shape, np.result_type(shared_output.dtype, *dtypes.values()))
+                    promoted.array[...] = shared_output.array
+                    shared_output.close()
+                    shared_output = promoted
+                starts = list(dtypes)
+            return shared_output.array.copy()
+        finally:
+            shared_output.close()
@@ -1,21 +1,27 @@
+import builtins
 import functools
+import inspect
 import re
+import threading
 from datetime import timezone, timedelta, datetime
 from typing import Callable
 
 import numpy as np
 
+from openeo_processes.errors import DataTypeNotSupported
+
 
 def eval_datatype(data):
     """
     Returns a data type tag depending on the data type of `data`.
     This can be:
-        - "numpy": `nump.ndarray`
+        - "numpy": `nump.ndarray`, `LabelIndex`, `openeo_processes.bitmask.Bitmask`
         - "xarray": `xarray.DataArray`
         - "dask": `dask.array.core.Array`
         - "int", "float", "dict", "list", "set", "tuple", "NoneType": Python builtins
         - "datetime": `datetime.datetime`
         - "function": callable object
+        - "expression": `openeo_processes.lazy.Expression`
 
     Parameters
     ----------
@@ -30,7 +36,13 @@ def eval_datatype(data):
     """
     package = type(data).__module__
     package_root = package.split(".", 1)[0]
-    if package in ("builtins", "datetime"):
+    if isinstance(data, LabelIndex):  # label indices are handled like the NumPy arrays of labels they wrap
+        return "numpy"
+    elif package == "openeo_processes.bitmask":  # packed logical arrays are handled by the NumPy implementations
+        return "numpy"
+    elif package == "openeo_processes.lazy":
+        return "expression"
+    elif package in ("builtins", "datetime"):
         return type(data).__name__
     elif package_root in ("numpy", "xarray", "dask"):
         return package_root
@@ -42,10 +54,34 @@ def eval_datatype(data):
 _processes = {}
 
 
+class _LazyState(threading.local):
+    """ Per-thread flag indicating whether processes return lazy expressions instead of results. """
+    enabled = False
+
+
+_lazy_state = _LazyState()
+
+
+def _has_expression(args, kwargs):
+    """ Checks if any (keyword) argument of a process call is a lazy expression. """
+    return any(eval_datatype(a) == "expression" for a in args) or \
+        any(eval_datatype(v) == "expression" for v in kwargs.values())
+
+
+def _create_expression(process_id, processor, args, kwargs):
+    """ Creates a lazy expression representing a process call (see `openeo_processes.lazy`). """
+    from openeo_processes.lazy import Expression
+    return Expression.from_call(process_id, processor, args, kwargs)
+
+
 def process(processor):
     """
     This function serves as a decorator for empty openEO process definitions, which call a class `processor` defining
     the process implementations for different data types.
+    The implementation chosen for a specific combination of argument types is cached, so that repeated calls with the
+    same type signature skip the data type evaluation.
+    In lazy mode (see `openeo_processes.lazy`) or if any argument is a lazy expression, the process is not executed,
+    but an expression representing the process call is returned.
 
     Parameters
     ----------
@@ -58,36 +94,104 @@ def process(processor):
         Process/function wrapper returning the result of the process.
 
     """
+    # maps the types of the input (keyword) arguments to the resolved process implementation and a flag indicating
+    # whether lists need to be converted to NumPy arrays
+    dispatch_cache = {}
+    processor_instance = None
+
     @functools.wraps(processor)
     def fun_wrapper(*args, **kwargs):
-        cls = processor()
-
-        # Convert lists to numpy arrays
-        args = tuple(list2nparray(a) if isinstance(a, list) else a for a in args)
-        kwargs = {k: (list2nparray(v) if isinstance(v, list) else v) for k, v in kwargs.items()}
-
-        # retrieve data types of input (keyword) arguments
-        datatypes = set(eval_datatype(a) for a in args)
-        datatypes.update(eval_datatype(v) for v in kwargs.values())
-        if "numpy" in datatypes:
-            cls_fun = getattr(cls, "exec_np")
-        elif "xarray" in datatypes:
-            cls_fun = getattr(cls, "exec_xar")
-        elif "dask" in datatypes:
-            cls_fun = getattr(cls, "exec_dar")
-        elif datatypes.issubset({"int", "float", "NoneType", "str", "bool", "datetime"}):
-            cls_fun = getattr(cls, "exec_num")
-        else:
-            raise Exception('Datatype unknown.')
+        nonlocal processor_instance
+        if _lazy_state.enabled:
+            return _create_expression(process_id, processor, args, kwargs)
+
+        signature = tuple(map(type, args))
+        if kwargs:
+            signature += tuple((k, type(v)) for k, v in kwargs.items())
+
+        try:
+            cls_fun, has_lists = dispatch_cache[signature]
+        except KeyError:
+            if _has_expression(args, kwargs):  # lazy expressions are passed on, so the result is lazy as well
+                return _create_expression(process_id, processor, args, kwargs)
+            cls_fun = None
+            has_lists = any(isinstance(a, list) for a in args) or any(isinstance(v, list) for v in kwargs.values())
+
+        if has_lists:
+            # Convert lists to numpy arrays
+            args = tuple(list2nparray(a) if isinstance(a, list) else a for a in args)
+            kwargs = {k: (list2nparray(v) if isinstance(v, list) else v) for k, v in kwargs.items()}
+
+        if cls_fun is None:
+            if processor_instance is None:
+                processor_instance = processor()
+            cls_fun = resolve_process_fun(processor_instance, args, kwargs)
+            dispatch_cache[signature] = (cls_fun, has_lists)
 
         return cls_fun(*args, **kwargs)
 
+    fun_wrapper._dispatch_cache = dispatch_cache
     process_id = processor.__name__.rstrip('_')
     _processes[process_id] = fun_wrapper
 
     return fun_wrapper
 
 
+def resolve_process_fun(cls, args, kwargs):
+    """
+    Selects the process implementation of `cls` matching the data types of the given (keyword) arguments.
+    If arguments of different data types are given, the implementation is chosen according to the order
+    dask > xarray > numpy > scalars (`exec_dar`, `exec_xar`, `exec_np`, `exec_num`). Processes, which do not implement
+    `exec_dar` or `exec_xar` yet (i.e. only define a stub without parameters), raise `DataTypeNotSupported` instead
+    of computing the data with `exec_np`.
+
+    Parameters
+    ----------
+    cls : object
+        Class instance implementing an openEO process containing the methods `exec_num`, `exec_np`, `exec_xar`,
+        or `exec_dar`.
+    args : tuple
+        Positional arguments of the process call.
+    kwargs : dict
+        Keyword arguments of the process call.
+
+    Returns
+    -------
+    callable :
+        Bound method of `cls` implementing the process for the given data types.
+
+    Raises
+    ------
+    DataTypeNotSupported :
+        If `cls` has no implementation for the dask arrays or xarray data arrays among the arguments.
+
+    """
+    # retrieve data types of input (keyword) arguments
+    datatypes = set(eval_datatype(a) for a in args)
+    datatypes.update(eval_datatype(v) for v in kwargs.values())
+    # lazy data types take precedence, so that dask arrays are never computed by the NumPy implementation
+    if "dask" in datatypes:
+        cls_fun = getattr(cls, "exec_dar")
+    elif "xarray" in datatypes:
+        cls_fun = getattr(cls, "exec_xar")
+    elif "numpy" in datatypes:
+        cls_fun = getattr(cls, "exec_np")
+    elif datatypes.issubset({"int", "float", "NoneType", "str", "bool", "datetime"}):
+        cls_fun = getattr(cls, "exec_num")
+    else:
+        raise Exception('Datatype unknown.')
+
+    if cls_fun.__name__ in ("exec_dar", "exec_xar") and _is_stub(cls_fun):  # lazy data must not be computed
+        raise DataTypeNotSupported(type(cls).__name__, "dask" if cls_fun.__name__ == "exec_dar" else "xarray")
+
+    return cls_fun
+
+
+def _is_stub(fun):
+    """ Checks if a process implementation is a placeholder without any parameters. """
+    return not inspect.signature(fun).parameters
+
+
 def has_process(process_id: str) -> bool:
     """
     Check if the given process is defined
@@ -172,10 +276,55 @@ def create_slices(index, axis=0, n_axes=1):
     return tuple(slices)
 
 
+def mask_nodata(data, nodata=None):
+    """
+    Wraps an array in a NumPy masked array, whose mask marks the no-data values. This allows to process integer
+    arrays (e.g. uint16 bands of optical sensors) without promoting them to float for storing np.nan: the NumPy
+    implementations of the reducers, comparisons and `first`, `last`, `sort` and `order` treat masked values as
+    no-data values and keep the data type of the values if possible. The data is not copied.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        An array of numbers.
+    nodata : int or float, optional
+        No-data value (sentinel) of the array. np.nan values of floating point arrays are always masked.
+
+    Returns
+    -------
+    np.ma.MaskedArray :
+        Masked array sharing the data of `data`. The no-data value is used as fill value, i.e. `filled()` restores
+        the sentinel values.
+
+    """
+    data = np.asanyarray(data)
+    mask = np.ma.getmaskarray(data)
+    if nodata is not None:
+        mask = mask | (np.ma.getdata(data) == nodata)
+    if data.dtype.kind in "fc":
+        mask = mask | np.isnan(np.ma.getdata(data))
+    return np.ma.MaskedArray(np.ma.getdata(data), mask=mask, fill_value=nodata, copy=False)
+
+
+# Pattern matching a time with 24 as hour value.
+_HOUR_24_PATTERN = re.compile(r"24:\d{2}:\d{2}")
+
+# Datetime formats following the RFC3339 convention, which are tried one after another by `str2time`.
+RFC3339_TIME_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%S.%f",
+                        "%Y-%m-%dT%H:%M:%Sz", "%Y-%m-%dt%H:%M:%SZ", "%Y-%m-%dt%H:%M:%Sz", "%Y-%m-%dT%H:%M:%S%z",
+                        "%Y-%m-%dt%H:%M:%S%z", "%H:%M:%SZ", "%H:%M:%S%z"]
+
+# Maximum number of parsed time strings kept by `str2time`.
+STR2TIME_CACHE_SIZE = 2**16
+
+
+@functools.lru_cache(maxsize=STR2TIME_CACHE_SIZE)
 def str2time(string, allow_24h=False):
     """
     Converts time strings in various formats to a datetime object.
     The datetime formats follow the RFC3339 convention.
+    Parsed strings are cached, since the same time stamps are usually parsed over and over again, e.g. when comparing
+    labels.
 
     Parameters
     ----------
@@ -212,8 +361,7 @@ def str2time(string, allow_24h=False):
             string = "-".join(string_parts)
 
     # searches for 24 in hour value
-    pattern = re.compile("24:\d{2}:\d{2}")
-    pattern_match = re.search(pattern, string)
+    pattern_match = _HOUR_24_PATTERN.search(string)
     if pattern_match:
         if allow_24h:  # if the user allows 24 as an hour value, replace 24 by 23 and add a timedelta of one hour later
             old_sub_string = pattern_match.group()
@@ -224,25 +372,241 @@ def str2time(string, allow_24h=False):
                       "Set 'allow_24h' to 'True' if you want to translate 24 as a an hour."
             raise ValueError(err_msg)
 
-    rfc3339_time_formats = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%S.%f",
-                            "%Y-%m-%dT%H:%M:%Sz", "%Y-%m-%dt%H:%M:%SZ", "%Y-%m-%dt%H:%M:%Sz", "%Y-%m-%dT%H:%M:%S%z",
-                            "%Y-%m-%dt%H:%M:%S%z", "%H:%M:%SZ", "%H:%M:%S%z"]
     date_time = None
     # loops through each format and takes the one for which the translation succeeded first
-    for i, used_time_format in enumerate(rfc3339_time_formats):
+    for used_time_format in RFC3339_TIME_FORMATS:
         try:
             date_time = datetime.strptime(string, used_time_format)
             if date_time.tzinfo is None:
                 date_time = date_time.replace(tzinfo=timezone.utc)
             break
-        except:
+        except ValueError:
             continue
 
-    # add a timedelta of one hour if 24 is allowed as an hour value
-    if date_time and allow_24h:
+    # add a timedelta of one hour if 24 has been replaced as an hour value
+    if date_time and pattern_match:
         date_time += timedelta(hours=1)
 
     return date_time
 
+
+def str2datetime64(strings, allow_24h=False):
+    """
+    Converts an array of time strings in various formats to an array of UTC time stamps in one pass.
+    The datetime formats follow the RFC3339 convention (see `str2time`).
+    Dates ('2018-01-01') and date-times in UTC ('2018-01-01T12:00:00Z', optionally with fractional seconds) are
+    parsed directly by NumPy. All other strings, e.g. with time offsets, are parsed once per unique string with
+    `str2time`.
+
+    Parameters
+    ----------
+    strings : str or list or np.ndarray
+        String representation(s) of times or dates.
+    allow_24h : bool, optional
+        If True, `strings` are allowed to contain '24' as hour value.
+
+    Returns
+    -------
+    np.ndarray :
+        Array of `datetime64[ns]` time stamps with the same shape as `strings`. Strings, which are no valid time
+        strings, are converted to NaT.
+
+    """
+    strings = np.asarray(strings, dtype=str)
+    flat_strings = np.char.upper(strings.ravel())
+    time_stamps = np.full(flat_strings.shape, np.datetime64("NaT"), dtype="datetime64[ns]")
+    if flat_strings.size == 0:
+        return time_stamps.reshape(strings.shape)
+
+    # check the fixed layout 'YYYY-MM-DD' or 'YYYY-MM-DDTHH:MM:SS[.f]Z' character by character
+    n_chars = max(flat_strings.dtype.itemsize // 4, 20)
+    chars = flat_strings.astype("U{}".format(n_chars)).view("U1").reshape(-1, n_chars)
+    lengths = np.char.str_len(flat_strings)
+    is_date = (chars[:, 4] == "-") & (chars[:, 7] == "-")
+    is_utc = is_date & (chars[:, 10] == "T") & (chars[:, 13] == ":") & (chars[:, 16] == ":") & \
+        ((lengths == 20) | (chars[:, 19] == ".")) & (chars[np.arange(len(chars)), lengths - 1] == "Z") & \
+        ~((chars[:, 11] == "2") & (chars[:, 12] == "4"))
+    is_fixed = (is_date & (lengths == 10)) | is_utc
+    try:
+        time_stamps[is_fixed] = np.char.rstrip(flat_strings[is_fixed], "Z").astype("datetime64[ns]")
+    except ValueError:  # e.g. invalid months or days are parsed by `str2time`, too
+        is_fixed[:] = False
+
+    unique_strings, inverse = np.unique(strings.ravel()[~is_fixed], return_inverse=True)
+    unique_time_stamps = np.full(unique_strings.shape, np.datetime64("NaT"), dtype="datetime64[ns]")
+    for i, string in enumerate(unique_strings):
+        date_time = str2time(str(string), allow_24h=allow_24h)
+        if date_time is not None:
+            unique_time_stamps[i] = np.datetime64(date_time.astimezone(timezone.utc).replace(tzinfo=None), "ns")
+    time_stamps[~is_fixed] = unique_time_stamps[inverse.ravel()]
+
+    return time_stamps.reshape(strings.shape)
+
+
+class LabelIndex:
+    """
+    Index of the labels of a dimension, e.g. time stamps or band names, for fast label lookups and interval selections.
+
+    The labels are sorted once, so that looking up a label or the labels within an interval is a binary search
+    (`np.searchsorted`) instead of a linear scan. Temporal labels (temporal strings, datetime objects or `datetime64`
+    values) are compared based on their UTC time stamps. If the labels are sorted already, selecting an interval
+    results in a slice, i.e. the selected data is a view instead of a copy.
+    Processes accept a `LabelIndex` wherever they accept an array of labels.
+
+    """
+
+    def __init__(self, labels):
+        """
+        Constructor of `LabelIndex`.
+
+        Parameters
+        ----------
+        labels : list or np.ndarray
+            One-dimensional array of labels.
+
+        """
+        self.labels = np.asarray(labels)
+        self._keys, self.is_temporal = self._to_keys(self.labels)
+        self._order = np.argsort(self._keys, kind="stable")
+        self._sorted_keys = self._keys[self._order]
+        self.is_sorted = bool((self._order == np.arange(len(self._order))).all())
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.labels if dtype is None else self.labels.astype(dtype)
+
+    @staticmethod
+    def _to_keys(labels):
+        """ Converts labels to sortable keys, i.e. temporal labels to `datetime64[ns]` time stamps. """
+        if labels.dtype.kind == "M":
+            return labels.astype("datetime64[ns]"), True
+        elif labels.dtype == object and len(labels) and all(isinstance(label, datetime) for label in labels):
+            return np.array([LabelIndex._to_time_stamp(label) for label in labels], dtype="datetime64[ns]"), True
+        elif labels.dtype.kind in "US" and len(labels):
+            time_stamps = str2datetime64(labels)
+            if not np.isnat(time_stamps).any():
+                return time_stamps, True
+        return labels, False
+
+    @staticmethod
+    def _to_time_stamp(label):
+        """ Converts a temporal label to a `datetime64[ns]` UTC time stamp. """
+        if isinstance(label, str):
+            return str2datetime64(label)[()]
+        elif isinstance(label, datetime) and label.tzinfo is not None:
+            label = label.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(label, "ns")
+
+    def _key(self, label):
+        return self._to_time_stamp(label) if self.is_temporal else label
+
+    def index(self, label):
+        """
+        Returns the index of a label.
+
+        Parameters
+        ----------
+        label : object
+            Label to find.
+
+        Returns
+        -------
+        int :
+            Zero-based index of the first occurrence of `label`.
+
+        Raises
+        ------
+        KeyError :
+            If `label` is not contained in the labels.
+
+        """
+        key = self._key(label)
+        position = np.searchsorted(self._sorted_keys, key)
+        if position == len(self._sorted_keys) or self._sorted_keys[position] != key:
+            raise KeyError(label)
+        return int(self._order[position])
+
+    def interval(self, min=None, max=None, exclude_max=False):
+        """
+        Determines the indices of all labels within the interval [`min`, `max`].
+
+        Parameters
+        ----------
+        min : object, optional
+            Lower boundary (inclusive). Defaults to no lower boundary.
+        max : object, optional
+            Upper boundary (inclusive). Defaults to no upper boundary.
+        exclude_max : bool, optional
+            Exclude the upper boundary `max` if set to True. Defaults to False.
+
+        Returns
+        -------
+        slice or np.ndarray :
+            A slice if the labels are sorted, otherwise an ascending array of indices.
+
+        """
+        start = 0 if min is None else int(np.searchsorted(self._sorted_keys, self._key(min), side="left"))
+        if max is None:
+            stop = len(self._sorted_keys)
+        else:
+            stop = int(np.searchsorted(self._sorted_keys, self._key(max), side="left" if exclude_max else "right"))
+        stop = builtins.max(start, stop)
+
+        if self.is_sorted:
+            return slice(start, stop)
+        return np.sort(self._order[start:stop])
+
+    def mask(self, min=None, max=None, exclude_max=False):
+        """
+        Creates a boolean mask, which is True for all labels within the interval [`min`, `max`].
+
+        Parameters
+        ----------
+        min : object, optional
+            Lower boundary (inclusive). Defaults to no lower boundary.
+        max : object, optional
+            Upper boundary (inclusive). Defaults to no upper boundary.
+        exclude_max : bool, optional
+            Exclude the upper boundary `max` if set to True. Defaults to False.
+
+        Returns
+        -------
+        np.ndarray :
+            Boolean mask with the same length as the labels.
+
+        """
+        mask = np.zeros(len(self.labels), dtype=bool)
+        mask[self.interval(min, max, exclude_max=exclude_max)] = True
+        return mask
+
+    def select(self, data, min=None, max=None, dimension=0, exclude_max=False):
+        """
+        Selects the elements of `data` along `dimension`, whose labels are within the interval [`min`, `max`].
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Array with the labelled dimension `dimension`.
+        min : object, optional
+            Lower boundary (inclusive). Defaults to no lower boundary.
+        max : object, optional
+            Upper boundary (inclusive). Defaults to no upper boundary.
+        dimension : int, optional
+            Defines the labelled dimension (default is 0).
+        exclude_max : bool, optional
+            Exclude the upper boundary `max` if set to True. Defaults to False.
+
+        Returns
+        -------
+        np.ndarray :
+            The selected elements of `data`, which are a view of `data` if the labels are sorted.
+
+        """
+        idx = create_slices(self.interval(min, max, exclude_max=exclude_max), axis=dimension, n_axes=data.ndim)
+        return data[idx]
+
+
 if __name__ == '__main__':
     pass
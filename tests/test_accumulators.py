@@ -0,0 +1,132 @@
+import unittest
+import numpy as np
+import dask.array as da
+
+from openeo_processes.accumulators import Moments, QuantileSketch, Statistics, compute_moments, \
+    compute_quantile_sketch, compute_statistics
+
+
+class MomentsTester(unittest.TestCase):
+    """ Tests the mergeable moments state. """
+
+    def setUp(self):
+        """ Sets up a data cube with no-data values and a pixel without any valid value. """
+        self.data = np.random.RandomState(42).rand(9, 3, 4) * 100.
+        self.data[2, 1, 1] = np.nan
+        self.data[:, 0, 0] = np.nan
+
+    def test_merge(self):
+        """ Tests merging the states of parts of the data. """
+        expected = np.nanvar(self.data, axis=0, ddof=1)
+        state = Moments.from_data(self.data[:4]).merge(Moments.from_data(self.data[4:]))
+        assert np.allclose(state.variance(), expected, equal_nan=True)
+
+        state = Moments.from_data(self.data[:1])
+        for i in range(1, 9):
+            state.append(self.data[i:i+1])
+        assert np.allclose(state.variance(), expected, equal_nan=True)
+        assert np.allclose(state.sd(), np.sqrt(expected), equal_nan=True)
+        assert state.count[0, 0] == 0
+        assert state.count[1, 1] == 8
+
+    def test_nodata(self):
+        """ Tests that no-data values are propagated if they should not be ignored. """
+        state = Moments.from_data(self.data[:4], ignore_nodata=False).merge(
+            Moments.from_data(self.data[4:], ignore_nodata=False))
+        assert np.allclose(state.variance(), np.var(self.data, axis=0, ddof=1), equal_nan=True)
+
+    def test_compute_moments(self):
+        """ Tests computing the state with NumPy and dask arrays along different dimensions. """
+        for dimension in [0, 1, 2]:
+            expected = np.nanvar(self.data, axis=dimension, ddof=1)
+            assert np.allclose(compute_moments(self.data, dimension=dimension).variance(), expected, equal_nan=True)
+            dask_data = da.from_array(self.data, chunks=(2, 2, 3))
+            result = compute_moments(dask_data, dimension=dimension).variance()
+            assert isinstance(result, da.Array)
+            assert np.allclose(result.compute(), expected, equal_nan=True)
+
+    def test_records(self):
+        """ Tests converting a state to a record array and back. """
+        state = Moments.from_data(self.data, dimension=1)
+        restored = Moments.from_records(state.to_records())
+        assert np.allclose(restored.variance(), state.variance(), equal_nan=True)
+
+
+class StatisticsTester(unittest.TestCase):
+    """ Tests the mergeable statistics state. """
+
+    def setUp(self):
+        """ Sets up a data cube with no-data values and a pixel without any valid value. """
+        self.data = np.random.RandomState(42).rand(9, 3, 4) * 100.
+        self.data[2, 1, 1] = np.nan
+        self.data[:, 0, 0] = np.nan
+
+    def test_merge(self):
+        """ Tests merging the states of parts of the data. """
+        state = Statistics.from_data(self.data[:1])
+        for i in range(1, 9):
+            state.append(self.data[i:i+1])
+        assert np.allclose(state.get("min"), np.fmin.reduce(self.data, axis=0), equal_nan=True)
+        assert np.allclose(state.get("max"), np.fmax.reduce(self.data, axis=0), equal_nan=True)
+        assert np.allclose(state.get("mean"), Moments.from_data(self.data).mean, equal_nan=True)
+        assert np.allclose(state.get("sd"), np.sqrt(np.nanvar(self.data, axis=0, ddof=1)), equal_nan=True)
+        assert np.array_equal(state.get("count"), np.sum(~np.isnan(self.data), axis=0))
+
+        state = Statistics.from_data(self.data[:4], ignore_nodata=False, statistics=["extrema"]).merge(
+            Statistics.from_data(self.data[4:], ignore_nodata=False, statistics=["extrema"]))
+        assert state.moments is None and state.n_valid is None
+        assert np.allclose(state.get("extrema"), [np.min(self.data, axis=0), np.max(self.data, axis=0)],
+                           equal_nan=True)
+
+    def test_compute_statistics(self):
+        """ Tests computing the state with NumPy and dask arrays along different dimensions. """
+        for dimension in [0, 1, 2]:
+            expected = np.nanvar(self.data, axis=dimension, ddof=1)
+            state = compute_statistics(self.data, dimension=dimension, statistics=["variance", "max"])
+            assert np.allclose(state.get("variance"), expected, equal_nan=True)
+            dask_state = compute_statistics(da.from_array(self.data, chunks=(2, 2, 3)), dimension=dimension,
+                                            statistics=["variance", "max"])
+            assert isinstance(dask_state.get("variance"), da.Array)
+            assert np.allclose(dask_state.get("variance").compute(), expected, equal_nan=True)
+            assert np.allclose(dask_state.get("max").compute(), state.get("max"), equal_nan=True)
+
+    def test_records(self):
+        """ Tests converting a state to a record array and back. """
+        state = Statistics.from_data(self.data, dimension=1, ignore_nodata=False)
+        restored = Statistics.from_records(state.to_records())
+        for statistic in ["count", "min", "max", "mean", "sd"]:
+            assert np.allclose(restored.get(statistic), state.get(statistic), equal_nan=True)
+
+
+class QuantileSketchTester(unittest.TestCase):
+    """ Tests the mergeable quantile sketch. """
+
+    def test_exact(self):
+        """ Tests that the sketch is exact as long as the centroids contain single values. """
+        data = np.array([9, 4, 2, np.nan, 5, 4, 7, 4, 5])
+        sketch = QuantileSketch.from_data(data[:4]).merge(QuantileSketch.from_data(data[4:]))
+        probabilities = [0., 0.01, 0.25, 0.5, 0.9, 1.]
+        assert np.allclose(sketch.quantiles(probabilities), np.nanpercentile(data, np.array(probabilities) * 100))
+
+    def test_rank_error(self):
+        """ Tests that the rank error of the estimates stays within the bound of the scale function. """
+        data = np.random.RandomState(42).lognormal(size=(20000, 3))
+        sketch = compute_quantile_sketch(data[:500])
+        for i in range(500, 20000, 500):
+            sketch.append(data[i:i + 500])
+        probabilities = np.array([0.001, 0.01, 0.1, 0.5, 0.9, 0.99, 0.999])
+        estimates = sketch.quantiles(probabilities)
+        ranks = (np.sort(data, axis=0)[:, None, :] < estimates[None]).mean(axis=0)
+        bound = 2 * np.pi * np.sqrt(probabilities * (1 - probabilities)) / 100
+        assert (np.abs(ranks - probabilities[:, None]) <= bound[:, None]).all()
+
+    def test_records(self):
+        """ Tests converting a sketch to a record array and back. """
+        data = np.random.RandomState(42).rand(50, 3)
+        sketch = QuantileSketch.from_data(data, compression=20)
+        restored = QuantileSketch.from_records(sketch.to_records(), compression=20)
+        assert np.allclose(restored.quantiles([0.2, 0.7]), sketch.quantiles([0.2, 0.7]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,11 @@ https://openeo.org/documentation/1.0/processes.html
 """
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import openeo_processes as oeop
+from openeo_processes.errors import ArrayElementNotAvailable
 
 
 class ArrayTester(unittest.TestCase):
@@ -21,14 +24,53 @@ class ArrayTester(unittest.TestCase):
         assert oeop.array_contains([[1, 2], [3, 4]], value=[1, 2])
         assert not oeop.array_contains([[1, 2], [3, 4]], value=2)
         assert oeop.array_contains([{"a": "b"}, {"c": "d"}], value={"a": "b"})
+        assert not oeop.array_contains([{"a": "b"}, {"c": "d"}], value=np.nan)
+        assert oeop.array_contains([[1, np.nan], [3, 4]], value=[1, np.nan])
+
+        # long arrays searched block by block
+        data = np.arange(200000, dtype=float)
+        assert oeop.array_contains(data, value=150000)
+        data[-1] = np.nan
+        assert oeop.array_contains(data, value=np.nan)
+        assert not oeop.array_contains(data, value=-1)
+
+        # multi-dim
+        data = np.array([[[1, 2], [3, np.nan]], [[5, 6], [1, 8]]])
+        assert (oeop.array_contains(data, value=1, dimension=0) == np.array([[True, False], [True, False]])).all()
+        assert (oeop.array_contains(data, value=np.nan, dimension=2) == np.array([[False, True], [False, False]])).all()
 
     def test_array_element(self):
         """ Tests `array_element` function. """
         assert oeop.array_element([9, 8], label="B", labels=np.array(["A", "B"])) == 8
+        assert oeop.array_element([9, 8], label="B", labels=oeop.LabelIndex(["A", "B"])) == 8
+        assert np.isnan(oeop.array_element([9, 8], label="C", labels=oeop.LabelIndex(["A", "B"]), return_nodata=True))
+
+        # several labels
+        data = np.arange(24).reshape(2, 6, 2)
+        labels = np.array(["B01", "B02", "B03", "B04", "B05", "B06"])
+        bands = oeop.array_element(data, label=["B02", "B04", "B06"], labels=labels, dimension=1)
+        assert np.shares_memory(bands, data)
+        assert (bands == data[:, 1::2]).all()
+        assert (oeop.array_element(data, label=["B04", "B01"], labels=labels, dimension=1) == data[:, [3, 0]]).all()
+        assert (oeop.array_element(data, label="B03", labels=labels, dimension=1) == data[:, 2]).all()
+        with self.assertRaises(ArrayElementNotAvailable):
+            oeop.array_element(data, label=["B01", "B09"], labels=labels, dimension=1)
+        bands = oeop.array_element(data, label=["B01", "B09"], labels=labels, dimension=1, return_nodata=True)
+        assert (bands[:, 0] == data[:, 0]).all() and np.isnan(bands[:, 1]).all()
         assert oeop.array_element([9, 8, 7, 6, 5], index=2) == 7
+        assert (oeop.array_element(data, index=[-1], dimension=1) == data[:, [5]]).all()
+        assert (oeop.array_element(data, index=[-2, -1], dimension=1) == data[:, 4:]).all()
+        assert (oeop.array_element(data, index=[-1, 0, 1], dimension=1) == data[:, [5, 0, 1]]).all()
         assert oeop.array_element(["A", "B", "C"], index=0) == "A"
         assert np.isnan(oeop.array_element([], index=0, return_nodata=True))
 
+        # labels looked up concurrently, e.g. by the threads of a process graph
+        labels = [np.array(["B{:02d}".format(j) for j in range(i, i + 6)]) for i in range(300)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            indices = list(executor.map(lambda l: oeop.array_element([0, 1, 2, 3, 4, 5], label=l[2], labels=l),
+                                        labels * 4))
+        assert indices == [2] * len(labels) * 4
+
         # multi-dim
         test_array = np.empty((3, 2, 2))
         test_array[0, :, :] = np.array([[1, 2], [3, 4]])
@@ -55,6 +97,16 @@ class ArrayTester(unittest.TestCase):
         assert oeop.count([False, np.nan], condition=True) == 2
         assert oeop.count([0, 1, 2, 3, 4, 5, np.nan], condition=oeop.gt, context={'y': 2}) == 3
         assert oeop.count([0, 1, 2, 3, 4, 5, np.nan], condition=oeop.lte, context={'y': 2}) == 3
+        assert oeop.count([1, np.inf, 3], condition=lambda x: x < 2) == 1
+
+        # multi-dim
+        data = np.array([[[1, np.nan], [np.inf, 4]], [[5, 6], [np.nan, 8]]])
+        assert (oeop.count(data) == np.array([[2, 1], [0, 2]])).all()
+        assert (oeop.count(data, dimension=2) == np.array([[1, 1], [2, 1]])).all()
+        assert (oeop.count(data, condition=True, dimension=1) == np.array([[2, 2], [2, 2]])).all()
+        assert oeop.count(data, condition=True, dimension=1).shape == (2, 2)
+        assert oeop.count(np.ones((2, 3, 4)), condition=True, dimension=2).shape == (2, 3)
+        assert (oeop.count(data, condition=oeop.gt, context={'y': 4}) == np.array([[1, 1], [1, 1]])).all()
 
     #TODO: add test
     def test_array_apply(self):
@@ -119,7 +171,9 @@ class ArrayTester(unittest.TestCase):
         self.assertListEqual(oeop.order([6, -1, 2, np.nan, 7, 4, np.nan, 8, 3, 9, 9], asc=False, nodata=True).tolist(),
                              [9, 10, 7, 4, 0, 5, 8, 2, 1, 3, 6])
         self.assertListEqual(oeop.order([6, -1, 2, np.nan, 7, 4, np.nan, 8, 3, 9, 9], asc=False, nodata=False).tolist(),
-                             [6, 3, 9, 10, 7, 4, 0, 5, 8, 2, 1])
+                             [3, 6, 9, 10, 7, 4, 0, 5, 8, 2, 1])
+        self.assertListEqual(oeop.order([6, -1, 2, np.nan, 7, 4, np.nan, 8, 3, 9, 9], nodata=False).tolist(),
+                             [3, 6, 1, 2, 8, 5, 0, 4, 7, 9, 10])
 
     def test_rearrange(self):
         """ Tests `rearrange` function. """
@@ -134,10 +188,70 @@ class ArrayTester(unittest.TestCase):
         assert np.isclose(oeop.sort([6, -1, 2, np.nan, 7, 4, np.nan, 8, 3, 9, 9], asc=False, nodata=True),
                           [9, 9, 8, 7, 6, 4, 3, 2, -1, np.nan, np.nan], equal_nan=True).all()
 
-    # TODO: add test
+    def test_sort_dimensions(self):
+        """ Tests `order` and `sort` along the dimensions of multi-dimensional and unsigned integer arrays. """
+        data = np.array([[3., np.nan, 1.], [np.nan, 2., 5.], [1., 4., np.nan], [1., 0., 2.]])
+        for dimension in [0, 1]:
+            for asc in [True, False]:
+                for nodata in [True, False]:
+                    result = oeop.sort(data, dimension=dimension, asc=asc, nodata=nodata)
+                    assert result.shape == data.shape
+                    permutation = oeop.order(data, dimension=dimension, asc=asc, nodata=nodata)
+                    assert np.array_equal(np.take_along_axis(data, permutation, axis=dimension), result,
+                                          equal_nan=True)
+                    for values, values_sorted in zip(np.moveaxis(data, dimension, -1),
+                                                     np.moveaxis(result, dimension, -1)):
+                        assert np.array_equal(oeop.sort(values, asc=asc, nodata=nodata), values_sorted,
+                                              equal_nan=True)
+
+        assert np.array_equal(oeop.sort(data, dimension=1, asc=False, nodata=False),
+                              [[np.nan, 3., 1.], [np.nan, 5., 2.], [np.nan, 4., 1.], [2., 1., 0.]], equal_nan=True)
+        result = oeop.sort(data, dimension=1)
+        assert np.array_equal(result.mask, [[False, False, True], [False, False, True], [False, False, True],
+                                            [False, False, False]])
+        assert np.array_equal(result.data[:, :2], [[1., 3.], [2., 5.], [1., 4.], [0., 1.]])
+        assert oeop.order(data[:3], dimension=1).shape == (3, 2)
+
+        unsigned = np.array([0, 65535, 7, 7, 1], dtype=np.uint16)
+        self.assertListEqual(oeop.sort(unsigned, asc=False).tolist(), [65535, 7, 7, 1, 0])
+        self.assertListEqual(oeop.order(unsigned, asc=False).tolist(), [1, 2, 3, 4, 0])
+
+    def test_masked_arrays(self):
+        """ Tests `first`, `last`, `order` and `sort` with masked integer arrays. """
+        data = oeop.mask_nodata(np.array([6, 0, 2, 7, 4, 0, 65535, 3, 9, 9], dtype=np.uint16), nodata=0)
+        self.assertListEqual(oeop.order(data).tolist(), [2, 7, 4, 0, 3, 8, 9, 6])
+        self.assertListEqual(oeop.order(data, nodata=True).tolist(), [2, 7, 4, 0, 3, 8, 9, 6, 1, 5])
+        self.assertListEqual(oeop.order(data, asc=False, nodata=False).tolist(), [1, 5, 6, 8, 9, 3, 0, 4, 7, 2])
+        sorted_data = oeop.sort(data, asc=False, nodata=True)
+        assert sorted_data.dtype == np.uint16
+        self.assertListEqual(sorted_data.tolist(), [65535, 9, 9, 7, 6, 4, 3, 2, None, None])
+        self.assertListEqual(oeop.sort(data).tolist(), [2, 3, 4, 6, 7, 9, 9, 65535])
+
+        data = oeop.mask_nodata(np.array([[3, 0, 1], [0, 2, 5], [1, 4, 0]], dtype=np.uint16), nodata=0)
+        self.assertListEqual(oeop.first(data).tolist(), [[3, 2, 1]])
+        self.assertListEqual(oeop.last(data).tolist(), [[1, 4, 5]])
+        self.assertListEqual(oeop.first(data, ignore_nodata=False).tolist(), [3, None, 1])
+
+        # no-data values removed per series along the second dimension
+        data = oeop.mask_nodata(np.array([[3, 0, 1], [0, 0, 5], [1, 4, 2]], dtype=np.uint16), nodata=0)
+        self.assertListEqual(oeop.sort(data, dimension=1).tolist(), [[1, 3, None], [5, None, None], [1, 2, 4]])
+        self.assertListEqual(oeop.sort(data, dimension=1, asc=False).tolist(),
+                             [[3, 1, None], [5, None, None], [4, 2, 1]])
+        self.assertListEqual(oeop.order(data, dimension=1).tolist(), [[2, 0, None], [2, None, None], [0, 2, 1]])
+        self.assertListEqual(oeop.order(data[:, :2], dimension=0).tolist(), [[2, 2], [0, None]])
+
     def test_mask(self):
         """ Tests `mask` function. """
-        pass
+        data = np.arange(12, dtype=float).reshape((3, 2, 2))
+        mask = np.array([[True, False], [False, True]])
+        result = oeop.mask(data, mask)
+        assert np.isnan(result[:, 0, 0]).all() and np.isnan(result[:, 1, 1]).all()
+        assert np.array_equal(result[:, 0, 1], [1, 5, 9])
+        assert not np.isnan(data).any()
+
+        assert oeop.mask(data, data > 5, replacement=0, out=data) is data
+        assert np.array_equal(data.ravel(), [0, 1, 2, 3, 4, 5] + [0] * 6)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 
 import numpy as np
+import xarray as xr
+import dask.array as da
 import openeo_processes as oeop
 import pytest
 
@@ -13,13 +15,14 @@ import pytest
     (1, False),
     (np.inf, False),
     ("a string", True),
-    ([1, 2], True),
-    ([None, None], True),
-    ([np.nan, np.nan], True),
+    ([1, 2], [False, False]),
+    ([None, None], [True, True]),
+    ([np.nan, np.nan], [True, True]),
+    (["a", 1, np.nan], [True, False, True]),
 ])
 def test_is_nan(value, expected):
     """ Tests `is_nan` function. """
-    assert oeop.is_nan(value) == expected
+    assert np.all(oeop.is_nan(value) == expected)
 
 
 @pytest.mark.parametrize(["value", "expected"], [
@@ -30,13 +33,14 @@ def test_is_nan(value, expected):
     (1, False),
     (np.inf, False),
     ("a string", False),
-    ([1, 2], False),
-    ([None, None], False),
-    ([np.nan, np.nan], False),
+    ([1, 2], [False, False]),
+    ([None, None], [True, True]),
+    ([np.nan, np.nan], [True, True]),
+    (["a", None, 1], [False, True, False]),
 ])
 def test_is_nodata(value, expected):
     """ Tests `is_nodata` function. """
-    assert oeop.is_nodata(value) == expected
+    assert np.all(oeop.is_nodata(value) == expected)
 
 
 @pytest.mark.parametrize(["value", "expected"], [
@@ -47,13 +51,31 @@ def test_is_nodata(value, expected):
     (1, True),
     (np.inf, False),
     ("a string", True),
-    ([1, 2], True),
-    ([None, None], True),
-    ([np.nan, np.nan], True),
+    ([1, 2], [True, True]),
+    ([None, None], [False, False]),
+    ([np.nan, np.nan], [False, False]),
+    (["a", None, np.inf, 1], [True, False, False, True]),
 ])
 def test_is_valid(value, expected):
     """ Tests `is_valid` function. """
-    assert oeop.is_valid(value) == expected
+    assert np.all(oeop.is_valid(value) == expected)
+
+
+@pytest.mark.parametrize("process", [oeop.is_nan, oeop.is_nodata, oeop.is_valid])
+def test_masks_arrays(process):
+    """ Tests that `is_nan`, `is_nodata` and `is_valid` return masks with the same type for xarray and dask data. """
+    data = np.array([[1., np.nan], [np.inf, -3.]])
+    expected = process(data)
+    assert expected.shape == data.shape
+
+    result = process(xr.DataArray(data, dims=["y", "x"]))
+    assert isinstance(result, xr.DataArray)
+    assert result.dims == ("y", "x")
+    assert (result.values == expected).all()
+
+    result = process(da.from_array(data, chunks=1))
+    assert isinstance(result, da.Array)
+    assert (result.compute() == expected).all()
 
 
 class ComparisonTester(unittest.TestCase):
@@ -73,6 +95,11 @@ class ComparisonTester(unittest.TestCase):
         assert oeop.eq("00:00:00+00:00", "00:00:00Z")
         assert not oeop.eq("2018-01-01T12:00:00Z", "2018-01-01T12:00:00")
         assert oeop.eq("2018-01-01T00:00:00Z", "2018-01-01T01:00:00+01:00")
+        assert (oeop.eq(np.array(["2018-01-01T00:00:00Z", "2018-01-01T12:00:00", "Test"]),
+                        np.array(["2018-01-01T01:00:00+01:00", "2018-01-01T12:00:00Z", "test"]))
+                == np.array([True, False, False])).all()
+        assert (oeop.eq(np.array(["2018-01-01", "Test"]), "2018-01-01T00:00:00z", case_sensitive=False)
+                == np.array([True, False])).all()
 
     def test_neq(self):
         """ Tests `neq` function. """
@@ -139,5 +166,39 @@ class ComparisonTester(unittest.TestCase):
         assert not oeop.between("2000-01-01", min="2018-01-01", max="2020-01-01")
         assert not oeop.between("2018-12-31T17:22:45Z", min="2018-01-01", max="2018-12-31", exclude_max=True)
 
+    def test_temporal_arrays(self):
+        """ Tests comparing arrays of temporal strings. """
+        labels = np.array(["2017-12-31T23:00:00Z", "2018-01-01T00:30:00+01:00", "2018-06-01", "2019-01-01T00:00:00Z"])
+        assert (oeop.gt(labels, "2018-01-01T00:00:00Z") == np.array([False, False, True, True])).all()
+        assert (oeop.gte(labels, "2018-01-01T00:00:00Z") == np.array([False, False, True, True])).all()
+        assert (oeop.lt(labels, "2017-12-31T23:30:00Z") == np.array([True, False, False, False])).all()
+        assert (oeop.lte(labels, np.datetime64("2018-06-01")) == np.array([True, True, True, False])).all()
+        assert (oeop.between(labels, min="2017-12-31T23:00:00Z", max="2019-01-01", exclude_max=True)
+                == np.array([True, True, True, False])).all()
+        assert not oeop.between(labels, min="2019-01-01", max="2018-01-01")
+        labels = oeop.LabelIndex(labels)
+        assert (oeop.between(labels, min="2017-12-31T23:00:00Z", max="2019-01-01", exclude_max=True)
+                == np.array([True, True, True, False])).all()
+        assert not oeop.gt(np.array(["a", "b"]), "a").any()
+
+    def test_temporal_label_lists(self):
+        """ Tests comparing temporal labels passed as lists or object arrays. """
+        for labels in [["2017-12-31T23:00:00Z", "2018-06-01"],
+                       np.array(["2017-12-31T23:00:00Z", "2018-06-01"], dtype=object)]:
+            assert (oeop.gt(labels, "2018-01-01") == np.array([False, True])).all()
+            assert (oeop.lte(labels, "2018-01-01T00:00:00+01:00") == np.array([True, False])).all()
+            assert (oeop.eq(labels, "2018-06-01T00:00:00Z") == np.array([False, True])).all()
+            assert (oeop.between(labels, min="2018-01-01", max="2019-01-01") == np.array([False, True])).all()
+
+    def test_masked_arrays(self):
+        """ Tests that masked values of masked arrays are no-data values and are masked in comparisons. """
+        data = oeop.mask_nodata(np.array([1, 0, 3, 7], dtype=np.uint16), nodata=0)
+        assert oeop.is_nodata(data).tolist() == [False, True, False, False]
+        assert oeop.is_valid(data).tolist() == [True, False, True, True]
+        assert oeop.gt(data, 2).tolist() == [False, None, True, True]
+        assert oeop.eq(data, 3).tolist() == [False, None, True, False]
+        assert oeop.between(data, 1, 5).tolist() == [True, None, True, False]
+        assert oeop.lte(data, 7, reduce=True)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+import openeo_processes as oeop
+from openeo_processes.fusion import fuse_process_graph, fuse_reducers, FusedExpression
+
+
+BAND_MATH_GRAPH = {
+    "ndvi": {"process_id": "normalized_difference", "arguments": {"x": {"from_parameter": "nir"},
+                                                                  "y": {"from_parameter": "red"}}},
+    "scale": {"process_id": "linear_scale_range", "arguments": {"x": {"from_node": "ndvi"}, "input_min": -1,
+                                                                "input_max": 1, "output_max": 255}},
+    "clip": {"process_id": "clip", "arguments": {"x": {"from_node": "scale"}, "min_x": 20, "max_x": 230}},
+    "gt": {"process_id": "gt", "arguments": {"x": {"from_parameter": "nir"}, "y": 0.1}},
+    "lt": {"process_id": "lt", "arguments": {"x": {"from_parameter": "red"}, "y": 0.9}},
+    "and": {"process_id": "and", "arguments": {"x": {"from_node": "gt"}, "y": {"from_node": "lt"}}},
+    "if": {"process_id": "if", "arguments": {"value": {"from_node": "and"}, "accept": {"from_node": "clip"}},
+           "result": True},
+}
+
+
+@pytest.fixture
+def bands():
+    rng = np.random.default_rng(42)
+    return {"nir": rng.random((300, 250)), "red": rng.random((300, 250))}
+
+
+def test_fuse_process_graph():
+    fused_graph = fuse_process_graph(BAND_MATH_GRAPH)
+    assert list(fused_graph) == ["if"]
+    assert isinstance(fused_graph["if"]["process"], FusedExpression)
+    assert fused_graph["if"]["arguments"] == {"x0": {"from_parameter": "nir"}, "x1": {"from_parameter": "red"}}
+    assert fused_graph["if"]["result"]
+
+    # results used by several nodes are not computed inside the fused expression
+    graph = dict(BAND_MATH_GRAPH, mul={"process_id": "multiply", "arguments": {"x": {"from_node": "clip"}, "y": 2}})
+    fused_graph = fuse_process_graph(graph)
+    assert set(fused_graph) == {"clip", "if", "mul"}
+    assert fused_graph["if"]["arguments"]["x2"] == {"from_node": "clip"}
+
+
+@pytest.mark.parametrize("fuse", [True, "numexpr"])
+def test_fused_process_graph(bands, fuse):
+    if fuse == "numexpr":
+        pytest.importorskip("numexpr")
+    expected = oeop.execute_process_graph(BAND_MATH_GRAPH, parameters=bands)
+    result = oeop.execute_process_graph(BAND_MATH_GRAPH, parameters=bands, fuse=fuse)
+    assert result.shape == expected.shape
+    assert np.allclose(result, expected, equal_nan=True)
+
+
+@pytest.mark.parametrize("shape", [(1000,), (7, 3, 1000), (5, 40000)])
+def test_fused_expression_tiles(shape):
+    rng = np.random.default_rng(42)
+    bands = {"nir": rng.random(shape), "red": rng.random(shape)}
+    fused_graph = fuse_process_graph(BAND_MATH_GRAPH, tile_size=256)
+    result = fused_graph["if"]["process"](x0=bands["nir"], x1=bands["red"])
+    expected = oeop.execute_process_graph(BAND_MATH_GRAPH, parameters=bands)
+    assert np.allclose(result, expected, equal_nan=True)
+
+
+def test_fused_expression_fallback(bands):
+    graph = oeop.ProcessGraph(BAND_MATH_GRAPH, fuse=True)
+    assert graph.execute({"nir": 0.5, "red": 0.25}) == pytest.approx(170)
+
+    ndvi_graph = {
+        "sub": {"process_id": "subtract", "arguments": {"x": {"from_parameter": "nir"}, "y": {"from_parameter": "red"}}},
+        "add": {"process_id": "add", "arguments": {"x": {"from_parameter": "nir"}, "y": {"from_parameter": "red"}}},
+        "div": {"process_id": "divide", "arguments": {"x": {"from_node": "sub"}, "y": {"from_node": "add"}},
+                "result": True},
+    }
+    result = oeop.execute_process_graph(ndvi_graph, parameters={name: xr.DataArray(band)
+                                                                for name, band in bands.items()}, fuse=True)
+    assert isinstance(result, xr.DataArray)
+    assert np.allclose(result, (bands["nir"] - bands["red"]) / (bands["nir"] + bands["red"]))
+
+
+@pytest.mark.parametrize("fuse", [True, "numexpr"])
+def test_fused_three_valued_logic(fuse):
+    graph = {
+        "and": {"process_id": "and", "arguments": {"x": {"from_parameter": "x"}, "y": {"from_parameter": "y"}}},
+        "or": {"process_id": "or", "arguments": {"x": {"from_node": "and"}, "y": {"from_parameter": "z"}}},
+        "not": {"process_id": "not", "arguments": {"x": {"from_node": "or"}}, "result": True},
+    }
+    parameters = {"x": np.array([1., 0., np.nan, np.nan]), "y": np.array([1., np.nan, 1., np.nan]),
+                  "z": np.array([0., 0., 0., 1.])}
+    expected = oeop.execute_process_graph(graph, parameters=parameters)
+    assert np.array_equal(expected, [0., 1., np.nan, 0.], equal_nan=True)
+    result = oeop.execute_process_graph(graph, parameters=parameters, fuse=fuse)
+    assert np.array_equal(result, expected, equal_nan=True)
+
+    bools = {name: ~np.isnan(values) for name, values in parameters.items()}
+    assert np.array_equal(oeop.execute_process_graph(graph, parameters=bools, fuse=fuse),
+                          oeop.execute_process_graph(graph, parameters=bools))
+
+    integers = {"x": np.array([2, 0, 3, 0]), "y": np.array([1, 4, 0, 0]), "z": np.array([0, 0, 0, 5])}
+    expected = oeop.execute_process_graph(graph, parameters=integers)
+    assert np.array_equal(expected, [False, True, True, False])
+    assert np.array_equal(oeop.execute_process_graph(graph, parameters=integers, fuse=fuse), expected)
+
+
+COMPOSITE_GRAPH = {
+    "min": {"process_id": "min", "arguments": {"data": {"from_parameter": "data"}}},
+    "max": {"process_id": "max", "arguments": {"data": {"from_parameter": "data"}}},
+    "mean": {"process_id": "mean", "arguments": {"data": {"from_parameter": "data"}}},
+    "sd": {"process_id": "sd", "arguments": {"data": {"from_parameter": "data"}}},
+    "count": {"process_id": "count", "arguments": {"data": {"from_parameter": "data"}}},
+    "range": {"process_id": "subtract", "arguments": {"x": {"from_node": "max"}, "y": {"from_node": "min"}}},
+    "cv": {"process_id": "divide", "arguments": {"x": {"from_node": "sd"}, "y": {"from_node": "mean"}}},
+    "sum": {"process_id": "add", "arguments": {"x": {"from_node": "range"}, "y": {"from_node": "cv"}}},
+    "result": {"process_id": "multiply", "arguments": {"x": {"from_node": "sum"}, "y": {"from_node": "count"}},
+               "result": True},
+}
+
+
+def test_fuse_reducers():
+    fused_graph = fuse_reducers(COMPOSITE_GRAPH)
+    state_id = "min_max_mean_sd_count_statistics"
+    assert fused_graph[state_id]["arguments"] == {"data": {"from_parameter": "data"}}
+    for node_id in ["min", "max", "mean", "sd", "count"]:
+        assert fused_graph[node_id]["arguments"]["state"] == {"from_node": state_id}
+
+    # reducers with different arguments are not fused
+    graph = dict(COMPOSITE_GRAPH, max={"process_id": "max", "arguments": {"data": {"from_parameter": "data"},
+                                                                          "ignore_nodata": False}},
+                 count={"process_id": "count", "arguments": {"data": {"from_parameter": "data"}, "condition": True}})
+    fused_graph = fuse_reducers(graph)
+    assert fused_graph["max"] is graph["max"] and fused_graph["count"] is graph["count"]
+    assert "min_mean_sd_statistics" in fused_graph
+
+
+@pytest.mark.parametrize("data", [np.arange(24.).reshape(4, 6), [3., np.nan, 1.], np.ma.masked_equal([3, 0, 1], 0)])
+def test_fused_reducers(data):
+    values = np.asanyarray(data)
+    expected = ((oeop.max(values) - oeop.min(values)) + oeop.sd(values) / oeop.mean(values)) * oeop.count(values)
+    assert np.allclose(oeop.execute_process_graph(COMPOSITE_GRAPH, parameters={"data": data}), expected)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import openeo_processes as oeop
+from openeo_processes import kernels
+from openeo_processes.kernels import nan_cumextreme
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numba":
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(kernels, "numba", None)
+    return request.param
+
+
+@pytest.mark.parametrize("dimension", [0, 1, -1])
+@pytest.mark.parametrize("largest", [True, False])
+def test_nan_cumextreme(backend, dimension, largest):
+    data = np.random.default_rng(42).random((6, 5, 4)).astype(np.float32)
+    data[0, 1, 2] = np.nan
+    data[2:4, :, 1] = np.nan
+    data[:, 3, :] = np.nan
+    original = data.copy()
+
+    result = nan_cumextreme(data, dimension=dimension, largest=largest)
+    expected = (np.fmax if largest else np.fmin).accumulate(data, axis=dimension)
+    expected[np.isnan(data)] = np.nan
+    assert result.dtype == np.float32
+    assert np.array_equal(result, expected, equal_nan=True)
+    assert np.array_equal(data, original, equal_nan=True)
+
+
+def test_cumulative_extremes(backend):
+    data = np.array([[5., np.nan, 1.], [np.nan, 7., 2.], [3., 1., np.nan], [4., 9., 0.]])
+    original = data.copy()
+    assert np.array_equal(oeop.cummin(data), [[5, np.nan, 1], [np.nan, 7, 1], [3, 1, np.nan], [3, 1, 0]],
+                          equal_nan=True)
+    assert np.array_equal(oeop.cummax(data, dimension=1), [[5, np.nan, 5], [np.nan, 7, 7], [3, 3, np.nan],
+                                                           [4, 9, 9]], equal_nan=True)
+    assert np.array_equal(data, original, equal_nan=True)
+    assert oeop.cummax(np.array([1, 3, 2])).tolist() == [1, 3, 3]
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import xarray as xr
+import dask.array as da
+
+import openeo_processes as oeop
+
+
+def band_formula(nir, red):
+    ndvi = oeop.normalized_difference(nir, red)
+    scaled = oeop.multiply(ndvi, oeop.divide(oeop.pi(), 2))
+    return oeop.clip(oeop.add(scaled, oeop.normalized_difference(nir, red)), -1, 1.5)
+
+
+@pytest.fixture
+def bands():
+    rng = np.random.default_rng(42)
+    return rng.random((200, 150)), rng.random((200, 150))
+
+
+def test_lazy_expression(bands):
+    with oeop.lazy():
+        expression = band_formula(*bands)
+    assert isinstance(expression, oeop.Expression)
+    assert expression.process_id == "clip"
+    assert isinstance(oeop.add(1, 2), int)
+
+    # expressions are passed on by processes outside of the lazy mode
+    assert isinstance(oeop.absolute(expression), oeop.Expression)
+
+    process_graph, parameters, result = expression.to_process_graph()
+    assert sorted(node["process_id"] for node in process_graph.values()) == ["add", "clip", "multiply",
+                                                                            "normalized_difference"]
+    assert len(parameters) == 2
+    assert process_graph[result["from_node"]]["result"]
+    multiply = next(node for node in process_graph.values() if node["process_id"] == "multiply")
+    assert multiply["arguments"]["y"] == pytest.approx(np.pi / 2)
+
+
+def test_constant_expression():
+    with oeop.lazy():
+        expression = oeop.multiply(oeop.add(1, 2), oeop.e())
+    assert expression.compute() == pytest.approx(3 * np.e)
+    assert expression.to_process_graph()[0] == {}
+
+
+@pytest.mark.parametrize("fuse", [True, False])
+def test_compute(bands, fuse):
+    expected = band_formula(*bands)
+    with oeop.lazy():
+        expression = band_formula(*bands)
+    assert np.allclose(expression.compute(fuse=fuse), expected)
+
+    with oeop.lazy():
+        expression = band_formula(*(xr.DataArray(band, dims=["y", "x"]) for band in bands))
+    result = expression.compute(fuse=fuse)
+    assert isinstance(result, xr.DataArray)
+    assert np.allclose(result, expected)
+
+    with oeop.lazy():
+        expression = band_formula(*(da.from_array(band, chunks=50) for band in bands))
+    result = expression.compute(fuse=fuse)
+    assert isinstance(result, da.Array)
+    assert np.allclose(result.compute(), expected)
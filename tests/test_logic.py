@@ -36,6 +36,16 @@ class LogicTester(unittest.TestCase):
         assert oeop.xor(True, False)
         assert not oeop.xor(True, True)
 
+        # boolean and integer arrays
+        x = np.array([True, True, False, False])
+        y = np.array([True, False, True, False])
+        assert (oeop.xor(x, y) == np.array([False, True, True, False])).all()
+        assert (oeop.xor(np.array([2, 2, 0, 0, -3]), np.array([0, 5, 0, 7, 1])) ==
+                np.array([True, False, False, True, False])).all()
+        assert (oeop.and_(np.array([2, 2, 0]), np.array([1, 0, 4])) == np.array([True, False, False])).all()
+        assert (oeop.or_(np.array([2, 0, 0]), np.array([1, 0, 4])) == np.array([True, False, True])).all()
+        assert (oeop.not_(np.array([2, 0, -1])) == np.array([False, True, False])).all()
+
     def test_if_(self):
         """ Tests `if_` function. """
         assert oeop.if_(True, "A", "B") == "A"
@@ -44,6 +54,15 @@ class LogicTester(unittest.TestCase):
         assert oeop.if_(True, 123) == 123
         assert oeop.if_(False, 1) is None
 
+    def test_if_out(self):
+        """ Tests computing `if_` into one of its arguments. """
+        value = np.array([True, False, True])
+        accept = np.array([1., 2., 3.])
+        reject = np.array([4., 5., 6.])
+        assert oeop.if_(value, accept, reject, out=accept) is accept
+        assert np.array_equal(accept, [1., 5., 3.])
+        assert np.array_equal(oeop.if_(value, 0., reject, out=reject), [0., 5., 0.])
+
     def test_any_(self):
         """ Tests `any_` function. """
         assert not oeop.any_([False, np.nan])
@@ -57,6 +76,10 @@ class LogicTester(unittest.TestCase):
         assert np.isnan(oeop.any_([np.nan], ignore_nodata=False))
         assert np.isnan(oeop.any_([]))
 
+        data = np.array([[np.nan, 0.], [1., np.nan]])
+        assert np.array_equal(oeop.any_(data), [1., 0.])
+        assert np.isnan(data[0, 0]) and np.isnan(data[1, 1])
+
     def test_all_(self):
         """ Tests `all_` function. """
         assert not oeop.all_([False, np.nan])
@@ -70,5 +93,53 @@ class LogicTester(unittest.TestCase):
         assert np.isnan(oeop.any_([np.nan], ignore_nodata=False))
         assert np.isnan(oeop.any_([]))
 
+        data = np.array([[np.nan, 0.], [1., np.nan]])
+        assert np.array_equal(oeop.any_(data), [1., 0.])
+        assert np.isnan(data[0, 0]) and np.isnan(data[1, 1])
+    def test_three_valued_arrays(self):
+        """ Tests elementwise logical processes on arrays with no-data values. """
+        x = np.array([True, True, True, False, False, False, np.nan, np.nan, np.nan])
+        y = np.array([True, False, np.nan, True, False, np.nan, True, False, np.nan])
+        nan = np.nan
+        assert np.array_equal(oeop.and_(x, y), [1, 0, nan, 0, 0, 0, nan, 0, nan], equal_nan=True)
+        assert np.array_equal(oeop.or_(x, y), [1, 1, 1, 1, 0, nan, 1, nan, nan], equal_nan=True)
+        assert np.array_equal(oeop.xor(x, y), [0, 1, nan, 1, 0, nan, nan, nan, nan], equal_nan=True)
+        assert np.array_equal(oeop.not_(x), [0, 0, 0, 1, 1, 1, nan, nan, nan], equal_nan=True)
+        assert np.array_equal(oeop.and_(x > 0, y > 0), (x > 0) & (y > 0))
+
+        masked = oeop.and_(np.ma.masked_invalid(x), y)
+        assert np.array_equal(masked.mask, np.isnan(oeop.and_(x, y)))
+
+    def test_bitmask(self):
+        """ Tests logical processes on packed arrays. """
+        rng = np.random.default_rng(42)
+        x = rng.choice([0., 1., np.nan], size=(5, 4, 13))
+        y = rng.choice([0., 1., np.nan], size=(5, 4, 13))
+        x_packed, y_packed = oeop.Bitmask.from_array(x), oeop.Bitmask.from_array(y)
+        assert x_packed.shape == x.shape
+        assert x_packed.nbytes == 2 * 5 * 4 * 2
+        assert np.array_equal(x_packed.to_array(), x, equal_nan=True)
+        assert np.array_equal(x_packed.to_array(masked=True).mask, np.isnan(x))
+
+        for fun in [oeop.and_, oeop.or_, oeop.xor]:
+            result = fun(x_packed, y_packed)
+            assert isinstance(result, oeop.Bitmask)
+            assert np.array_equal(result.to_array(), fun(x, y), equal_nan=True)
+            assert np.array_equal(fun(x_packed, y).to_array(), fun(x, y), equal_nan=True)
+        assert np.array_equal(oeop.not_(x_packed).to_array(), oeop.not_(x), equal_nan=True)
+
+        for fun in [oeop.any_, oeop.all_]:
+            for ignore_nodata in [True, False]:
+                for dimension in [0, 1, 2, -1]:
+                    result = fun(x_packed, dimension=dimension, ignore_nodata=ignore_nodata)
+                    expected = fun(x, dimension=dimension, ignore_nodata=ignore_nodata)
+                    assert np.array_equal(result.to_array(), expected, equal_nan=True)
+
+        assert oeop.any_(oeop.Bitmask.from_array([False, np.nan])) is False
+        assert oeop.any_(oeop.Bitmask.from_array([False, np.nan]), ignore_nodata=False) is None
+        assert oeop.all_(oeop.Bitmask.from_array([True, None])) is True
+        assert oeop.all_(oeop.Bitmask.from_array([False, None]), ignore_nodata=False) is False
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -5,8 +5,10 @@ https://openeo.org/documentation/1.0/processes.html
 
 import unittest
 import numpy as np
-from copy import deepcopy
+import dask.array as da
+import xarray as xr
 import openeo_processes as oeop
+from openeo_processes.errors import QuantilesMethodNotSupported
 
 
 class MathTester(unittest.TestCase):
@@ -206,6 +208,7 @@ class MathTester(unittest.TestCase):
         assert oeop.sd([-1, 1, 3, np.nan]) == 2
         assert np.isnan(oeop.sd([-1, 1, 3, np.nan], ignore_nodata=False))
         assert np.isnan(oeop.sd([]))
+        assert np.isnan(oeop.sd(np.empty((3, 0)), dimension=1)).all()
 
     def test_variance(self):
         """ Tests `variance` function. """
@@ -213,6 +216,7 @@ class MathTester(unittest.TestCase):
         assert oeop.variance([2, 3, 3, np.nan, 4, 4, 5]) == 1.1
         assert np.isnan(oeop.variance([-1, 1, np.nan, 3], ignore_nodata=False))
         assert np.isnan(oeop.variance([]))
+        assert np.isnan(oeop.variance(np.empty((3, 0)), dimension=1)).all()
 
     def test_extrema(self):
         """ Tests `extrema` function. """
@@ -221,6 +225,7 @@ class MathTester(unittest.TestCase):
         assert np.isclose(oeop.extrema([1, 0, 3, np.nan, 2], ignore_nodata=False), [np.nan, np.nan],
                           equal_nan=True).all()
         assert np.isclose(oeop.extrema([]), [np.nan, np.nan], equal_nan=True).all()
+        assert np.isnan(oeop.extrema(np.empty((3, 0)), dimension=1)).all()
 
     def test_clip(self):
         """ Tests `clip` function. """
@@ -250,6 +255,39 @@ class MathTester(unittest.TestCase):
         quantiles_5 = oeop.quantiles(data=[], probabilities=[0.1, 0.5])
         assert np.all([np.isnan(quantile) for quantile in quantiles_5]) and len(quantiles_5) == 2
 
+    def test_quantiles_methods(self):
+        """ Tests the exact selection-based and the approximate sketch-based computation of quantiles. """
+        data = [2, 4, 4, 4, 5, 5, 7, 9]
+        probabilities = [0.005, 0.01, 0.02, 0.05, 0.1, 0.5]
+        for method in ["select", "sketch"]:
+            quantiles = oeop.quantiles(data=data, probabilities=probabilities, method=method)
+            assert [oeop.round(quantile, p=2) for quantile in quantiles] == [2.07, 2.14, 2.28, 2.7, 3.4, 4.5]
+            quantiles = oeop.quantiles(data=[-1, -0.5, np.nan, 1], q=4, ignore_nodata=False, method=method)
+            assert np.all([np.isnan(quantile) for quantile in quantiles]) and len(quantiles) == 3
+        self.assertRaises(QuantilesMethodNotSupported, oeop.quantiles, data, q=2, method="unknown")
+
+        data = np.random.RandomState(42).normal(size=(100, 4, 5))
+        data[data > 1.5] = np.nan
+        data[:, 0, 0] = np.nan
+        dask_data = da.from_array(data, chunks=(30, 2, 5))
+        for dimension in [0, 1]:
+            expected = np.nanpercentile(data, [10, 50, 90], axis=dimension)
+            select = oeop.quantiles(data, probabilities=[0.1, 0.5, 0.9], dimension=dimension, method="select")
+            assert np.allclose(select, expected, equal_nan=True)
+            select = oeop.quantiles(dask_data, probabilities=[0.1, 0.5, 0.9], dimension=dimension, method="select")
+            assert np.allclose(select.compute(), expected, equal_nan=True)
+            sketch = oeop.quantiles(dask_data, probabilities=[0.1, 0.5, 0.9], dimension=dimension, method="sketch")
+            assert np.allclose(sketch.compute(), expected, atol=0.2, equal_nan=True)
+
+        # (dask-backed) xarray data arrays
+        for xar_data in [xr.DataArray(data, dims=["t", "y", "x"]), xr.DataArray(dask_data, dims=["t", "y", "x"])]:
+            expected = xar_data.quantile([0.1, 0.5, 0.9], dim="y")
+            for method, atol in [("select", 1e-8), ("sketch", 0.2)]:
+                result = oeop.quantiles(xar_data, probabilities=[0.1, 0.5, 0.9], dimension="y", method=method)
+                assert isinstance(result, xr.DataArray) and result.dims == expected.dims
+                assert np.allclose(result["quantile"], expected["quantile"])
+                assert np.allclose(result.values, expected.values, atol=atol, equal_nan=True)
+
     def test_cummin(self):
         """ Tests `cummin` function. """
         self.assertListEqual(oeop.cummin([5, 3, 1, 3, 5]).tolist(), [5, 3, 1, 1, 1])
@@ -278,6 +316,55 @@ class MathTester(unittest.TestCase):
         assert np.isclose(oeop.cumsum([1, 3, np.nan, 3, 1], ignore_nodata=False),
                           [1, 4, np.nan, np.nan, np.nan], equal_nan=True).all()
 
+    def test_cumulatives_out(self):
+        """ Tests that cumulative processes do not modify their input, unless it is passed as `out`. """
+        data = np.array([[1., np.nan, 3.], [np.nan, 5., 2.], [4., 1., np.nan]])
+        for process in [oeop.cummin, oeop.cummax, oeop.cumproduct, oeop.cumsum]:
+            for ignore_nodata in [True, False]:
+                values = data.copy()
+                expected = process(values, ignore_nodata=ignore_nodata)
+                assert np.array_equal(values, data, equal_nan=True)
+                assert process(values, ignore_nodata=ignore_nodata, out=values) is values
+                assert np.array_equal(values, expected, equal_nan=True)
+
+    def test_cumulatives_dask(self):
+        """ Tests cumulative processes with dask arrays chunked along the accumulated dimension. """
+        data = np.random.RandomState(42).rand(7, 3, 4)
+        data[0, 0, 0] = np.nan
+        data[3, 1, :] = np.nan
+        dask_data = da.from_array(data, chunks=(2, 2, 4))
+        for process in [oeop.cummin, oeop.cummax, oeop.cumproduct, oeop.cumsum]:
+            for dimension in [0, 2]:
+                for ignore_nodata in [True, False]:
+                    result = process(dask_data, dimension=dimension, ignore_nodata=ignore_nodata)
+                    assert isinstance(result, da.Array)
+                    expected = process(data, dimension=dimension, ignore_nodata=ignore_nodata)
+                    assert np.allclose(result.compute(), expected, equal_nan=True)
+
+        int_data = da.from_array(np.array([5, 3, 4, 1, 2]), chunks=2)
+        self.assertListEqual(oeop.cummin(int_data, ignore_nodata=False).compute().tolist(), [5, 3, 3, 1, 1])
+        self.assertListEqual(oeop.cummax(int_data, ignore_nodata=False).compute().tolist(), [5, 5, 5, 5, 5])
+        for ignore_nodata in [True, False]:
+            result = oeop.cummin(int_data.astype(np.uint8), ignore_nodata=ignore_nodata)
+            assert result.dtype == np.uint8
+            self.assertListEqual(result.compute().tolist(), [5, 3, 3, 1, 1])
+        assert oeop.cummax(dask_data.astype(np.float32)).compute().dtype == np.float32
+
+    def test_cumulatives_xarray(self):
+        """ Tests cumulative minima and maxima of (dask-backed) xarray data arrays along named dimensions. """
+        data = np.random.RandomState(42).rand(7, 3, 4)
+        data[0, 0, 0] = np.nan
+        data[3, 1, :] = np.nan
+        for values in [data, da.from_array(data, chunks=(2, 2, 4))]:
+            xar_data = xr.DataArray(values, dims=["t", "y", "x"])
+            for process in [oeop.cummin, oeop.cummax]:
+                for dimension, axis in [("t", 0), ("x", 2), (1, 1)]:
+                    for ignore_nodata in [True, False]:
+                        result = process(xar_data, dimension=dimension, ignore_nodata=ignore_nodata)
+                        assert isinstance(result, xr.DataArray) and result.dims == xar_data.dims
+                        expected = process(data, dimension=axis, ignore_nodata=ignore_nodata)
+                        assert np.allclose(result.values, expected, equal_nan=True)
+
     def test_sum(self):
         """ Tests `sum` function. """
         assert oeop.sum([5, 1]) == 6
@@ -293,10 +380,30 @@ class MathTester(unittest.TestCase):
         assert np.isnan(oeop.product([np.nan], ignore_nodata=False))
         assert np.isnan(oeop.product([]))
 
+        data = np.array([2., np.nan, 3.])
+        assert oeop.product(data) == 6
+        assert np.isnan(data[1])
+
         C = np.ones((2, 5, 5)) * 100
         assert np.sum(oeop.product(C) - np.ones((5, 5)) * 10000) == 0
-        assert np.sum(oeop.product(deepcopy(C), extra_values=[2]) - np.ones((5, 5)) * 20000) == 0
-        assert np.sum(oeop.product(deepcopy(C), extra_values=[2, 3]) - np.ones((5, 5)) * 60000) == 0
+        assert np.sum(oeop.product(C, extra_values=[2]) - np.ones((5, 5)) * 20000) == 0
+        assert np.sum(oeop.product(C, extra_values=[2, 3]) - np.ones((5, 5)) * 60000) == 0
+
+    def test_elementwise_out(self):
+        """ Tests computing elementwise processes into a given array. """
+        x = np.array([0.25, 0.5, 2.])
+        y = np.array([0.75, 0.25, 1.])
+        expected = (x - y) / (x + y)
+        result = np.empty(3)
+        assert oeop.normalized_difference(x, y, out=result) is result
+        assert np.allclose(result, expected)
+        assert oeop.normalized_difference(x, y, out=x) is x
+        assert np.allclose(x, expected)
+
+        assert np.allclose(oeop.linear_scale_range(x, -1, 1, 0, 255, out=x), (expected + 1) * 127.5)
+        assert np.allclose(oeop.clip(x, 100, 200, out=x), np.clip((expected + 1) * 127.5, 100, 200))
+        assert np.array_equal(oeop.add(y, 1, out=y), [1.75, 1.25, 2.])
+        assert np.array_equal(oeop.sqrt(np.array([4., 9.]), out=np.empty(2)), [2., 3.])
 
     def test_add(self):
         """ Tests `add` function. """
@@ -327,5 +434,82 @@ class MathTester(unittest.TestCase):
         """ Tests `normalized_difference` function. """
         pass
 
+    def test_reducers_dask(self):
+        """ Tests reducers with chunked dask arrays against their NumPy results. """
+        data = np.random.RandomState(42).rand(6, 4, 5)
+        data[1, 2, 3] = np.nan
+        data[:, 0, 0] = np.nan
+        dask_data = da.from_array(data, chunks=(2, 2, 5))
+        reducers = [oeop.mean, oeop.min, oeop.max, oeop.median, oeop.sd, oeop.variance, oeop.sum, oeop.product]
+        for reducer in reducers:
+            for dimension in [0, 2]:
+                for ignore_nodata in [True, False]:
+                    result = reducer(dask_data, dimension=dimension, ignore_nodata=ignore_nodata)
+                    assert isinstance(result, da.Array)
+                    expected = reducer(data, dimension=dimension, ignore_nodata=ignore_nodata)
+                    assert np.allclose(result.compute(), expected, equal_nan=True)
+
+        assert np.isclose(oeop.sum(dask_data, extra_values=[1, 2]).compute(), np.nansum(data, axis=0) + 3).all()
+        assert np.isclose(oeop.product(dask_data, extra_values=[2]).compute(), np.nanprod(data, axis=0) * 2).all()
+        extrema = oeop.extrema(dask_data, dimension=1)
+        assert np.isclose(extrema[0].compute(), np.nanmin(data, axis=1), equal_nan=True).all()
+        assert np.isclose(extrema[1].compute(), np.nanmax(data, axis=1), equal_nan=True).all()
+
+    def test_reducers_xarray(self):
+        """ Tests reducers with (dask-backed) xarray data arrays against their NumPy results. """
+        data = np.random.RandomState(42).rand(6, 4, 5)
+        data[1, 2, 3] = np.nan
+        data[:, 0, 0] = np.nan
+        coords = {"t": np.arange(6), "y": np.arange(4) * 10., "x": np.arange(5) * 10.}
+        xar_data = xr.DataArray(data, dims=["t", "y", "x"], coords=coords)
+        reducers = [oeop.mean, oeop.min, oeop.max, oeop.median, oeop.sd, oeop.variance, oeop.sum, oeop.product]
+        for reducer in reducers:
+            for ignore_nodata in [True, False]:
+                expected = reducer(data, dimension=0, ignore_nodata=ignore_nodata)
+                result = reducer(xar_data, dimension="t", ignore_nodata=ignore_nodata)
+                assert isinstance(result, xr.DataArray)
+                assert result.dims == ("y", "x")
+                assert (result["x"] == coords["x"]).all()
+                assert np.allclose(result, expected, equal_nan=True)
+
+                result = reducer(xar_data.chunk({"t": 2}), dimension=0, ignore_nodata=ignore_nodata)
+                assert isinstance(result.data, da.Array)
+                assert np.allclose(result.compute(), expected, equal_nan=True)
+
+        for values in [xar_data, xar_data.chunk({"y": 2})]:
+            for ignore_nodata in [True, False]:
+                extrema = oeop.extrema(values, dimension="y", ignore_nodata=ignore_nodata)
+                expected = oeop.extrema(data, dimension=1, ignore_nodata=ignore_nodata)
+                for result, expected_extreme in zip(extrema, expected):
+                    assert isinstance(result, xr.DataArray) and result.dims == ("t", "x")
+                    assert np.allclose(result.values, expected_extreme, equal_nan=True)
+
+        result = oeop.quantiles(xar_data, probabilities=[0.25, 0.75], dimension="t")
+        assert result.dims == ("quantile", "y", "x")
+        assert np.allclose(result, np.nanquantile(data, [0.25, 0.75], axis=0), equal_nan=True)
+
+    def test_reducers_masked(self):
+        """ Tests reducers with masked integer arrays against their results for float arrays with np.nan. """
+        data = np.random.RandomState(42).randint(0, 5, size=(6, 4, 5)).astype(np.uint16)
+        data[:, 0, 0] = 0
+        masked_data = oeop.mask_nodata(data, nodata=0)
+        float_data = np.where(data == 0, np.nan, data)
+        reducers = [oeop.mean, oeop.min, oeop.max, oeop.median, oeop.sd, oeop.variance, oeop.sum, oeop.product]
+        for reducer in reducers:
+            for ignore_nodata in [True, False]:
+                expected = reducer(float_data, ignore_nodata=ignore_nodata)
+                result = reducer(masked_data, ignore_nodata=ignore_nodata)
+                assert np.ma.isMaskedArray(result)
+                if reducer in [oeop.min, oeop.max, oeop.sum, oeop.product]:
+                    assert result.dtype.kind == "u"
+                # series without any valid value are masked, whereas the sum and product of np.nan values are 0 and 1
+                assert np.ma.getmaskarray(result)[0, 0]
+                assert np.allclose(result.astype(float).filled(np.nan)[1:], expected[1:], equal_nan=True)
+
+        result = oeop.quantiles(masked_data, probabilities=[0.25, 0.5, 0.75])
+        assert np.allclose(result.filled(np.nan), np.nanpercentile(float_data, [25, 50, 75], axis=0), equal_nan=True)
+        assert oeop.int(oeop.mask_nodata([1.5, np.nan, -2.7])).tolist() == [1, None, -2]
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+import openeo_processes as oeop
+from openeo_processes.errors import ProcessNotAvailable, ProcessParameterMissing, GenericError
+
+
+NDVI_GRAPH = {
+    "sub": {"process_id": "subtract", "arguments": {"x": {"from_parameter": "nir"}, "y": {"from_parameter": "red"}}},
+    "add": {"process_id": "add", "arguments": {"x": {"from_parameter": "nir"}, "y": {"from_parameter": "red"}}},
+    "div": {"process_id": "divide", "arguments": {"x": {"from_node": "sub"}, "y": {"from_node": "add"}},
+            "result": True},
+}
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_execute_process_graph(max_workers):
+    nir = np.array([0.5, 0.8, 0.6])
+    red = np.array([0.1, 0.2, 0.6])
+    ndvi = oeop.execute_process_graph(NDVI_GRAPH, parameters={"nir": nir, "red": red}, max_workers=max_workers)
+    assert np.allclose(ndvi, (nir - red) / (nir + red))
+
+
+def test_process_graph_reuse():
+    graph = oeop.ProcessGraph(NDVI_GRAPH)
+    assert graph.execute({"nir": 3, "red": 1}) == 0.5
+    assert graph.execute({"nir": 1, "red": 1}) == 0
+
+
+def test_process_graph_parameter_defaults():
+    process = {
+        "parameters": [{"name": "x"}, {"name": "factor", "default": 2}],
+        "process_graph": {
+            "scale": {"process_id": "multiply", "arguments": {"x": {"from_parameter": "x"},
+                                                              "y": {"from_parameter": "factor"}}, "result": True}
+        }
+    }
+    graph = oeop.ProcessGraph(process)
+    assert graph.execute({"x": 3}) == 6
+    assert graph.execute({"x": 3, "factor": 3}) == 9
+    with pytest.raises(ProcessParameterMissing):
+        graph.execute()
+
+
+def test_process_graph_callback():
+    graph = {
+        "count": {"process_id": "count", "arguments": {
+            "data": {"from_parameter": "data"},
+            "condition": {"process_graph": {
+                "gt": {"process_id": "gt", "arguments": {"x": {"from_parameter": "x"}, "y": 2}, "result": True}
+            }}
+        }, "result": True}
+    }
+    assert oeop.execute_process_graph(graph, parameters={"data": [0, 1, 2, 3, 4, 5, np.nan]}) == 3
+
+
+def test_process_graph_constants():
+    graph = {
+        "pi": {"process_id": "pi", "arguments": {}},
+        "mul": {"process_id": "multiply", "arguments": {"x": {"from_node": "pi"}, "y": 2}, "result": True}
+    }
+    assert oeop.execute_process_graph(graph) == 2 * np.pi
+
+
+def test_process_graph_releases_intermediates():
+    graph = oeop.ProcessGraph({
+        "a": {"process_id": "add", "arguments": {"x": 1, "y": 2}},
+        "b": {"process_id": "multiply", "arguments": {"x": {"from_node": "a"}, "y": 2}},
+        "c": {"process_id": "multiply", "arguments": {"x": {"from_node": "b"}, "y": 3}, "result": True},
+    }, max_workers=1)
+    available_results = {}
+    evaluate_node = graph._evaluate_node
+
+    def record_available_results(node_id, results, parameters):
+        available_results[node_id] = set(results)
+        return evaluate_node(node_id, results, parameters)
+
+    graph._evaluate_node = record_available_results
+    assert graph.execute() == 18
+    assert available_results["c"] == {"b"}
+
+
+def test_process_graph_errors():
+    with pytest.raises(ProcessNotAvailable):
+        oeop.ProcessGraph({"a": {"process_id": "foobar", "arguments": {}, "result": True}})
+    with pytest.raises(GenericError):
+        oeop.ProcessGraph({"a": {"process_id": "add", "arguments": {"x": {"from_node": "b"}, "y": 1}, "result": True},
+                           "b": {"process_id": "add", "arguments": {"x": {"from_node": "a"}, "y": 1}}})
+    with pytest.raises(GenericError):
+        oeop.ProcessGraph({"a": {"process_id": "add", "arguments": {"x": 1, "y": 1}}})
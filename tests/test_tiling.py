@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import openeo_processes as oeop
+from openeo_processes.tiling import map_tiles, map_elements
+
+
+@pytest.fixture
+def data():
+    data = np.random.default_rng(42).random((12, 30, 17))
+    data[3, 5, 7] = np.nan
+    data[:, 2, 3] = np.nan
+    return data
+
+
+@pytest.mark.parametrize("dimension", [0, 1, -1])
+def test_map_tiles(data, dimension):
+    result = map_tiles(lambda tile: np.sort(tile, axis=dimension), data, dimension=dimension, max_workers=3,
+                       tile_size=100)
+    assert np.array_equal(result, np.sort(data, axis=dimension), equal_nan=True)
+
+
+@pytest.mark.parametrize("dimension", [0, 1, 2])
+def test_tiled_reducers(data, dimension):
+    options = {"dimension": dimension, "max_workers": 4, "tile_size": 64}
+    assert np.allclose(oeop.median(data, **options), np.nanmedian(data, axis=dimension), equal_nan=True)
+    assert np.allclose(oeop.median(data, ignore_nodata=False, **options), np.median(data, axis=dimension),
+                       equal_nan=True)
+
+    expected = np.nanpercentile(data, [10, 50, 75], axis=dimension)
+    for method in ["sort", "select"]:
+        result = oeop.quantiles(data, probabilities=[0.1, 0.5, 0.75], method=method, **options)
+        assert np.allclose(result, expected, equal_nan=True)
+
+    for asc in [True, False]:
+        expected = oeop.order(data, dimension=dimension, asc=asc, nodata=True)
+        assert np.array_equal(oeop.order(data, asc=asc, nodata=True, **options), expected)
+
+
+def scale_positive(x, factor=1):
+    """ Process which can only be evaluated element by element. """
+    return x * factor if x > 0.5 else 0.
+
+
+def is_positive(x):
+    """ Condition which can only be evaluated element by element. """
+    return bool(x > 0.5)
+
+
+def test_process_pool_callbacks(data):
+    options = {"max_workers": 2, "tile_size": 1000}
+    callback = np.vectorize(scale_positive)
+    assert np.allclose(oeop.array_apply(data, callback, context={"factor": 2}, **options),
+                       np.where(data > 0.5, data * 2, 0.))
+    assert np.array_equal(oeop.count(data, is_positive, dimension=1, **options),
+                          np.sum(data > 0.5, axis=1))
+    values = data.ravel()
+    assert np.array_equal(oeop.array_filter(values, lambda x: x > 0.5, **options), values[values > 0.5])
+
+
+def halve_tail(x):
+    """ Function whose results have a wider data type for the tiles after the first one. """
+    return (x % 7).astype(np.int8) if x[0] < 1000 else x / 2
+
+
+def test_map_elements_promotion():
+    data = np.arange(4000)
+    result = map_elements(halve_tail, data, max_workers=2, tile_size=1000)
+    assert result.dtype == np.float64
+    assert np.array_equal(result, np.concatenate([data[:1000] % 7, data[1000:] / 2]))
+
+
+def test_map_elements_threads():
+    data = np.arange(4000)
+    expected = np.concatenate([data[:1000] % 7, data[1000:] / 2])
+    with ThreadPoolExecutor(max_workers=1) as executor:  # processes are spawned instead of forked
+        assert np.array_equal(executor.submit(map_elements, halve_tail, data, 2, 1000).result(), expected)
+        assert np.array_equal(executor.submit(map_elements, lambda x: x * 2, data, 2, 1000).result(), data * 2)
@@ -1,10 +1,13 @@
 import datetime
 
-import dask.array.core
+import dask
+import dask.array
 import numpy as np
 import pytest
 import xarray
-from openeo_processes.utils import eval_datatype, get_process, has_process
+from openeo_processes.errors import DataTypeNotSupported
+from openeo_processes.utils import eval_datatype, get_process, has_process, str2time, str2datetime64, \
+    LabelIndex, mask_nodata
 
 
 @pytest.mark.parametrize(["data", "expected"], [
@@ -51,3 +54,125 @@ def test_has_process():
 def test_get_process(pid, args, expected):
     fun = get_process(pid)
     assert fun(*args) == expected
+
+
+def test_process_dispatch_cache():
+    fun = get_process("add")
+    cache = fun._dispatch_cache
+    cache.clear()
+    assert fun(2, 3) == 5
+    assert fun(4, 5) == 9
+    assert len(cache) == 1
+    assert (fun(np.array([1, 2]), 3) == np.array([4, 5])).all()
+    assert (fun([1, 2], 3) == np.array([4, 5])).all()
+    assert (fun([3, 4], y=3) == np.array([6, 7])).all()
+    assert len(cache) == 4
+
+
+def _forbid_compute(dsk, keys, **kwargs):
+    raise AssertionError("A dask array has been computed.")
+
+
+@pytest.mark.parametrize(["pid", "args", "kwargs"], [
+    ("add", (dask.array.ones((4, 3), chunks=2), np.ones((4, 3))), {}),
+    ("multiply", (np.ones(3), dask.array.ones(3, chunks=1)), {}),
+    ("gt", (dask.array.ones((4, 3), chunks=2), 0.5), {}),
+    ("between", (dask.array.ones((4, 3), chunks=2),), {"min": 0, "max": 1}),
+    ("and", (dask.array.ones(3, dtype=bool, chunks=1), np.array([True, False, True])), {}),
+    ("is_valid", (dask.array.ones((4, 3), chunks=2),), {}),
+    ("sum", (dask.array.ones((4, 3), chunks=2),), {"extra_values": [1, 2]}),
+    ("quantiles", (dask.array.ones((4, 3), chunks=2),), {"probabilities": [0.5]}),
+    ("mean", (xarray.DataArray(dask.array.ones((4, 3), chunks=2)),), {"dimension": "dim_0"}),
+])
+def test_lazy_dispatch(pid, args, kwargs):
+    """ Tests that processes keep lazy inputs lazy, also if they are mixed with NumPy arrays or lists. """
+    with dask.config.set(scheduler=_forbid_compute):
+        result = get_process(pid)(*args, **kwargs)
+    data = result.data if isinstance(result, xarray.DataArray) else result
+    assert isinstance(data, dask.array.Array)
+
+
+@pytest.mark.parametrize(["pid", "args", "kwargs"], [
+    ("xor", (dask.array.from_array(np.array([True, False, True]), chunks=1), np.array([True, True, False])), {}),
+    ("any", (dask.array.from_array(np.array([[0., np.nan], [1., np.nan]]), chunks=1),), {}),
+    ("all", (dask.array.from_array(np.array([[0., np.nan], [1., np.nan]]), chunks=1),), {}),
+])
+def test_lazy_logic(pid, args, kwargs):
+    """ Tests that logical processes with a dask implementation keep dask arrays lazy and match NumPy. """
+    expected = get_process(pid)(*(np.asarray(a) for a in args), **kwargs)
+    with dask.config.set(scheduler=_forbid_compute):
+        result = get_process(pid)(*args, **kwargs)
+    assert isinstance(result, dask.array.Array)
+    assert np.array_equal(np.asarray(result.compute(), dtype=float), np.asarray(expected, dtype=float),
+                          equal_nan=True)
+
+
+@pytest.mark.parametrize(["pid", "args", "kwargs"], [
+    ("first", (dask.array.from_array(np.array([[np.nan, 2.], [1., 3.]]), chunks=1),), {}),
+    ("sort", (dask.array.from_array(np.array([[3., np.nan], [1., 2.]]), chunks=1),), {"nodata": True}),
+    ("array_element", (dask.array.from_array(np.array([3., 1., 2.]), chunks=1), 1), {}),
+    ("first", (xarray.DataArray(np.array([[np.nan, 2.], [1., 3.]])),), {}),
+])
+def test_unsupported_lazy_data(pid, args, kwargs):
+    """ Tests that processes without a dask or xarray implementation fail instead of computing the data. """
+    with dask.config.set(scheduler=_forbid_compute):
+        with pytest.raises(DataTypeNotSupported):
+            get_process(pid)(*args, **kwargs)
+
+
+def test_str2time():
+    expected = datetime.datetime(2018, 1, 1, 12, tzinfo=datetime.timezone.utc)
+    assert str2time("2018-01-01T12:00:00Z") == expected
+    assert str2time("2018-01-01T13:00:00+01:00") == expected
+    assert str2time("2018-01-01T12:00:00Z", allow_24h=True) == expected
+    assert str2time("2017-12-31T24:00:00Z", allow_24h=True) == expected - datetime.timedelta(hours=12)
+    with pytest.raises(ValueError):
+        str2time("2017-12-31T24:00:00Z")
+    assert str2time("no time") is None
+
+
+def test_str2datetime64():
+    strings = np.array([["2018-01-01", "2018-01-01T12:00:00Z", "2018-01-01t12:00:00.5z"],
+                        ["2018-01-01T13:00:00+01:00", "2017-12-31T24:00:00Z", "no time"]])
+    expected = np.array([["2018-01-01T00:00:00", "2018-01-01T12:00:00", "2018-01-01T12:00:00.5"],
+                         ["2018-01-01T12:00:00", "2018-01-01T00:00:00", "NaT"]], dtype="datetime64[ns]")
+    result = str2datetime64(strings, allow_24h=True)
+    assert result.dtype == np.dtype("datetime64[ns]")
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(str2datetime64(["2018-02-30", "2018-01-01"]),
+                                  np.array(["NaT", "2018-01-01"], dtype="datetime64[ns]"))
+    assert str2datetime64([]).shape == (0,)
+
+
+def test_label_index():
+    labels = LabelIndex(["2018-01-01T00:00:00Z", "2018-01-02T00:00:00+01:00", "2018-01-03", "2018-01-04T12:00:00Z"])
+    assert labels.is_temporal and labels.is_sorted
+    assert labels.index("2018-01-01T23:00:00Z") == 1
+    assert labels.index(datetime.datetime(2018, 1, 3)) == 2
+    with pytest.raises(KeyError):
+        labels.index("2018-01-05")
+    assert labels.interval("2018-01-01T12:00:00Z", "2018-01-03") == slice(1, 3)
+    assert labels.interval("2018-01-01T12:00:00Z", "2018-01-03", exclude_max=True) == slice(1, 2)
+    assert labels.interval("2018-01-03", "2018-01-01") == slice(2, 2)
+
+    data = np.arange(12).reshape(3, 4)
+    selection = labels.select(data, min="2018-01-02", dimension=1)
+    assert np.shares_memory(selection, data)
+    np.testing.assert_array_equal(selection, data[:, 2:])
+
+    labels = LabelIndex(["B04", "B02", "B08", "B03"])
+    assert not labels.is_temporal and not labels.is_sorted
+    assert labels.index("B08") == 2
+    np.testing.assert_array_equal(labels.interval("B03", "B08"), [0, 2, 3])
+    np.testing.assert_array_equal(labels.mask("B03", "B08", exclude_max=True), [True, False, False, True])
+
+
+def test_mask_nodata():
+    data = np.array([[1, 0], [65535, 4]], dtype=np.uint16)
+    masked_data = mask_nodata(data, nodata=0)
+    assert masked_data.dtype == np.uint16
+    assert np.shares_memory(masked_data, data)
+    np.testing.assert_array_equal(np.ma.getmaskarray(masked_data), [[False, True], [False, False]])
+    np.testing.assert_array_equal(masked_data.filled(), data)
+    np.testing.assert_array_equal(np.ma.getmaskarray(mask_nodata([1., np.nan, -9999.], nodata=-9999)),
+                                  [False, True, True])